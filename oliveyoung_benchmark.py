@@ -0,0 +1,206 @@
+"""
+올리브영 크롤러 벤치마크 - 저장한 HTML 파일로 측정하는 명령줄 도구 (Streamlit 화면에는 넣지 않음)
+
+사용법:
+    python oliveyoung_benchmark.py parsers <HTML 파일...>
+    python oliveyoung_benchmark.py extraction <검색 결과 HTML 파일...>
+    python oliveyoung_benchmark.py pool <HTML 파일...>
+
+파일명에 detail 이 있으면 상세 페이지, 없으면 검색 결과 페이지로 처리한다.
+- parsers / extraction: oliveyoung_scraper_Streamlit.py 의 파서를 그대로 쓰므로 streamlit 이 필요
+- pool: localhost 고정 서버로 oliveyoung_scraper.py 의 BrowserPagePool 을 돌리므로 playwright 가 필요
+  (실제 크롤링의 last_crawl_stats 는 속도 제한이 걸린 원격 사이트를 재므로 풀 크기 비교에는 쓰지 않음)
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+POOL_SIZES = (1, 2, 4, 8)
+POOL_PAGE_COUNT = 40  # 풀 크기마다 처리할 URL 수 (저장한 파일을 돌아가며 사용)
+
+
+def benchmark_parsers(pages, repeat=3):
+    """저장된 HTML 페이지들로 파서 백엔드별 파싱 시간/최대 메모리 측정
+
+    pages: [(이름, html, 'search' 또는 'detail'), ...]
+    """
+    from oliveyoung_scraper_Streamlit import LXML_AVAILABLE, PARSER_BACKENDS, parse_html
+
+    rows = []
+    for backend in PARSER_BACKENDS:
+        if backend != 'html.parser' and not LXML_AVAILABLE:
+            continue
+
+        for name, html, kind in pages:
+            # scoped 는 검색 결과 페이지에만 적용됨
+            scoped = kind == 'search'
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                soup = parse_html(html, backend, scoped)
+                timings.append(time.perf_counter() - started)
+                del soup
+
+            # 메모리는 추적 오버헤드가 시간 측정에 섞이지 않도록 따로 한 번 측정
+            tracemalloc.start()
+            soup = parse_html(html, backend, scoped)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del soup
+
+            rows.append({
+                '백엔드': backend,
+                '페이지': name,
+                '종류': kind,
+                '크기(KB)': round(len(html) / 1024, 1),
+                '파싱시간(ms)': round(min(timings) * 1000, 1),
+                '최대메모리(KB)': round(peak / 1024, 1)
+            })
+    return rows
+
+
+def benchmark_extraction(pages, repeat=3):
+    """검색 결과 HTML 로 필드별 셀렉터 방식과 단일 순회 방식의 초당 상품 추출 수 비교
+
+    pages: [(이름, html), ...]
+    """
+    from oliveyoung_scraper_Streamlit import OliveYoungScraper, parse_html
+
+    volatile_keys = ('크롤링시간', '가격히스토리')
+    rows = []
+    for name, html in pages:
+        soup = parse_html(html)
+        outputs = {}
+        for single_pass in (False, True):
+            scraper = OliveYoungScraper(init_session=False)
+            scraper.single_pass_extraction = single_pass
+            best = None
+            for _ in range(repeat):
+                products = []
+                started = time.perf_counter()
+                scraper._extract_products(soup, '벤치마크', products)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            outputs[single_pass] = [
+                {key: value for key, value in product.items() if key not in volatile_keys}
+                for product in products
+            ]
+            rows.append({
+                '방식': '단일 순회' if single_pass else '필드별 셀렉터',
+                '페이지': name,
+                '상품수': len(products),
+                '상품/초': round(len(products) / best, 1) if best else 0
+            })
+        rows[-1]['결과 동일'] = outputs[True] == outputs[False]
+        rows[-2]['결과 동일'] = rows[-1]['결과 동일']
+    return rows
+
+
+def serve_fixtures(pages):
+    """저장한 HTML 을 localhost 임시 HTTP 서버로 제공 - (서버, [(URL, 종류)])
+
+    서버는 데몬 스레드에서 돌고 server.shutdown() 으로 멈춘다.
+    """
+    bodies = {f"/{idx}": html.encode('utf-8') for idx, (name, html, kind) in enumerate(pages)}
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = bodies.get(self.path.split('?')[0])
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, [(f"{base_url}/{idx}", kind) for idx, (name, html, kind) in enumerate(pages)]
+
+
+async def _run_pool(size, jobs):
+    """풀 크기 size 로 jobs [(URL, 종류)] 를 처리 - (소요 초, 추출 상품 수)"""
+    from oliveyoung_scraper import OliveYoungScraper
+
+    scraper = OliveYoungScraper(pool_size=size)
+
+    async def handler(page, job):
+        url, kind = job
+        started = time.monotonic()
+        await page.goto(url, wait_until=scraper._get_profile()['wait_until'])
+        await scraper._wait_until_ready(page, kind, started)
+        if kind == 'detail':
+            product = await scraper._extract_product_from_detail_page(page, {})
+            return 1 if product else 0
+        await scraper._scroll_to_load_all(page)
+        page_products = []
+        await scraper._extract_products_to_list(page, '벤치마크', page_products)
+        return len(page_products)
+
+    async with scraper._page_pool(size) as pool:
+        started = time.monotonic()
+        counts = await pool.run(jobs, handler)
+        elapsed = time.monotonic() - started
+    return elapsed, sum(count or 0 for count in counts)
+
+
+def benchmark_pool(pages, sizes=POOL_SIZES, page_count=POOL_PAGE_COUNT):
+    """저장한 HTML 을 localhost 로 제공하고 BrowserPagePool 크기별 분당 페이지 수 측정
+
+    pages: [(이름, html, 'search' 또는 'detail'), ...] - 같은 URL 목록을 모든 풀 크기에 사용
+    """
+    server, urls = serve_fixtures(pages)
+    try:
+        jobs = [urls[idx % len(urls)] for idx in range(page_count)]
+        rows = []
+        for size in sizes:
+            elapsed, found = asyncio.run(_run_pool(size, jobs))
+            rows.append({
+                '풀 크기': size,
+                '페이지': len(jobs),
+                '소요(초)': round(elapsed, 2),
+                '분당 페이지': round(len(jobs) / elapsed * 60, 1) if elapsed > 0 else 0.0,
+                '추출 상품': found
+            })
+        return rows
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def load_pages(paths):
+    """HTML 파일 경로 목록 -> [(파일명, html, 'search' 또는 'detail')]"""
+    pages = []
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            html = f.read()
+        name = os.path.basename(path)
+        kind = 'detail' if 'detail' in name.lower() else 'search'
+        pages.append((name, html, kind))
+    return pages
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == 'parsers':
+        print(pd.DataFrame(benchmark_parsers(load_pages(sys.argv[2:]))).to_string(index=False))
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'extraction':
+        search_pages = [(name, html) for name, html, kind in load_pages(sys.argv[2:]) if kind == 'search']
+        print(pd.DataFrame(benchmark_extraction(search_pages)).to_string(index=False))
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'pool':
+        print(pd.DataFrame(benchmark_pool(load_pages(sys.argv[2:]))).to_string(index=False))
+    else:
+        print("사용법: python oliveyoung_benchmark.py parsers <HTML 파일...>")
+        print("        python oliveyoung_benchmark.py extraction <검색 결과 HTML 파일...>")
+        print("        python oliveyoung_benchmark.py pool <HTML 파일...>")
@@ -0,0 +1,221 @@
+"""
+스트리밍 내보내기 - 행 generator 를 write-only xlsx / chunk 단위 CSV 로 바로 기록
+oliveyoung_scraper.py(Playwright) / oliveyoung_scraper_Streamlit.py(requests) 공용
+
+- 시트 하나 = ExportSheet(이름, 머리글, 행 iterator, 예상 행 수)
+- xlsx 는 openpyxl write-only 모드로 기록 (행은 시트별 임시 파일로 흘러가고 워크북을 메모리에 두지 않음)
+- openpyxl 이 없거나 .csv 로 저장하면 시트별 CSV 파일에 CSV_CHUNK_ROWS 행씩 기록
+- 가격 히스토리는 상품 HISTORY_CHUNK 개 단위로 로그에서 읽으므로 히스토리 길이와 무관하게 메모리가 일정
+"""
+import csv
+import os
+from datetime import datetime
+from itertools import islice
+
+from oliveyoung_history import HISTORY_FIELD, encode_goods_no, history_rows_many
+
+# openpyxl 은 선택적 import (없으면 CSV 로만 내보냄)
+try:
+    from openpyxl import Workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+HISTORY_CHUNK = 500           # 가격 히스토리를 한 번에 읽는 상품 수
+CSV_CHUNK_ROWS = 5000         # CSV 에 한 번에 쓰는 행 수
+PROGRESS_EVERY = 2000         # 진행상황 알림 간격 (행)
+XLSX_MAX_ROWS = 1048576       # 엑셀 시트 최대 행 수 (넘으면 '이름_2' 시트로 이어서 기록)
+HISTORY_HEADERS = ('브랜드', '상품명', '날짜', '시간', '원가', '할인가')
+
+
+class ExportSheet:
+    """내보낼 표 하나 - rows 는 한 번만 소비되는 iterator 여도 됨
+
+    total: 진행률 계산용 예상 행 수 (모르면 None)
+    skip_empty: 행이 하나도 없으면 시트를 만들지 않음
+    """
+
+    def __init__(self, name, headers, rows, total=None, skip_empty=False):
+        self.name = name
+        self.headers = list(headers)
+        self.rows = rows
+        self.total = total
+        self.skip_empty = skip_empty
+
+
+def export_columns(products, exclude=('선택됨', HISTORY_FIELD)):
+    """상품 목록의 열 이름 (처음 나온 순서, '_' 로 시작하는 내부 키 제외) - 키만 훑으므로 값은 복사하지 않음"""
+    columns = {}
+    for product in products:
+        for key in product:
+            if key not in columns and not key.startswith('_') and key not in exclude:
+                columns[key] = None
+    return list(columns)
+
+
+def product_rows(products, columns):
+    """상품 한 건씩 [열 값] 으로 yield"""
+    for product in products:
+        yield [product.get(column, '') for column in columns]
+
+
+def iter_history(products, price_log=None, chunk_size=HISTORY_CHUNK):
+    """(상품, [(시각 epoch, 원가, 할인가)]) - 로그는 상품 chunk 단위로 읽고 다 쓴 chunk 는 버림"""
+    for start in range(0, len(products), chunk_size):
+        chunk = products[start:start + chunk_size]
+        yield from zip(chunk, history_rows_many(chunk, price_log))
+
+
+def history_count(product, price_log=None):
+    """상품의 가격 히스토리 개수 (로그 색인 / 상품 dict 만 보고 레코드는 읽지 않음)"""
+    count = 0
+    if price_log is not None and encode_goods_no(product.get('상품코드')) is not None:
+        count = price_log.count(product.get('상품코드'))
+    return count or len(product.get(HISTORY_FIELD, []) or [])
+
+
+def history_stats(rows):
+    """(역대 최저 할인가, 역대 최고 할인가, 최근 변동액) - 할인가 0 은 가격 없음으로 보고 건너뜀"""
+    lowest = highest = delta = previous = None
+    for _, _, discount in rows:
+        current = discount if discount > 0 else None
+        if current is not None:
+            lowest = current if lowest is None else min(lowest, current)
+            highest = current if highest is None else max(highest, current)
+            if previous is not None:
+                delta = current - previous
+        previous = current
+    return lowest, highest, delta
+
+
+def history_sheet_rows(products, price_log=None, min_entries=1):
+    """가격 히스토리 시트 행 [브랜드, 상품명, 날짜, 시간, 원가, 할인가] - min_entries 개 이상 기록된 상품만"""
+    for product, rows in iter_history(products, price_log):
+        if len(rows) < min_entries:
+            continue
+        brand = product.get('브랜드', '')
+        name = product.get('상품명', '')
+        for timestamp, original, discount in rows:
+            moment = datetime.fromtimestamp(timestamp)
+            yield [
+                brand, name, moment.strftime('%Y-%m-%d'), moment.strftime('%H:%M:%S'),
+                f"{original:,}" if original else '', f"{discount:,}" if discount else ''
+            ]
+
+
+def history_sheet_total(products, price_log=None, min_entries=1):
+    counts = (history_count(product, price_log) for product in products)
+    return sum(count for count in counts if count >= min_entries)
+
+
+class _Progress:
+    """written 행 수를 PROGRESS_EVERY 마다 progress_callback(message, 진행률 또는 None) 으로 알림"""
+
+    def __init__(self, sheets, progress_callback=None):
+        self.callback = progress_callback
+        totals = [sheet.total for sheet in sheets]
+        self.total = sum(totals) if all(total is not None for total in totals) else None
+        self.written = 0
+
+    def step(self, sheet_name, count=1):
+        before = self.written
+        self.written += count
+        if self.callback and before // PROGRESS_EVERY != self.written // PROGRESS_EVERY:
+            self.report(sheet_name)
+
+    def report(self, sheet_name):
+        if not self.callback:
+            return
+        if self.total:
+            progress = min(self.written / self.total, 1.0)
+            self.callback(f"내보내는 중: {sheet_name} ({self.written:,}/{self.total:,}행)", progress)
+        else:
+            self.callback(f"내보내는 중: {sheet_name} ({self.written:,}행)", None)
+
+    def done(self):
+        if self.callback:
+            self.callback(f"내보내기 완료 ({self.written:,}행)", 1.0)
+
+
+def _first_row(sheet):
+    """(첫 행 또는 None, 나머지 iterator) - 빈 시트 건너뛰기용"""
+    rows = iter(sheet.rows)
+    for row in rows:
+        return row, rows
+    return None, rows
+
+
+def _chain_first(first, rows):
+    yield first
+    yield from rows
+
+
+def write_xlsx(target, sheets, progress_callback=None):
+    """시트들을 write-only 워크북으로 기록 (target: 파일 경로 또는 BytesIO) - 기록한 행 수 반환"""
+    if not OPENPYXL_AVAILABLE:
+        raise RuntimeError("openpyxl 이 설치되지 않아 엑셀로 내보낼 수 없습니다 (pip install openpyxl)")
+
+    progress = _Progress(sheets, progress_callback)
+    workbook = Workbook(write_only=True)
+    for sheet in sheets:
+        first, rows = _first_row(sheet)
+        if first is None and sheet.skip_empty:
+            continue
+
+        part = 1
+        worksheet = workbook.create_sheet(title=sheet.name[:31])
+        worksheet.append(sheet.headers)
+        sheet_rows = 1
+        if first is None:
+            continue
+        for row in _chain_first(first, rows):
+            if sheet_rows >= XLSX_MAX_ROWS:
+                part += 1
+                suffix = f"_{part}"
+                worksheet = workbook.create_sheet(title=sheet.name[:31 - len(suffix)] + suffix)
+                worksheet.append(sheet.headers)
+                sheet_rows = 1
+            worksheet.append(row)
+            sheet_rows += 1
+            progress.step(sheet.name)
+
+    if not workbook.worksheets:
+        workbook.create_sheet(title='데이터없음')
+    if progress_callback:
+        progress_callback("엑셀 파일 저장 중...", None)
+    workbook.save(target)
+    progress.done()
+    return progress.written
+
+
+def csv_paths(path, sheets):
+    """시트가 하나면 path 그대로, 여러 개면 '이름_시트.csv' 로 나눔"""
+    if len(sheets) == 1:
+        return [path]
+    base, ext = os.path.splitext(path)
+    return [f"{base}_{sheet.name}{ext or '.csv'}" for sheet in sheets]
+
+
+def write_csv(path, sheets, progress_callback=None):
+    """시트별 CSV 파일을 CSV_CHUNK_ROWS 행씩 기록 (utf-8-sig, 엑셀에서 한글이 깨지지 않음) - 만든 파일 경로 목록 반환"""
+    progress = _Progress(sheets, progress_callback)
+    written_paths = []
+    for sheet, sheet_path in zip(sheets, csv_paths(path, sheets)):
+        first, rows = _first_row(sheet)
+        if first is None and sheet.skip_empty:
+            continue
+        with open(sheet_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(sheet.headers)
+            if first is not None:
+                writer.writerow(first)
+                progress.step(sheet.name)
+                while True:
+                    chunk = list(islice(rows, CSV_CHUNK_ROWS))
+                    if not chunk:
+                        break
+                    writer.writerows(chunk)
+                    progress.step(sheet.name, len(chunk))
+        written_paths.append(sheet_path)
+    progress.done()
+    return written_paths
@@ -0,0 +1,325 @@
+"""
+가격 히스토리 추가 전용 로그 - 상품 dict 와 분리된 열 기반 바이너리 세그먼트
+oliveyoung_scraper.py(Playwright) / oliveyoung_scraper_Streamlit.py(requests) 공용
+
+레코드 형식 (24바이트, little endian): 상품코드 int64 / 시각 epoch 초 int64 / 원가 int32 / 할인가 int32
+- 상품코드 'A000000123456' 은 (영문자 번호, 숫자 자리수, 숫자) 를 int64 하나로 묶어 저장
+- 세그먼트 파일은 segment_bytes 를 넘으면 새 파일로 넘어가고, 이미 쓴 레코드는 바꾸지 않음
+- 상품별 (시각, 세그먼트, 오프셋) 색인은 메모리에 두고, 세그먼트가 늘어난 만큼만 이어서 읽음
+- 한 폴더에 쓰는 프로세스는 하나라고 가정 (Tk 앱 / Streamlit 앱은 폴더를 따로 씀)
+"""
+import bisect
+import os
+import re
+import struct
+import threading
+import time
+from datetime import datetime
+
+RECORD = struct.Struct('<qqii')
+GOODS_NO_PATTERN = re.compile(r'^([A-Z]?)(\d{1,15})$')
+HISTORY_FIELD = '가격히스토리'
+
+
+def encode_goods_no(goods_no):
+    """'A000000123456' -> int64 (형식이 다르면 None)"""
+    match = GOODS_NO_PATTERN.match(str(goods_no or '').strip().upper())
+    if not match:
+        return None
+    letter, digits = match.groups()
+    letter_idx = ord(letter) - 64 if letter else 0
+    return (letter_idx << 56) | (len(digits) << 50) | int(digits)
+
+
+def decode_goods_no(value):
+    letter_idx = value >> 56
+    width = (value >> 50) & 0x3F
+    number = value & ((1 << 50) - 1)
+    letter = chr(letter_idx + 64) if letter_idx else ''
+    return f"{letter}{number:0{width}d}"
+
+
+def parse_price(value):
+    """'15,000' / 15000 -> 15000 (없거나 숫자가 아니면 0)"""
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value or '').replace(',', '').strip() or 0)
+    except ValueError:
+        return 0
+
+
+def format_price(value):
+    return f"{value:,}" if value else ''
+
+
+def _entry_timestamp(entry):
+    try:
+        date_str = f"{entry.get('날짜', '')} {entry.get('시간', '') or '00:00:00'}"
+        return int(time.mktime(datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S').timetuple()))
+    except (TypeError, ValueError):
+        return None
+
+
+def entry_rows(entries):
+    """기존 가격히스토리 dict 목록 -> [(시각 epoch, 원가, 할인가)]"""
+    rows = []
+    for entry in entries or []:
+        timestamp = _entry_timestamp(entry)
+        if timestamp is not None:
+            rows.append((timestamp, parse_price(entry.get('원가')), parse_price(entry.get('할인가'))))
+    return rows
+
+
+def history_rows_many(products, price_log=None):
+    """상품별 [(시각 epoch, 원가, 할인가)] 목록 - 로그에 없으면 상품 dict 의 가격히스토리
+
+    로그는 세그먼트 파일별로 한 번에 읽음 (엑셀 내보내기용)
+    """
+    if price_log is None:
+        return [entry_rows(product.get(HISTORY_FIELD, [])) for product in products]
+    logged = price_log.history_many([product.get('상품코드') for product in products])
+    return [rows or entry_rows(product.get(HISTORY_FIELD, [])) for product, rows in zip(products, logged)]
+
+
+class PriceHistoryLog:
+    """상품코드별 가격 변화 기록 (추가만 가능)
+
+    같은 폴더는 shared() 로 프로세스 안에서 인스턴스 하나를 같이 씀 (Streamlit 세션 간 공유)
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, log_dir="oliveyoung_price_log"):
+        with cls._instances_lock:
+            key = os.path.abspath(log_dir)
+            if key not in cls._instances:
+                cls._instances[key] = cls(log_dir)
+            return cls._instances[key]
+
+    def __init__(self, log_dir="oliveyoung_price_log", segment_bytes=4 * 1024 * 1024):
+        self.log_dir = log_dir
+        self.segment_bytes = segment_bytes - segment_bytes % RECORD.size
+        self._lock = threading.RLock()
+        self.index = {}          # 상품코드 int -> [(시각, 세그먼트, 오프셋)]
+        self.scanned = {}        # 세그먼트 -> 색인에 반영된 바이트 수
+        self.segment = 1
+        os.makedirs(log_dir, exist_ok=True)
+        self.refresh()
+
+    def _segment_path(self, segment):
+        return os.path.join(self.log_dir, f"segment_{segment:06d}.bin")
+
+    def refresh(self):
+        """색인에 아직 없는 세그먼트 / 세그먼트 뒷부분만 읽어 색인에 추가"""
+        with self._lock:
+            segments = sorted(
+                int(name[8:14]) for name in os.listdir(self.log_dir)
+                if name.startswith('segment_') and name.endswith('.bin')
+            )
+            for segment in segments:
+                self._scan_segment(segment)
+            if segments:
+                self.segment = max(self.segment, segments[-1])
+
+    def _scan_segment(self, segment):
+        path = self._segment_path(segment)
+        start = self.scanned.get(segment, 0)
+        size = os.path.getsize(path)
+        size -= size % RECORD.size  # 쓰다 끊긴 마지막 레코드는 무시
+        if size <= start:
+            return
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = f.read(size - start)
+        for position, (code, timestamp, original, discount) in enumerate(RECORD.iter_unpack(data)):
+            self.index.setdefault(code, []).append((timestamp, segment, start + position * RECORD.size))
+        self.scanned[segment] = size
+
+    def _read(self, items):
+        """색인 항목들의 레코드를 세그먼트별로 한 번씩 열어 읽음"""
+        rows = []
+        handles = {}
+        try:
+            for timestamp, segment, offset in items:
+                if segment not in handles:
+                    handles[segment] = open(self._segment_path(segment), 'rb')
+                f = handles[segment]
+                f.seek(offset)
+                rows.append(RECORD.unpack(f.read(RECORD.size))[1:])
+        finally:
+            for f in handles.values():
+                f.close()
+        return rows
+
+    def history(self, goods_no, start=None, end=None):
+        """[(시각 epoch, 원가, 할인가)] - start/end(epoch 초) 범위만 색인으로 잘라 읽음"""
+        code = encode_goods_no(goods_no)
+        with self._lock:
+            items = self.index.get(code, [])
+            if start is not None or end is not None:
+                timestamps = [item[0] for item in items]
+                lo = bisect.bisect_left(timestamps, start) if start is not None else 0
+                hi = bisect.bisect_right(timestamps, end) if end is not None else len(items)
+                items = items[lo:hi]
+            return self._read(items)
+
+    def history_many(self, goods_nos):
+        """상품코드 목록 순서대로 [(시각 epoch, 원가, 할인가)] 목록 - 세그먼트 파일은 한 번씩만 읽음"""
+        with self._lock:
+            item_lists = [self.index.get(encode_goods_no(goods_no), []) for goods_no in goods_nos]
+            data = {}
+            for segment in {item[1] for items in item_lists for item in items}:
+                with open(self._segment_path(segment), 'rb') as f:
+                    data[segment] = f.read(self.scanned.get(segment, 0))
+            unpack_from = RECORD.unpack_from
+            return [
+                [unpack_from(data[segment], offset)[1:] for timestamp, segment, offset in items]
+                for items in item_lists
+            ]
+
+    def last(self, goods_no):
+        with self._lock:
+            rows = self._read(self.index.get(encode_goods_no(goods_no), [])[-1:])
+            return rows[0] if rows else None
+
+    def count(self, goods_no):
+        with self._lock:
+            return len(self.index.get(encode_goods_no(goods_no), []))
+
+    def append_many(self, rows, skip_unchanged=True):
+        """[(상품코드, 원가, 할인가, 시각 또는 None)] 추가 - 추가된 개수 반환
+
+        skip_unchanged 면 마지막 기록과 가격이 같은 행은 건너뜀 (기존 가격히스토리 규칙과 같음)
+        """
+        with self._lock:
+            buffer = bytearray()
+            pending = []
+            last_prices = {}
+            for goods_no, original, discount, timestamp in rows:
+                code = encode_goods_no(goods_no)
+                if code is None:
+                    continue
+                original = parse_price(original)
+                discount = parse_price(discount)
+                if skip_unchanged:
+                    previous = last_prices.get(code)
+                    if previous is None and self.index.get(code):
+                        previous = self._read(self.index[code][-1:])[0][1:]
+                    if previous == (original, discount):
+                        continue
+                    last_prices[code] = (original, discount)
+                timestamp = int(timestamp if timestamp is not None else time.time())
+                buffer += RECORD.pack(code, timestamp, original, discount)
+                pending.append((code, timestamp))
+
+            if not pending:
+                return 0
+
+            written = 0
+            while written < len(pending):
+                path = self._segment_path(self.segment)
+                size = os.path.getsize(path) if os.path.exists(path) else 0
+                size -= size % RECORD.size
+                room = max(0, (self.segment_bytes - size) // RECORD.size)
+                if room == 0:
+                    self.segment += 1
+                    continue
+                chunk = pending[written:written + room]
+                with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+                    f.seek(size)
+                    f.write(buffer[written * RECORD.size:(written + len(chunk)) * RECORD.size])
+                    f.truncate()
+                for position, (code, timestamp) in enumerate(chunk):
+                    self.index.setdefault(code, []).append((timestamp, self.segment, size + position * RECORD.size))
+                self.scanned[self.segment] = size + len(chunk) * RECORD.size
+                written += len(chunk)
+            return len(pending)
+
+    def append(self, goods_no, original, discount, timestamp=None):
+        return self.append_many([(goods_no, original, discount, timestamp)]) > 0
+
+    def import_entries(self, goods_no, entries):
+        """기존 가격히스토리 목록을 옮겨 옴 (이미 기록이 있는 상품코드는 건너뜀) - 추가된 개수 반환"""
+        if encode_goods_no(goods_no) is None or self.count(goods_no):
+            return 0
+        rows = []
+        for entry in entries or []:
+            timestamp = _entry_timestamp(entry)
+            if timestamp is not None:
+                rows.append((goods_no, entry.get('원가', ''), entry.get('할인가', ''), timestamp))
+        return self.append_many(rows, skip_unchanged=False)
+
+    def record_products(self, products):
+        """검색 결과 상품의 첫 가격 관측을 크롤링시간으로 기록 (관심상품 추가 시) - 추가된 개수 반환
+
+        상품 dict 에 가격히스토리를 미리 만들어 두지 않으므로, 관심상품에 넣을 때 여기서 로그에 남긴다.
+        로그의 마지막 기록보다 오래된 관측은 건너뜀 (색인은 시각 순서를 유지해야 함)
+        """
+        rows = []
+        with self._lock:
+            for product in products:
+                goods_no = product.get('상품코드')
+                code = encode_goods_no(goods_no)
+                if code is None:
+                    continue
+                timestamp = _entry_timestamp({
+                    '날짜': str(product.get('크롤링시간', ''))[:10],
+                    '시간': str(product.get('크롤링시간', ''))[11:19]
+                })
+                items = self.index.get(code)
+                if items and (timestamp is None or timestamp <= items[-1][0]):
+                    continue
+                rows.append((goods_no, product.get('원가', ''), product.get('할인가', ''), timestamp))
+            return self.append_many(rows)
+
+    def migrate_products(self, products):
+        """상품 dict 안의 가격히스토리를 로그로 옮기고 dict 에서는 뺌 (상품코드가 없는 상품은 그대로)
+
+        반환값: 가격히스토리를 뺀 상품 수
+        """
+        changed = 0
+        for product in products:
+            if HISTORY_FIELD not in product or encode_goods_no(product.get('상품코드')) is None:
+                continue
+            self.import_entries(product['상품코드'], product[HISTORY_FIELD])
+            del product[HISTORY_FIELD]
+            changed += 1
+        return changed
+
+    def entries_for(self, product, start=None, end=None):
+        """표시용 [{'날짜', '원가', '할인가', '시간'}] - 로그에 없으면 상품 dict 의 가격히스토리"""
+        rows = self.history(product.get('상품코드'), start, end) if product.get('상품코드') else []
+        if not rows:
+            return product.get(HISTORY_FIELD, [])
+        entries = []
+        for timestamp, original, discount in rows:
+            moment = datetime.fromtimestamp(timestamp)
+            entries.append({
+                '날짜': moment.strftime('%Y-%m-%d'),
+                '원가': format_price(original),
+                '할인가': format_price(discount),
+                '시간': moment.strftime('%H:%M:%S')
+            })
+        return entries
+
+    def rows_for(self, product, start=None, end=None):
+        """[(시각 epoch, 원가, 할인가)] - 로그에 없으면 상품 dict 의 가격히스토리"""
+        rows = self.history(product.get('상품코드'), start, end) if product.get('상품코드') else []
+        return rows or entry_rows(product.get(HISTORY_FIELD, []))
+
+    def series_for(self, product, start=None, end=None):
+        """그래프용 (날짜 목록, 원가 목록, 할인가 목록) - 문자열 가격을 다시 파싱하지 않음"""
+        rows = self.rows_for(product, start, end)
+        dates = [datetime.fromtimestamp(row[0]) for row in rows]
+        return dates, [row[1] for row in rows], [row[2] for row in rows]
+
+    def summary(self):
+        with self._lock:
+            return {
+                'products': len(self.index),
+                'records': sum(len(items) for items in self.index.values()),
+                'segments': len(self.scanned),
+                'bytes': sum(self.scanned.values())
+            }
@@ -0,0 +1,253 @@
+"""
+올리브영 상품 레코드 - __slots__ 기반, 가격은 정수로 보관
+oliveyoung_scraper.py(Playwright) / oliveyoung_scraper_Streamlit.py(requests) 공용
+
+기존 코드가 쓰던 dict 방식(product['할인가'], .get, .items, .copy, pd.DataFrame)은 그대로 동작하고,
+dict 방식으로 읽은 가격은 '15,000' 형태 문자열로, 속성(product.discount_price)으로 읽으면 정수로 나온다.
+"""
+import time
+import tracemalloc
+from collections.abc import MutableMapping
+
+# (한글 키, 속성 이름) - 정해진 필드는 슬롯에, 나머지 키는 extra dict 에 보관
+FIELDS = (
+    ('브랜드', 'brand'),
+    ('상품명', 'name'),
+    ('원가', 'original_price'),
+    ('할인가', 'discount_price'),
+    ('혜택', 'benefit'),
+    ('이미지URL', 'image_url'),
+    ('상품URL', 'url'),
+    ('상품코드', 'goods_no'),
+    ('검색키워드', 'keyword'),
+    ('선택됨', 'selected'),
+    ('목표가격', 'target_price'),
+    ('크롤링시간', 'crawled_at'),
+)
+FIELD_ATTRS = dict(FIELDS)
+PRICE_FIELDS = frozenset(('원가', '할인가', '목표가격'))
+
+_MISSING = object()
+
+
+def to_int_price(value):
+    """'15,000' / '15,000원' / 15000 -> 15000, 빈 값 -> None (숫자가 아니면 원래 문자열 유지)"""
+    if value is None or isinstance(value, int) and not isinstance(value, bool):
+        return value
+    text = str(value).replace(',', '').replace('원', '').strip()
+    if not text:
+        return None
+    if text.isdigit():
+        return int(text)
+    return str(value)
+
+
+def format_price(value):
+    """정수 가격 -> '15,000' (없으면 '')"""
+    if value is None:
+        return ''
+    if isinstance(value, int):
+        return f"{value:,}"
+    return value
+
+
+class Product(MutableMapping):
+    """상품 한 건 - 한글 키 dict 처럼 쓸 수 있는 슬롯 객체
+
+    original_price / discount_price / target_price 는 정수(또는 None)
+    """
+    __slots__ = tuple(attr for _, attr in FIELDS) + ('extra',)
+
+    def __init__(self, data=None, **fields):
+        for _, attr in FIELDS:
+            setattr(self, attr, _MISSING)
+        self.extra = None
+        # 추출/로드 시 한 번만 가격을 정수로 변환 (update() 보다 빠른 직접 대입)
+        for source in (data, fields):
+            if not source:
+                continue
+            for key, value in source.items():
+                attr = FIELD_ATTRS.get(key)
+                if attr is None:
+                    if self.extra is None:
+                        self.extra = {}
+                    self.extra[key] = value
+                elif key in PRICE_FIELDS:
+                    setattr(self, attr, to_int_price(value))
+                else:
+                    setattr(self, attr, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        return data if isinstance(data, cls) else cls(data)
+
+    def to_dict(self):
+        """기존 JSON 형식 dict (가격은 쉼표 문자열)"""
+        return {key: self[key] for key in self}
+
+    def __getitem__(self, key):
+        attr = FIELD_ATTRS.get(key)
+        if attr is None:
+            if self.extra is None:
+                raise KeyError(key)
+            return self.extra[key]
+        value = getattr(self, attr)
+        if value is _MISSING:
+            raise KeyError(key)
+        if key in PRICE_FIELDS:
+            return format_price(value)
+        return value
+
+    def __setitem__(self, key, value):
+        attr = FIELD_ATTRS.get(key)
+        if attr is None:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+        elif key in PRICE_FIELDS:
+            setattr(self, attr, to_int_price(value))
+        else:
+            setattr(self, attr, value)
+
+    def __delitem__(self, key):
+        attr = FIELD_ATTRS.get(key)
+        if attr is None:
+            if self.extra is None:
+                raise KeyError(key)
+            del self.extra[key]
+        elif getattr(self, attr) is _MISSING:
+            raise KeyError(key)
+        else:
+            setattr(self, attr, _MISSING)
+
+    def __iter__(self):
+        for key, attr in FIELDS:
+            if getattr(self, attr) is not _MISSING:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        count = sum(1 for _, attr in FIELDS if getattr(self, attr) is not _MISSING)
+        return count + (len(self.extra) if self.extra else 0)
+
+    def __contains__(self, key):
+        attr = FIELD_ATTRS.get(key)
+        if attr is None:
+            return bool(self.extra) and key in self.extra
+        return getattr(self, attr) is not _MISSING
+
+    def get(self, key, default=None):
+        attr = FIELD_ATTRS.get(key)
+        if attr is None:
+            return self.extra.get(key, default) if self.extra else default
+        value = getattr(self, attr)
+        if value is _MISSING:
+            return default
+        if key in PRICE_FIELDS:
+            return format_price(value)
+        return value
+
+    def price(self, key):
+        """정수 가격 (없거나 숫자가 아니면 None) - 렌더링이 아닌 계산에 사용"""
+        value = getattr(self, FIELD_ATTRS[key])
+        return value if isinstance(value, int) else None
+
+    def copy(self):
+        product = Product.__new__(Product)
+        for _, attr in FIELDS:
+            setattr(product, attr, getattr(self, attr))
+        product.extra = dict(self.extra) if self.extra else None
+        return product
+
+    def __repr__(self):
+        return f"Product({self.to_dict()!r})"
+
+
+def target_reached(product):
+    """목표가격 달성 여부 (현재 할인가 <= 목표가격) - 둘 중 하나라도 정수가 아니면 None"""
+    target = product.price('목표가격')
+    current = product.price('할인가')
+    if target is None or current is None:
+        return None
+    return current <= target
+
+
+def as_products(records):
+    """dict 목록 -> Product 목록 (이미 Product 면 그대로)"""
+    return [Product.from_dict(record) for record in records]
+
+
+def benchmark_products(count=100000):
+    """상품 count 개를 dict / Product 로 만들 때 메모리와 목표가격 달성 계산 속도 비교
+
+    반환값: [{'방식', '메모리(MB)', '생성(ms)', '목표가 계산(ms)'}]
+    """
+    def make_dict(idx):
+        return {
+            '브랜드': f"브랜드{idx % 300}", '상품명': f"상품 {idx}",
+            '원가': f"{20000 + idx % 1000:,}", '할인가': f"{15000 + idx % 1000:,}",
+            '혜택': '세일', '이미지URL': '', '상품URL': '', '상품코드': f"A{idx:012d}",
+            '검색키워드': '토너', '선택됨': False, '목표가격': f"{15500:,}" if idx % 2 else '',
+            '크롤링시간': '2024-01-01 00:00:00'
+        }
+
+    def count_achieved_dicts(products):
+        achieved = 0
+        for p in products:
+            try:
+                target = p.get('목표가격', '').replace(',', '')
+                current = p.get('할인가', '').replace(',', '')
+                if target and current and int(current) <= int(target):
+                    achieved += 1
+            except ValueError:
+                pass
+        return achieved
+
+    def count_achieved_products(products):
+        achieved = 0
+        for p in products:
+            target = p.target_price
+            current = p.discount_price
+            if isinstance(target, int) and isinstance(current, int) and current <= target:
+                achieved += 1
+        return achieved
+
+    rows = []
+    for label, build, count_achieved in (
+        ('dict (문자열 가격)', make_dict, count_achieved_dicts),
+        ('Product (__slots__, 정수 가격)', lambda idx: Product(make_dict(idx)), count_achieved_products),
+    ):
+        started = time.perf_counter()
+        products = [build(idx) for idx in range(count)]
+        build_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        count_achieved(products)
+        achieved_ms = (time.perf_counter() - started) * 1000
+        del products
+
+        # 메모리는 시간 측정과 따로 (tracemalloc 이 생성 시간을 늘리므로)
+        tracemalloc.start()
+        products = [build(idx) for idx in range(count)]
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append({
+            '방식': label,
+            '메모리(MB)': round(current / (1024 * 1024), 1),
+            '생성(ms)': round(build_ms, 1),
+            '목표가 계산(ms)': round(achieved_ms, 1)
+        })
+        del products
+    return rows
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) in (2, 3) and sys.argv[1] == 'benchmark':
+        count = int(sys.argv[2]) if len(sys.argv) == 3 else 100000
+        for row in benchmark_products(count):
+            print(f"{row['방식']}\t{row['메모리(MB)']}MB\t생성 {row['생성(ms)']}ms\t목표가 계산 {row['목표가 계산(ms)']}ms")
+    else:
+        print("사용법: python oliveyoung_model.py benchmark [상품 수]")
@@ -0,0 +1,132 @@
+"""
+검색 결과 점진 페이징 - 더 볼 페이지가 없으면 검색어별로 일찍 멈춤
+oliveyoung_scraper.py(Playwright) / oliveyoung_scraper_Streamlit.py(requests) 공용
+"""
+import json
+import os
+import threading
+from datetime import datetime
+
+SEARCH_PAGE_SIZE = 24  # 올리브영 검색 결과 한 페이지 상품 수 (첫 페이지부터 페이지 크기 미만 판단에 사용)
+
+STOP_REASONS = {
+    'empty': '빈 페이지',
+    'short_page': '페이지 크기 미만',
+    'repeated': '이미 본 상품만 있음',
+    'unchanged': '이전 크롤링과 동일'
+}
+
+
+class IncrementalPaging:
+    """검색어별 페이지 결과를 보고 다음 페이지를 요청할지 결정
+
+    - 상품이 없거나, 페이지 크기보다 확실히 적거나, 이미 본 상품코드만 있으면 멈춤
+    - use_snapshot 이면 이전 크롤링의 같은 페이지 상품코드 집합과 같을 때도 멈춤
+    - page_size(보통 SEARCH_PAGE_SIZE)를 주면 첫 페이지부터 그 크기를 기준으로 삼고,
+      없으면 이번 크롤링에서 검색어별로 본 가장 큰 페이지 크기를 기준으로 삼음
+      (추출에 실패한 상품 몇 개로 멈추지 않도록 short_page_tolerance 비율만큼 모자란 것은 허용)
+    - 요청이 실패한 페이지(failed=True)는 빈 페이지로 보지 않고 다음 페이지를 계속 요청
+    """
+    def __init__(self, page_size=None, use_snapshot=False, snapshot_file="oliveyoung_page_snapshots.json",
+                 short_page_tolerance=0.25):
+        self.page_size = page_size
+        self.short_page_tolerance = short_page_tolerance
+        self.use_snapshot = use_snapshot
+        self.snapshot_file = snapshot_file
+        self._lock = threading.Lock()
+        self.previous = {}
+        self.load_snapshot()
+        self.reset()
+
+    def reset(self):
+        """크롤링 1회 시작 시 초기화"""
+        with self._lock:
+            self.seen = {}
+            self.stopped = {}
+            self.current = {}
+            self.observed_page_sizes = {}
+            self.pages_fetched = 0
+            self.pages_skipped = 0
+
+    def load_snapshot(self):
+        """이전 크롤링의 검색어/페이지별 상품코드 로드"""
+        try:
+            if os.path.exists(self.snapshot_file):
+                with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                    self.previous = json.load(f).get('keywords', {})
+        except Exception as e:
+            self.previous = {}
+
+    def save_snapshot(self):
+        """이번 크롤링에서 받은 페이지로 스냅샷 갱신 (받지 않은 페이지는 이전 값 유지)"""
+        try:
+            with self._lock:
+                for keyword, pages in self.current.items():
+                    self.previous.setdefault(keyword, {}).update(pages)
+                data = {
+                    'keywords': self.previous,
+                    'last_updated': datetime.now().isoformat()
+                }
+            with open(self.snapshot_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            return True
+        except Exception as e:
+            return False
+
+    def is_stopped(self, keyword):
+        with self._lock:
+            return keyword in self.stopped
+
+    def skip(self, count=1):
+        """멈춘 검색어의 남은 페이지를 건너뛸 때 호출"""
+        with self._lock:
+            self.pages_skipped += count
+
+    def evaluate(self, keyword, page_num, page_products, failed=False):
+        """한 페이지 결과 평가 (failed: 요청 자체가 실패한 페이지)
+
+        반환값: (결과에 남길 상품 목록, 멈춘 이유 또는 None)
+        """
+        codes = [product.get('상품코드', '') for product in page_products if product.get('상품코드')]
+
+        with self._lock:
+            self.pages_fetched += 1
+            if failed and not page_products:
+                return page_products, None
+
+            seen = self.seen.setdefault(keyword, set())
+            observed = self.observed_page_sizes.get(keyword, 0)
+            page_size = max(self.page_size or 0, observed)
+            self.observed_page_sizes[keyword] = max(observed, len(page_products))
+
+            reason = None
+            keep = page_products
+            if not page_products:
+                reason = 'empty'
+            elif codes and len(codes) == len(page_products) and all(code in seen for code in codes):
+                reason = 'repeated'
+                keep = []
+            elif page_size and len(page_products) < page_size * (1 - self.short_page_tolerance):
+                reason = 'short_page'
+            elif (self.use_snapshot and codes and
+                  sorted(set(codes)) == self.previous.get(keyword, {}).get(str(page_num))):
+                reason = 'unchanged'
+
+            seen.update(codes)
+            if reason != 'repeated':
+                self.current.setdefault(keyword, {})[str(page_num)] = sorted(set(codes))
+            if reason:
+                self.stopped[keyword] = (page_num, reason)
+            return keep, reason
+
+    def summary(self):
+        """받은/건너뛴 페이지 수와 검색어별 멈춘 위치"""
+        with self._lock:
+            return {
+                'pages_fetched': self.pages_fetched,
+                'pages_skipped': self.pages_skipped,
+                'stopped': {
+                    keyword: {'page': page_num, 'reason': STOP_REASONS[reason]}
+                    for keyword, (page_num, reason) in self.stopped.items()
+                }
+            }
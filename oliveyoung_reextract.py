@@ -0,0 +1,26 @@
+"""
+보관된 원본 HTML 재추출 - 프로세스 풀 워커
+oliveyoung_scraper_Streamlit.py 의 OliveYoungScraper.reextract_archive() 가 사용
+
+파싱/추출은 순수 파이썬 CPU 작업이라 스레드로는 GIL 때문에 빨라지지 않으므로 프로세스마다 나눠 처리한다.
+워커에는 보관소 경로와 인덱스 항목만 넘기고, 추출기는 워커 프로세스 안에서 한 번만 만든다.
+Streamlit 스크립트는 이 모듈을 통해 워커 프로세스에서만 import 된다 (부모 프로세스에서 스크립트를 다시 실행하지 않음).
+"""
+_worker = {}
+
+
+def init_worker(archive_dir, parser_backend, single_pass_extraction):
+    """워커 프로세스 시작 시 보관소와 추출기 준비"""
+    from oliveyoung_scraper_Streamlit import HtmlArchive, OliveYoungScraper
+
+    scraper = OliveYoungScraper(init_session=False)
+    scraper.parser_backend = parser_backend
+    scraper.single_pass_extraction = single_pass_extraction
+    _worker['archive'] = HtmlArchive(archive_dir)
+    _worker['scraper'] = scraper
+
+
+def reextract_record(record):
+    """인덱스 항목 하나 재추출 - 상품 dict 목록 반환 (프로세스 사이로 넘기기 위해 dict 로 바꿈)"""
+    products = _worker['scraper']._reextract_record(_worker['archive'], record)
+    return [dict(product) for product in products]
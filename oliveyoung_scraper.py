@@ -17,21 +17,30 @@ def ensure_chromium_installed():
         print(f"Playwright chromium 설치 실패: {e}")
 
 import asyncio
-import pandas as pd
+import bisect
 from playwright.async_api import async_playwright
 import time
 import re
-from urllib.parse import quote
+from urllib.parse import quote, urlparse
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
+from contextlib import asynccontextmanager
 from PIL import Image, ImageTk
 import requests
 from io import BytesIO
-import json
 import os
 from datetime import datetime
 import webbrowser
+from oliveyoung_structured import SCAN_MAX_CHARS, PriceTierStats, find_structured_prices
+from oliveyoung_paging import SEARCH_PAGE_SIZE, IncrementalPaging
+from oliveyoung_store import FavoritesStore, ProductDedupIndex, SqliteDataStore, unique_by_goods_no
+from oliveyoung_history import PriceHistoryLog, encode_goods_no
+from oliveyoung_export import (
+    HISTORY_HEADERS, OPENPYXL_AVAILABLE, ExportSheet, export_columns, history_sheet_rows,
+    history_sheet_total, product_rows, write_csv, write_xlsx
+)
+from oliveyoung_model import Product, as_products, target_reached
 
 # matplotlib는 선택적 import
 try:
@@ -42,237 +51,929 @@ try:
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
 
-class OliveYoungScraper:
+class AsyncRateLimiter:
+    """비동기 토큰 버킷 요청 속도 제한"""
+    def __init__(self, requests_per_second=2.0, burst=1):
+        self.requests_per_second = max(float(requests_per_second), 0.01)
+        self.burst = max(float(burst), 1.0)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = None
+    
+    async def acquire(self):
+        """토큰을 얻을 때까지 대기"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.requests_per_second)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.requests_per_second)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# 텍스트/속성만 읽으므로 화면 렌더링용 리소스는 받지 않음
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font', 'stylesheet')
+BLOCKED_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+    'googlesyndication.com', 'googleadservices.com', 'facebook.net',
+    'facebook.com', 'criteo.com', 'criteo.net', 'adnxs.com', 'mobon.net',
+    'wcs.naver.net', 'clarity.ms', 'hotjar.com', 'branch.io', 'appsflyer.com'
+)
+# 차단된 요청은 응답을 받지 않아 실제 크기(Content-Length)를 알 수 없음
+# -> 리소스 종류별 평균 크기를 곱한 추정치로만 표시 (측정값 아님)
+ESTIMATED_RESOURCE_BYTES = {
+    'image': 60000,
+    'media': 500000,
+    'font': 40000,
+    'stylesheet': 30000,
+    'script': 50000,
+    'xhr': 5000,
+    'fetch': 5000
+}
+
+# 크롤링 프로필 - 페이지 이동 대기 방식과 준비 완료 판단 방식
+CRAWL_PROFILES = {
+    '안정': {
+        'wait_until': 'networkidle',
+        'settle_delay': 1,
+        'readiness': 'legacy',
+        'extraction': 'handles'
+    },
+    '빠름': {
+        'wait_until': 'domcontentloaded',
+        'settle_delay': 0,
+        'readiness': 'selectors',
+        'extraction': 'evaluate'
+    }
+}
+DEFAULT_CRAWL_PROFILE = '안정'
+
+# (셀렉터, 타임아웃 ms, 필수 여부) - 필수 셀렉터가 나타나면 준비 완료
+DETAIL_READY_SELECTORS = (
+    ('.price .price-2 strong', 5000, True),
+    ('.prd_brand', 2000, False),
+    ('.prd_name', 2000, False)
+)
+SEARCH_READY_SELECTORS = (
+    ('li.flag.li_result', 8000, True),
+)
+READY_GRACE_MS = 300
+
+DETAIL_PRICE_FALLBACK_SELECTORS = (
+    ".price strong",
+    ".price-2",
+    ".final_price",
+    ".sale_price",
+    ".current_price"
+)
+DETAIL_IMAGE_SELECTORS = (
+    ".prd_img img",
+    ".goods_img img",
+    ".product_img img",
+    ".item_img img",
+    "img[src*='thumbnails']"
+)
+
+# 검색 결과 페이지의 모든 상품 필드를 한 번의 page.evaluate 로 추출
+LIST_EXTRACT_JS = """
+() => Array.from(document.querySelectorAll('li.flag.li_result')).map(el => {
+    const text = (selector, root) => {
+        const node = (root || el).querySelector(selector);
+        return node ? node.innerText : '';
+    };
+    const priceSection = el.querySelector('.prd_price');
+    const img = el.querySelector('.prd_thumb img');
+    const link = el.querySelector('.prd_thumb');
+    return {
+        brand: text('.tx_brand'),
+        name: text('.tx_name'),
+        hasPrice: !!priceSection,
+        original: priceSection ? text('.tx_org .tx_num', priceSection) : '',
+        discount: priceSection ? text('.tx_cur .tx_num', priceSection) : '',
+        flags: Array.from(el.querySelectorAll('.prd_flag .icon_flag')).map(flag => flag.innerText),
+        image: img ? img.getAttribute('src') : '',
+        href: link ? link.getAttribute('href') : ''
+    };
+})
+"""
+
+# 상세 페이지에서 필요한 원시 필드를 한 번의 page.evaluate 로 추출
+DETAIL_EXTRACT_JS = """
+([fallbackSelectors, imageSelectors]) => {
+    const text = selector => {
+        const node = document.querySelector(selector);
+        return node ? node.innerText : null;
+    };
+    const brandNode = document.querySelector('.prd_brand a') || document.querySelector('.prd_brand');
+    const price1 = document.querySelector('.price .price-1');
+    return {
+        brand: brandNode ? brandNode.innerText.trim() : '',
+        name: (text('.prd_name') || '').trim(),
+        discount: text('.price .price-2 strong'),
+        original: text('.price .price-1 strike'),
+        price1: price1 ? price1.innerText : null,
+        price1_has_strike: price1 ? price1.innerHTML.includes('strike') : false,
+        fallbacks: fallbackSelectors.map(text),
+        images: imageSelectors
+            .map(selector => document.querySelector(selector))
+            .filter(node => node)
+            .map(node => node.getAttribute('src'))
+    };
+}
+"""
+
+# 상세 페이지의 구조화 데이터(JSON-LD, 메타 태그, 가격 키가 있는 인라인 스크립트)와 본문 앞부분만 수집
+STRUCTURED_DATA_JS = """
+([scanMaxChars, scriptMaxChars]) => {
+    const jsonLd = [];
+    const scripts = [];
+    document.querySelectorAll('script').forEach(script => {
+        if (script.type === 'application/ld+json') {
+            jsonLd.push(script.textContent);
+        } else if (!script.src && /price|prc/i.test(script.textContent)) {
+            scripts.push(script.textContent.slice(0, scriptMaxChars));
+        }
+    });
+    const meta = {};
+    document.querySelectorAll('meta').forEach(tag => {
+        const key = tag.getAttribute('property') || tag.getAttribute('name') || tag.getAttribute('itemprop');
+        const content = tag.getAttribute('content');
+        if (key && content && !(key in meta)) {
+            meta[key] = content;
+        }
+    });
+    return {
+        json_ld_texts: jsonLd,
+        meta: meta,
+        scripts: scripts,
+        scan_text: document.body ? document.body.innerText.slice(0, scanMaxChars) : ''
+    };
+}
+"""
+
+# 상품 목록에 새 li_result 가 더 이상 추가되지 않을 때까지 스크롤 (MutationObserver 기반)
+SCROLL_UNTIL_STABLE_JS = """
+async ([quietMs, budgetMs]) => {
+    const selector = 'li.flag.li_result';
+    const count = () => document.querySelectorAll(selector).length;
+    const first = document.querySelector(selector);
+    const list = first ? first.closest('ul') : null;
+    const container = (list && list.parentElement) || document.body;
+    const started = performance.now();
+    const initial = count();
+    let scrolls = 0;
+    
+    const scroll = () => {
+        window.scrollTo(0, document.body.scrollHeight);
+        scrolls += 1;
+    };
+    const isProductNode = node => node.nodeType === 1 &&
+        (node.matches('li.li_result') || !!node.querySelector('li.li_result'));
+    
+    return await new Promise(resolve => {
+        let quietTimer = null;
+        let budgetTimer = null;
+        let observer = null;
+        
+        const finish = reason => {
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(budgetTimer);
+            resolve({
+                initial: initial,
+                final: count(),
+                scrolls: scrolls,
+                elapsed_ms: Math.round(performance.now() - started),
+                reason: reason
+            });
+        };
+        const armQuietTimer = () => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(() => finish('stable'), quietMs);
+        };
+        
+        observer = new MutationObserver(mutations => {
+            const added = mutations.some(mutation => Array.from(mutation.addedNodes).some(isProductNode));
+            if (added) {
+                scroll();
+                armQuietTimer();
+            }
+        });
+        observer.observe(container, {childList: true, subtree: true});
+        budgetTimer = setTimeout(() => finish('budget'), budgetMs);
+        
+        scroll();
+        armQuietTimer();
+    });
+}
+"""
+
+class ReadinessStats:
+    """페이지 준비 완료까지 걸린 시간 히스토그램 (프로필/페이지 종류별)"""
+    BUCKETS_MS = (100, 250, 500, 1000, 2000, 4000, 8000)
+    
     def __init__(self):
-        self.base_url = "https://www.oliveyoung.co.kr/store/search/getSearchMain.do"
-        self.products = []
+        self.reset()
+    
+    def reset(self):
+        self.histograms = {}
+    
+    def record(self, key, elapsed, ready):
+        """준비 시간(초)과 성공 여부 기록"""
+        histogram = self.histograms.setdefault(key, {
+            'ready': 0,
+            'timeout': 0,
+            'total_ms': 0.0,
+            'buckets': [0] * (len(self.BUCKETS_MS) + 1)
+        })
+        elapsed_ms = elapsed * 1000
+        histogram['ready' if ready else 'timeout'] += 1
+        histogram['total_ms'] += elapsed_ms
+        histogram['buckets'][bisect.bisect_left(self.BUCKETS_MS, elapsed_ms)] += 1
+    
+    def summary(self):
+        """키별 건수/평균/구간별 분포"""
+        labels = [f"<={limit}ms" for limit in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+        result = {}
+        for key, histogram in self.histograms.items():
+            count = histogram['ready'] + histogram['timeout']
+            result[key] = {
+                'count': count,
+                'ready': histogram['ready'],
+                'timeout': histogram['timeout'],
+                'avg_ms': round(histogram['total_ms'] / count, 1) if count else 0.0,
+                'histogram': dict(zip(labels, histogram['buckets']))
+            }
+        return result
+
+class ResourceBlocker:
+    """브라우저 컨텍스트 라우팅으로 불필요한 리소스 요청 차단"""
+    def __init__(self, blocked_types=BLOCKED_RESOURCE_TYPES, blocked_hosts=BLOCKED_HOSTS, allowed_hosts=()):
+        self.blocked_types = set(blocked_types)
+        self.blocked_hosts = tuple(blocked_hosts)
+        self.set_allowed_hosts(allowed_hosts)
+        self.reset()
+    
+    def set_allowed_hosts(self, hosts):
+        """차단하지 않을 호스트 목록 변경 - 이미 연결된 컨텍스트의 다음 요청부터 바로 적용"""
+        self.allowed_hosts = tuple(
+            host.strip().lower() for host in hosts if host and host.strip()
+        )
+    
+    def set_blocked_types(self, resource_types):
+        """차단할 리소스 종류 변경 (다음 요청부터 적용)"""
+        self.blocked_types = set(resource_types)
+    
+    def reset(self):
+        """크롤링별 통계 초기화"""
+        self.allowed_count = 0
+        self.blocked_count = 0
+        self.blocked_by_type = {}
+        self.estimated_bytes_saved = 0
+    
+    @staticmethod
+    def _host_matches(host, domains):
+        return any(host == domain or host.endswith('.' + domain) for domain in domains)
+    
+    def should_block(self, url, resource_type):
+        """허용 목록 → 차단 호스트 → 리소스 종류 순서로 판단"""
+        host = (urlparse(url).hostname or '').lower()
+        if self.allowed_hosts and self._host_matches(host, self.allowed_hosts):
+            return False
+        if self._host_matches(host, self.blocked_hosts):
+            return True
+        return resource_type in self.blocked_types
+    
+    async def attach(self, context):
+        """컨텍스트의 모든 요청에 라우팅 핸들러 등록"""
+        await context.route("**/*", self._handle_route)
+    
+    async def _handle_route(self, route):
+        request = route.request
+        resource_type = request.resource_type
+        
+        if self.should_block(request.url, resource_type):
+            self.blocked_count += 1
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+            self.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(resource_type, 1000)
+            try:
+                await route.abort()
+            except:
+                pass
+        else:
+            self.allowed_count += 1
+            try:
+                await route.continue_()
+            except:
+                pass
+    
+    def summary(self):
+        """차단 통계"""
+        return {
+            'allowed': self.allowed_count,
+            'blocked': self.blocked_count,
+            'blocked_by_type': dict(self.blocked_by_type),
+            'estimated_bytes_saved': self.estimated_bytes_saved
+        }
+
+class BrowserPagePool:
+    """하나의 Chromium 안에서 N개의 컨텍스트/페이지로 URL 작업을 동시에 처리"""
+    def __init__(self, browser, size=1, user_agent=USER_AGENT, resource_blocker=None, recycle_after_pages=0):
+        self.browser = browser
+        self.size = max(1, int(size))
+        self.user_agent = user_agent
+        self.resource_blocker = resource_blocker
+        self.recycle_after_pages = recycle_after_pages
+        self.contexts = []
+        self.pages = []
+        self.page_counts = []
+        self.recycle_count = 0
+    
+    async def start(self):
+        """컨텍스트와 페이지 생성"""
+        for _ in range(self.size):
+            await self._open_slot()
+    
+    async def _open_slot(self, slot=None):
+        """슬롯 하나에 새 컨텍스트/페이지 생성 (slot 이 없으면 추가)"""
+        context = await self.browser.new_context(user_agent=self.user_agent)
+        if self.resource_blocker:
+            await self.resource_blocker.attach(context)
+        page = await context.new_page()
+        
+        if slot is None:
+            self.contexts.append(context)
+            self.pages.append(page)
+            self.page_counts.append(0)
+        else:
+            self.contexts[slot] = context
+            self.pages[slot] = page
+            self.page_counts[slot] = 0
+    
+    async def _recycle_slot(self, slot):
+        """오래 사용했거나 닫힌 컨텍스트를 새로 교체"""
+        try:
+            await self.contexts[slot].close()
+        except:
+            pass
+        await self._open_slot(slot)
+        self.recycle_count += 1
+    
+    async def close(self):
+        """모든 컨텍스트 종료"""
+        for context in self.contexts:
+            try:
+                await context.close()
+            except:
+                pass
+        self.contexts = []
+        self.pages = []
+        self.page_counts = []
+    
+    async def run(self, jobs, handler, on_result=None, on_error=None):
+        """공유 큐의 작업을 각 페이지가 handler(page, job)로 처리 - 결과는 jobs 순서로 반환
         
-    async def scrape_products(self, search_keywords, max_pages=1, progress_callback=None, result_callback=None):
-        """올리브영에서 여러 검색어로 상품 정보를 크롤링"""
-        self.products = []
+        handler 가 예외를 내면 on_error(job, e) 의 반환값을 결과로 씀 (없으면 None)
+        """
+        queue = asyncio.Queue()
+        for idx, job in enumerate(jobs):
+            queue.put_nowait((idx, job))
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            page = await context.new_page()
+        results = [None] * len(jobs)
+        
+        async def worker(slot):
+            while True:
+                try:
+                    idx, job = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    if self.pages[slot].is_closed():
+                        await self._recycle_slot(slot)
+                    results[idx] = await handler(self.pages[slot], job)
+                except Exception as e:
+                    results[idx] = on_error(job, e) if on_error else None
+                if on_result:
+                    on_result(idx, results[idx])
+                
+                self.page_counts[slot] += 1
+                if self.recycle_after_pages and self.page_counts[slot] >= self.recycle_after_pages:
+                    try:
+                        await self._recycle_slot(slot)
+                    except:
+                        pass
+        
+        await asyncio.gather(*(worker(slot) for slot in range(min(len(self.pages), max(1, len(jobs))))))
+        return results
+
+class BrowserService:
+    """백그라운드 이벤트 루프 스레드에서 Chromium 하나를 계속 유지하는 크롤링 서비스"""
+    def __init__(self, recycle_after_pages=100, headless=True):
+        self.recycle_after_pages = recycle_after_pages
+        self.headless = headless
+        self.launch_count = 0
+        self.restart_count = 0
+        self._loop = None
+        self._thread = None
+        self._started = threading.Event()
+        self._playwright = None
+        self._browser = None
+        self._pool = None
+        self._pool_key = None
+        self._job_lock = None
+    
+    def start(self):
+        """루프 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._loop = asyncio.new_event_loop()
+        self._started.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="BrowserService", daemon=True)
+        self._thread.start()
+        self._started.wait()
+    
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._started.set)
+        self._loop.run_forever()
+    
+    def submit(self, coro):
+        """다른 스레드에서 코루틴을 서비스 루프에 제출 - concurrent.futures.Future 반환"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def warm_up(self):
+        """브라우저를 미리 실행해 첫 작업의 시작 지연 제거"""
+        return self.submit(self._ensure_browser())
+    
+    async def _ensure_browser(self):
+        """브라우저가 없거나 비정상 종료되었으면 (재)실행"""
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        
+        if self._browser is not None:
+            # 크래시 등으로 연결이 끊긴 브라우저 - 이전 풀은 사용할 수 없음
+            self.restart_count += 1
+            self._pool = None
+            self._pool_key = None
+        
+        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        self.launch_count += 1
+        return self._browser
+    
+    @asynccontextmanager
+    async def page_pool(self, size, resource_blocker=None):
+        """유지 중인 브라우저의 페이지 풀 대여 - 작업은 한 번에 하나씩 실행"""
+        if self._job_lock is None:
+            self._job_lock = asyncio.Lock()
+        
+        async with self._job_lock:
+            browser = await self._ensure_browser()
+            
+            pool_key = (size, resource_blocker)
+            if self._pool is None or self._pool_key != pool_key or self._pool.browser is not browser:
+                if self._pool is not None:
+                    await self._pool.close()
+                self._pool = BrowserPagePool(
+                    browser,
+                    size,
+                    resource_blocker=resource_blocker,
+                    recycle_after_pages=self.recycle_after_pages
+                )
+                self._pool_key = pool_key
+                await self._pool.start()
             
+            yield self._pool
+    
+    async def _close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+    
+    def shutdown(self, timeout=10):
+        """브라우저 종료 후 루프 스레드 정지"""
+        if not self._thread or not self._thread.is_alive():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), self._loop).result(timeout)
+        except Exception as e:
+            print(f"브라우저 서비스 종료 오류: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+
+class OliveYoungScraper:
+    def __init__(self, pool_size=1, block_resources=True, crawl_profile=DEFAULT_CRAWL_PROFILE, browser_service=None,
+                 scroll_quiet_ms=400, scroll_budget_ms=5000):
+        self.base_url = "https://www.oliveyoung.co.kr/store/search/getSearchMain.do"
+        self.products = []
+        self.pool_size = pool_size
+        self.browser_service = browser_service
+        self.resource_blocker = ResourceBlocker() if block_resources else None
+        self.crawl_profile = crawl_profile
+        self.readiness_stats = ReadinessStats()
+        self.price_tier_stats = PriceTierStats()
+        self.paging = IncrementalPaging(page_size=SEARCH_PAGE_SIZE)
+        self.dedup_index = ProductDedupIndex()  # 검색어가 달라도 같은 상품은 하나로 합침
+        self.price_log = None  # PriceHistoryLog 를 넣으면 가격 히스토리를 상품 dict 대신 로그에 기록
+        self.scroll_quiet_ms = scroll_quiet_ms
+        self.scroll_budget_ms = scroll_budget_ms
+        self.scroll_stats = []
+        self.last_crawl_stats = {}
+        
+    async def scrape_products(self, search_keywords, max_pages=1, progress_callback=None, result_callback=None,
+                              incremental=False, use_snapshot=False):
+        """올리브영에서 여러 검색어로 상품 정보를 크롤링
+        
+        incremental=True 면 빈 페이지 / 페이지 크기 미만 / 이미 본 상품만 있는 페이지에서 해당 검색어를 멈춤
+        (use_snapshot=True 면 이전 크롤링과 같은 페이지에서도 멈춤)
+        """
+        self.products = []
+        self.dedup_index.reset()
+        paging = None
+        if incremental:
+            paging = self.paging
+            paging.use_snapshot = use_snapshot
+            paging.reset()
+        
+        async with self._page_pool(self.pool_size) as pool:
             try:
                 total_keywords = len(search_keywords)
+                if paging:
+                    # 페이지 순서로 배치해 같은 검색어의 다음 페이지가 앞 페이지 결과를 기다리는 일이 적도록 함
+                    jobs = [
+                        (keyword_idx, keyword, page_num)
+                        for page_num in range(1, max_pages + 1)
+                        for keyword_idx, keyword in enumerate(search_keywords)
+                    ]
+                else:
+                    jobs = [
+                        (keyword_idx, keyword, page_num)
+                        for keyword_idx, keyword in enumerate(search_keywords)
+                        for page_num in range(1, max_pages + 1)
+                    ]
+                # 결과는 항상 검색어 → 페이지 순서로 병합
+                merge_order = sorted(range(len(jobs)), key=lambda idx: (jobs[idx][0], jobs[idx][2]))
+                page_done = {(job[0], job[2]): asyncio.Event() for job in jobs}
+                page_results = {}
+                next_pos = 0
                 
-                for keyword_idx, keyword in enumerate(search_keywords):
+                def on_result(idx, page_products):
+                    # 앞쪽 페이지가 모두 끝난 결과만 순서대로 self.products 에 병합
+                    nonlocal next_pos
+                    page_results[idx] = page_products or []
+                    
+                    keyword_idx, keyword, page_num = jobs[idx]
                     if progress_callback:
-                        progress_callback(f"'{keyword}' 검색 중... ({keyword_idx + 1}/{total_keywords})")
+                        found = len(self.products) + sum(len(r) for r in page_results.values())
+                        progress_callback(f"'{keyword}' {page_num}페이지 완료 - 총 {found}개 상품")
                     
-                    for page_num in range(1, max_pages + 1):
-                        search_url = f"{self.base_url}?query={quote(keyword)}&giftYn=N&t_page=통합&t_click=검색창&t_search_name=검색&page={page_num}"
-                        
-                        await page.goto(search_url, wait_until="networkidle")
-                        await asyncio.sleep(1)
-                        
-                        await self._scroll_to_load_all(page)
-                        await self._extract_products(page, keyword, page_num)
-                        
-                        if progress_callback:
-                            progress_callback(f"'{keyword}' {page_num}페이지 완료 - 총 {len(self.products)}개 상품")
+                    while next_pos < len(merge_order) and merge_order[next_pos] in page_results:
+                        merged_idx = merge_order[next_pos]
+                        self.dedup_index.merge(page_results.pop(merged_idx), self.products)
+                        finished_keyword_page = jobs[merged_idx][2] == max_pages
+                        next_pos += 1
+                        if finished_keyword_page and result_callback:
+                            result_callback(self.products.copy())
+                
+                async def handler(page, job):
+                    keyword_idx, keyword, page_num = job
+                    if paging is None:
+                        if page_num == 1 and progress_callback:
+                            progress_callback(f"'{keyword}' 검색 중... ({keyword_idx + 1}/{total_keywords})")
+                        return await self._scrape_search_page(page, keyword, page_num)
                     
-                    if result_callback:
-                        result_callback(self.products.copy())
+                    try:
+                        if page_num > 1:
+                            await page_done[(keyword_idx, page_num - 1)].wait()
+                        if paging.is_stopped(keyword):
+                            paging.skip()
+                            return []
+                        
+                        if page_num == 1 and progress_callback:
+                            progress_callback(f"'{keyword}' 검색 중... ({keyword_idx + 1}/{total_keywords})")
+                        page_products = await self._scrape_search_page(page, keyword, page_num)
+                        page_products, stop_reason = paging.evaluate(keyword, page_num, page_products or [])
+                        if stop_reason and page_num < max_pages and progress_callback:
+                            progress_callback(f"'{keyword}' {page_num}페이지에서 중단")
+                        return page_products
+                    finally:
+                        page_done[(keyword_idx, page_num)].set()
+                
+                started = time.monotonic()
+                await pool.run(jobs, handler, on_result)
+                fetched = paging.summary()['pages_fetched'] if paging else len(jobs)
+                self._record_crawl_stats(fetched, time.monotonic() - started, pool.size)
+                if paging:
+                    paging.save_snapshot()
+                    self.last_crawl_stats['paging'] = paging.summary()
+                if self.dedup_index.duplicates:
+                    self.last_crawl_stats['duplicates'] = self.dedup_index.duplicates
                         
             except Exception as e:
                 if progress_callback:
                     progress_callback(f"오류 발생: {str(e)}")
-            finally:
-                await browser.close()
                 
         return self.products
     
-    async def scrape_selected_products(self, selected_products, progress_callback=None):
-        """선택된 상품들을 상품코드로 직접 접근하여 빠르게 새로고침"""
-        updated_products = []
+    async def _scrape_search_page(self, page, keyword, page_num):
+        """검색 결과 한 페이지를 열어 상품 목록을 반환"""
+        search_url = f"{self.base_url}?query={quote(keyword)}&giftYn=N&t_page=통합&t_click=검색창&t_search_name=검색&page={page_num}"
+        profile = self._get_profile()
+        
+        started = time.monotonic()
+        await page.goto(search_url, wait_until=profile['wait_until'])
+        if profile['settle_delay']:
+            await asyncio.sleep(profile['settle_delay'])
+        await self._wait_until_ready(page, 'search', started)
+        
+        await self._scroll_to_load_all(page)
+        
+        page_products = []
+        await self._extract_products_to_list(page, keyword, page_products)
+        return page_products
+    
+    def _get_profile(self):
+        """현재 크롤링 프로필 설정"""
+        return CRAWL_PROFILES.get(self.crawl_profile, CRAWL_PROFILES[DEFAULT_CRAWL_PROFILE])
+    
+    async def _wait_until_ready(self, page, page_kind, started):
+        """프로필의 준비 완료 전략으로 대기하고 이동 시작부터 걸린 시간 기록"""
+        profile = self._get_profile()
+        
+        if profile['readiness'] == 'selectors':
+            selectors = DETAIL_READY_SELECTORS if page_kind == 'detail' else SEARCH_READY_SELECTORS
+            ready = await self._wait_for_selectors(page, selectors)
+        else:
+            ready = True
+            if page_kind == 'detail':
+                # 기존 방식: 네트워크 유휴 후 고정 대기
+                await page.wait_for_load_state("networkidle")
+                await asyncio.sleep(3)
+        
+        self.readiness_stats.record(f"{self.crawl_profile}/{page_kind}", time.monotonic() - started, ready)
+        return ready
+    
+    async def _wait_for_selectors(self, page, selectors):
+        """필수 셀렉터가 나타나면 짧은 유예 후 종료, 필수 셀렉터가 시간 초과되면 즉시 종료"""
+        async def wait_for(selector, timeout):
+            try:
+                await page.wait_for_selector(selector, state="attached", timeout=timeout)
+                return True
+            except Exception:
+                return False
+        
+        tasks = [(asyncio.ensure_future(wait_for(selector, timeout)), required)
+                 for selector, timeout, required in selectors]
+        try:
+            required_results = await asyncio.gather(*(task for task, required in tasks if required))
+            ready = all(required_results)
+            
+            pending = [task for task, required in tasks if not required and not task.done()]
+            if ready and pending:
+                await asyncio.wait(pending, timeout=READY_GRACE_MS / 1000)
+            return ready
+        finally:
+            for task, required in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    @asynccontextmanager
+    async def _page_pool(self, pool_size):
+        """페이지 풀 제공 - 브라우저 서비스가 있으면 유지 중인 브라우저를 재사용, 없으면 새로 실행
+        
+        작업별 통계는 풀을 받은 뒤(서비스의 작업 잠금 안에서) 초기화 - 앞 작업이 쓰는 중인 통계를 지우지 않음
+        """
+        if self.browser_service:
+            async with self.browser_service.page_pool(pool_size, self.resource_blocker) as pool:
+                self._reset_job_stats()
+                yield pool
+            return
         
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            page = await context.new_page()
-            
+            pool = BrowserPagePool(browser, pool_size, resource_blocker=self.resource_blocker)
+            try:
+                await pool.start()
+                self._reset_job_stats()
+                yield pool
+            finally:
+                await pool.close()
+                await browser.close()
+    
+    def _reset_job_stats(self):
+        """크롤링/새로고침 한 번 단위의 차단/준비/가격/스크롤 통계 초기화"""
+        if self.resource_blocker:
+            self.resource_blocker.reset()
+        self.readiness_stats.reset()
+        self.price_tier_stats.reset()
+        self.scroll_stats = []
+    
+    def _record_crawl_stats(self, page_count, elapsed, pool_size):
+        """크롤링 처리량 기록 (풀 크기별 분당 페이지 수 비교용)"""
+        self.last_crawl_stats = {
+            'pages': page_count,
+            'elapsed': round(elapsed, 2),
+            'pool_size': pool_size,
+            'pages_per_minute': round(page_count / elapsed * 60, 1) if elapsed > 0 else 0.0
+        }
+        if self.resource_blocker:
+            self.last_crawl_stats['resources'] = self.resource_blocker.summary()
+        self.last_crawl_stats['readiness'] = self.readiness_stats.summary()
+        price_tiers = self.price_tier_stats.summary()
+        if price_tiers:
+            self.last_crawl_stats['price_tiers'] = price_tiers
+        if self.scroll_stats:
+            scroll_times = [stat['elapsed_ms'] for stat in self.scroll_stats]
+            self.last_crawl_stats['scroll'] = {
+                'pages': len(self.scroll_stats),
+                'avg_ms': round(sum(scroll_times) / len(scroll_times), 1),
+                'max_ms': max(scroll_times),
+                'items_loaded': sum(stat['final'] - stat['initial'] for stat in self.scroll_stats),
+                'budget_exhausted': sum(1 for stat in self.scroll_stats if stat['reason'] == 'budget')
+            }
+    
+    async def scrape_selected_products(self, selected_products, progress_callback=None,
+                                       concurrency=None, requests_per_second=2.0):
+        """선택된 상품들을 상품코드로 직접 접근하여 빠르게 새로고침 (같은 상품코드는 한 번만 요청)"""
+        selected_products = unique_by_goods_no(selected_products)
+        updated_products = []
+        pool_size = concurrency or self.pool_size
+        
+        async with self._page_pool(pool_size) as pool:
             try:
                 total_products = len(selected_products)
+                done_count = 0
                 
-                for idx, selected_product in enumerate(selected_products):
-                    brand = selected_product.get('브랜드', '')
-                    name = selected_product.get('상품명', '')[:20] + "..." if len(selected_product.get('상품명', '')) > 20 else selected_product.get('상품명', '')
-                    
-                    if progress_callback:
-                        progress_callback(f"[{idx + 1}/{total_products}] {brand} - {name}")
-                    
-                    product_code = selected_product.get('상품코드', '')
-                    if not product_code:
-                        selected_product['상태'] = '상품코드 없음'
-                        selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        updated_products.append(selected_product)
-                        continue
-                    
-                    try:
-                        product_url = f"https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo={product_code}"
-                        await page.goto(product_url, wait_until="networkidle", timeout=10000)
-                        await asyncio.sleep(1)
-                        
-                        updated_product = await self._extract_product_from_detail_page(page, selected_product)
-                        
-                        if updated_product:
-                            updated_product = self._update_price_history(selected_product, updated_product)
-                            updated_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            updated_product['상태'] = '업데이트됨'
-                            updated_products.append(updated_product)
-                        else:
-                            # 상품 정보를 가져올 수 없는 경우 기존 정보 유지
-                            selected_product['상태'] = '상품 없음'
-                            selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            updated_products.append(selected_product)
-                            
-                    except Exception as e:
-                        selected_product['상태'] = f'오류: {str(e)[:20]}'
-                        selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        updated_products.append(selected_product)
-                        continue
+                if pool.size > 1:
+                    # 고정 대기 대신 속도 제한으로 요청 간격을 조절
+                    rate_limiter = AsyncRateLimiter(requests_per_second)
+                    settle_delay = 0
+                else:
+                    rate_limiter = None
+                    settle_delay = self._get_profile()['settle_delay']
+                
+                def short_name(product):
+                    name = product.get('상품명', '')
+                    return name[:20] + "..." if len(name) > 20 else name
+                
+                def on_result(idx, result):
+                    nonlocal done_count
+                    done_count += 1
+                    if progress_callback and pool.size > 1 and result is not None:
+                        product = selected_products[idx]
+                        progress_callback(f"[{done_count}/{total_products}] {product.get('브랜드', '')} - {short_name(product)}: {result.get('상태', '')}")
+                
+                async def handler(page, job):
+                    idx, selected_product = job
+                    if progress_callback and pool.size == 1:
+                        progress_callback(f"[{idx + 1}/{total_products}] {selected_product.get('브랜드', '')} - {short_name(selected_product)}")
+                    if rate_limiter and selected_product.get('상품코드', ''):
+                        await rate_limiter.acquire()
+                    return await self._refresh_single_product(page, selected_product, settle_delay=settle_delay)
+                
+                def on_error(job, error):
+                    # 페이지 교체 / 속도 제한 등에서 난 예외도 순차 처리 때처럼 '오류' 로 남김 (목록에서 빠지지 않게)
+                    return self._mark_refresh_error(job[1], error)
+                
+                started = time.monotonic()
+                results = await pool.run(list(enumerate(selected_products)), handler, on_result, on_error)
+                self._record_crawl_stats(total_products, time.monotonic() - started, pool.size)
+                updated_products = [result for result in results if result is not None]
                             
             except Exception as e:
                 if progress_callback:
                     progress_callback(f"업데이트 중 오류 발생: {str(e)}")
-            finally:
-                await browser.close()
         
         return updated_products
     
+    async def _refresh_single_product(self, page, selected_product, settle_delay=1):
+        """상품코드로 상세 페이지에 접근하여 한 상품 새로고침"""
+        product_code = selected_product.get('상품코드', '')
+        if not product_code:
+            selected_product['상태'] = '상품코드 없음'
+            selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            return selected_product
+        
+        try:
+            product_url = f"https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo={product_code}"
+            started = time.monotonic()
+            await page.goto(product_url, wait_until=self._get_profile()['wait_until'], timeout=10000)
+            if settle_delay:
+                await asyncio.sleep(settle_delay)
+            await self._wait_until_ready(page, 'detail', started)
+            
+            updated_product = await self._extract_product_from_detail_page(page, selected_product)
+            
+            if updated_product:
+                updated_product = self._update_price_history(selected_product, updated_product)
+                updated_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                updated_product['상태'] = '업데이트됨'
+                return updated_product
+            
+            # 상품 정보를 가져올 수 없는 경우 기존 정보 유지
+            selected_product['상태'] = '상품 없음'
+            selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            return selected_product
+                
+        except Exception as e:
+            return self._mark_refresh_error(selected_product, e)
+    
+    def _mark_refresh_error(self, selected_product, error):
+        """새로고침 실패 - 기존 정보는 유지하고 상태만 오류로 표시"""
+        selected_product['상태'] = f'오류: {str(error)[:20]}'
+        selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return selected_product
+    
     async def _extract_product_from_detail_page(self, page, original_product):
         """상품 상세 페이지에서 정보 추출 (올리브영 구조 기반)"""
         try:
-            # 페이지 로딩 충분히 대기
-            await page.wait_for_load_state("networkidle")
-            await asyncio.sleep(3)
-            
-            # 브랜드명 추출
-            brand = ""
-            try:
-                brand_elem = await page.query_selector(".prd_brand a")
-                if not brand_elem:
-                    brand_elem = await page.query_selector(".prd_brand")
-                if brand_elem:
-                    brand = await brand_elem.inner_text()
-                    brand = brand.strip()
-            except:
-                pass
-            if not brand:
-                brand = original_product.get('브랜드', '')
+            # 페이지 준비 대기는 호출 측(_wait_until_ready)에서 프로필에 따라 처리
+            if self._get_profile()['extraction'] == 'evaluate':
+                fields = await page.evaluate(
+                    DETAIL_EXTRACT_JS,
+                    [list(DETAIL_PRICE_FALLBACK_SELECTORS), list(DETAIL_IMAGE_SELECTORS)]
+                )
+            else:
+                fields = await self._read_detail_fields(page)
             
-            # 상품명 추출
-            name = ""
-            try:
-                name_elem = await page.query_selector(".prd_name")
-                if name_elem:
-                    name = await name_elem.inner_text()
-                    name = name.strip()
-            except:
-                pass
-            if not name:
-                name = original_product.get('상품명', '')
+            # 브랜드명 / 상품명
+            brand = fields.get('brand') or original_product.get('브랜드', '')
+            name = fields.get('name') or original_product.get('상품명', '')
             
             # 가격 정보 추출 (올리브영 구조 기반)
             original_price = ""
             discount_price = ""
-            
-            try:
-                # 할인가 (price-2 안의 strong 태그)
-                discount_price_elem = await page.query_selector(".price .price-2 strong")
-                if discount_price_elem:
-                    discount_price_text = await discount_price_elem.inner_text()
-                    discount_price_text = discount_price_text.strip().replace(',', '')
-                    if discount_price_text.isdigit():
-                        discount_price = f"{int(discount_price_text):,}"
-                        print(f"할인가 추출 성공: {discount_price}")
-                
-                # 정가 (price-1 안의 strike 태그)
-                original_price_elem = await page.query_selector(".price .price-1 strike")
-                if original_price_elem:
-                    original_price_text = await original_price_elem.inner_text()
-                    original_price_text = original_price_text.strip().replace(',', '')
-                    if original_price_text.isdigit():
-                        original_price = f"{int(original_price_text):,}"
-                        print(f"정가 추출 성공: {original_price}")
-                
-                # 할인가만 있고 정가가 없는 경우 (세일이 아닌 상품)
-                if discount_price and not original_price:
-                    # price-1이 정가일 수도 있음
-                    try:
-                        price1_elem = await page.query_selector(".price .price-1")
-                        if price1_elem:
-                            price1_text = await price1_elem.inner_text()
-                            # strike 태그가 없으면 정가로 간주
-                            if "strike" not in await price1_elem.inner_html():
-                                numbers = re.findall(r'[\d,]+', price1_text)
-                                if numbers:
-                                    price_num = numbers[0].replace(',', '')
-                                    if price_num.isdigit():
-                                        original_price = f"{int(price_num):,}"
-                    except:
-                        pass
-                
-            except Exception as e:
-                print(f"가격 추출 중 오류: {e}")
+            selectors_started = time.perf_counter()
+            
+            # 할인가 (price-2 안의 strong 태그)
+            discount_price_text = (fields.get('discount') or '').strip().replace(',', '')
+            if discount_price_text.isdigit():
+                discount_price = f"{int(discount_price_text):,}"
+                print(f"할인가 추출 성공: {discount_price}")
+            
+            # 정가 (price-1 안의 strike 태그)
+            original_price_text = (fields.get('original') or '').strip().replace(',', '')
+            if original_price_text.isdigit():
+                original_price = f"{int(original_price_text):,}"
+                print(f"정가 추출 성공: {original_price}")
+            
+            # 할인가만 있고 정가가 없는 경우 (세일이 아닌 상품) - strike 태그가 없으면 price-1을 정가로 간주
+            if discount_price and not original_price and fields.get('price1') and not fields.get('price1_has_strike'):
+                numbers = re.findall(r'[\d,]+', fields['price1'])
+                if numbers:
+                    price_num = numbers[0].replace(',', '')
+                    if price_num.isdigit():
+                        original_price = f"{int(price_num):,}"
             
             # 대체 가격 추출 방법 (위 방법이 실패한 경우)
             if not discount_price:
-                try:
-                    # 다른 가격 패턴들 시도
-                    price_selectors = [
-                        ".price strong",
-                        ".price-2",
-                        ".final_price",
-                        ".sale_price",
-                        ".current_price"
-                    ]
-                    
-                    for selector in price_selectors:
-                        elem = await page.query_selector(selector)
-                        if elem:
-                            text = await elem.inner_text()
-                            numbers = re.findall(r'[\d,]+', text)
-                            if numbers:
-                                price_num = numbers[0].replace(',', '')
-                                if price_num.isdigit() and int(price_num) > 100:
-                                    discount_price = f"{int(price_num):,}"
-                                    print(f"대체 방법으로 할인가 추출: {discount_price}")
-                                    break
-                except:
-                    pass
+                for text in fields.get('fallbacks') or []:
+                    if text is None:
+                        continue
+                    numbers = re.findall(r'[\d,]+', text)
+                    if numbers:
+                        price_num = numbers[0].replace(',', '')
+                        if price_num.isdigit() and int(price_num) > 100:
+                            discount_price = f"{int(price_num):,}"
+                            print(f"대체 방법으로 할인가 추출: {discount_price}")
+                            break
+            
+            self.price_tier_stats.record('selectors', bool(discount_price), time.perf_counter() - selectors_started)
             
-            # 페이지 전체에서 가격 패턴 찾기 (최후 수단)
+            # 구조화 데이터(JSON-LD / 메타 태그 / 인라인 JS 상태) → 본문 앞부분 제한 스캔 (최후 수단, 이전 가격 확인용)
             if not discount_price:
                 try:
-                    page_content = await page.content()
-                    # 가격 패턴 찾기 (10,000원 이상의 가격만)
-                    price_patterns = re.findall(r'(\d{2,3}(?:,\d{3})*)\s*원', page_content)
-                    valid_prices = []
-                    for price_str in price_patterns:
-                        price_num = int(price_str.replace(',', ''))
-                        if 1000 <= price_num <= 1000000:  # 1천원~100만원 사이
-                            valid_prices.append(price_num)
-                    
-                    if valid_prices:
-                        # 가장 일반적인 가격대를 할인가로 설정
-                        valid_prices.sort(reverse=True)
-                        discount_price = f"{valid_prices[0]:,}"
-                        print(f"페이지 스캔으로 가격 추출: {discount_price}")
-                        
-                        # 더 높은 가격이 있으면 정가로 설정
-                        if len(valid_prices) > 1 and valid_prices[1] > valid_prices[0]:
-                            original_price = f"{valid_prices[1]:,}"
-                except:
-                    pass
+                    sources = await page.evaluate(STRUCTURED_DATA_JS, [SCAN_MAX_CHARS, 20000])
+                    tier, structured_original, structured_discount = find_structured_prices(
+                        stats=self.price_tier_stats,
+                        known_prices=(original_product.get('할인가'), original_product.get('원가')),
+                        **sources
+                    )
+                    if structured_discount:
+                        discount_price = f"{structured_discount:,}"
+                        print(f"{tier} 단계에서 할인가 추출: {discount_price}")
+                        if structured_original and not original_price:
+                            original_price = f"{structured_original:,}"
+                except Exception as e:
+                    print(f"구조화 데이터 가격 추출 오류: {e}")
             
             # 기존 가격 정보 보존
             if not discount_price:
@@ -290,22 +991,9 @@ class OliveYoungScraper:
             
             # 이미지 URL 추출
             image_url = ""
-            try:
-                image_selectors = [
-                    ".prd_img img",
-                    ".goods_img img", 
-                    ".product_img img",
-                    ".item_img img",
-                    "img[src*='thumbnails']"
-                ]
-                for selector in image_selectors:
-                    img_elem = await page.query_selector(selector)
-                    if img_elem:
-                        image_url = await img_elem.get_attribute("src")
-                        if image_url and ("http" in image_url or image_url.startswith("//")):
-                            break
-            except:
-                pass
+            for image_url in fields.get('images') or []:
+                if image_url and ("http" in image_url or image_url.startswith("//")):
+                    break
             if not image_url:
                 image_url = original_product.get('_이미지URL', '')
             
@@ -333,8 +1021,93 @@ class OliveYoungScraper:
             # 오류 발생 시 기존 정보 반환
             return original_product
     
+    async def _read_detail_fields(self, page):
+        """요소 핸들로 상세 페이지 원시 필드 읽기 (DETAIL_EXTRACT_JS 와 같은 형식, 필요한 것만 조회)"""
+        fields = {
+            'brand': '',
+            'name': '',
+            'discount': None,
+            'original': None,
+            'price1': None,
+            'price1_has_strike': False,
+            'fallbacks': [],
+            'images': []
+        }
+        
+        try:
+            brand_elem = await page.query_selector(".prd_brand a")
+            if not brand_elem:
+                brand_elem = await page.query_selector(".prd_brand")
+            if brand_elem:
+                fields['brand'] = (await brand_elem.inner_text()).strip()
+        except:
+            pass
+        
+        try:
+            name_elem = await page.query_selector(".prd_name")
+            if name_elem:
+                fields['name'] = (await name_elem.inner_text()).strip()
+        except:
+            pass
+        
+        try:
+            discount_price_elem = await page.query_selector(".price .price-2 strong")
+            if discount_price_elem:
+                fields['discount'] = await discount_price_elem.inner_text()
+            
+            original_price_elem = await page.query_selector(".price .price-1 strike")
+            if original_price_elem:
+                fields['original'] = await original_price_elem.inner_text()
+        except Exception as e:
+            print(f"가격 추출 중 오류: {e}")
+        
+        has_discount = (fields['discount'] or '').strip().replace(',', '').isdigit()
+        has_original = (fields['original'] or '').strip().replace(',', '').isdigit()
+        
+        if has_discount and not has_original:
+            try:
+                price1_elem = await page.query_selector(".price .price-1")
+                if price1_elem:
+                    fields['price1'] = await price1_elem.inner_text()
+                    fields['price1_has_strike'] = "strike" in await price1_elem.inner_html()
+            except:
+                pass
+        
+        if not has_discount:
+            try:
+                for selector in DETAIL_PRICE_FALLBACK_SELECTORS:
+                    elem = await page.query_selector(selector)
+                    text = await elem.inner_text() if elem else None
+                    fields['fallbacks'].append(text)
+                    numbers = re.findall(r'[\d,]+', text or '')
+                    if numbers and numbers[0].replace(',', '').isdigit() and int(numbers[0].replace(',', '')) > 100:
+                        break
+            except:
+                pass
+        
+        try:
+            for selector in DETAIL_IMAGE_SELECTORS:
+                img_elem = await page.query_selector(selector)
+                if img_elem:
+                    image_url = await img_elem.get_attribute("src")
+                    fields['images'].append(image_url)
+                    if image_url and ("http" in image_url or image_url.startswith("//")):
+                        break
+        except:
+            pass
+        
+        return fields
+    
     def _update_price_history(self, old_product, new_product):
         """가격 히스토리 업데이트"""
+        goods_no = new_product.get('상품코드', '')
+        if self.price_log is not None and encode_goods_no(goods_no) is not None:
+            # 예전 dict 히스토리는 로그로 옮기고, 현재 가격은 로그에만 추가
+            self.price_log.import_entries(goods_no, old_product.get('가격히스토리'))
+            self.price_log.append(goods_no, new_product.get('원가', ''), new_product.get('할인가', ''))
+            new_product.pop('가격히스토리', None)
+            return new_product
+        
         price_history = old_product.get('가격히스토리', [])
         
         current_date = datetime.now().strftime('%Y-%m-%d')
@@ -363,20 +1136,14 @@ class OliveYoungScraper:
         return new_product
     
     async def _scroll_to_load_all(self, page):
-        """페이지를 스크롤하여 모든 상품이 로드되도록 함"""
-        previous_height = 0
-        scroll_attempts = 0
-        max_attempts = 5
+        """상품 목록에 새 항목이 조용한 구간 동안 추가되지 않을 때까지 스크롤 (최대 예산 내)"""
+        try:
+            metrics = await page.evaluate(SCROLL_UNTIL_STABLE_JS, [self.scroll_quiet_ms, self.scroll_budget_ms])
+        except Exception as e:
+            metrics = {'initial': 0, 'final': 0, 'scrolls': 0, 'elapsed_ms': 0, 'reason': f'error: {str(e)[:30]}'}
         
-        while scroll_attempts < max_attempts:
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(1)
-            
-            new_height = await page.evaluate("document.body.scrollHeight")
-            if new_height == previous_height:
-                break
-            previous_height = new_height
-            scroll_attempts += 1
+        self.scroll_stats.append(metrics)
+        return metrics
     
     async def _extract_products(self, page, keyword, page_num):
         """상품 정보 추출"""
@@ -384,70 +1151,111 @@ class OliveYoungScraper:
     
     async def _extract_products_to_list(self, page, keyword, product_list):
         """상품 정보를 지정된 리스트에 추출"""
+        if self._get_profile()['extraction'] == 'evaluate':
+            # 페이지당 한 번의 왕복으로 모든 상품 필드 추출
+            raw_products = await page.evaluate(LIST_EXTRACT_JS)
+        else:
+            raw_products = await self._read_list_fields(page)
+        
+        for raw in raw_products:
+            try:
+                product_info = self._build_list_product(raw, keyword)
+                if product_info:
+                    product_list.append(product_info)
+            except Exception as e:
+                continue
+    
+    async def _read_list_fields(self, page):
+        """요소 핸들로 검색 결과 원시 필드 읽기 (LIST_EXTRACT_JS 와 같은 형식)"""
+        raw_products = []
         product_elements = await page.query_selector_all("li.flag.li_result")
         
         for element in product_elements:
             try:
-                product_info = {}
+                raw = {}
                 
                 brand_elem = await element.query_selector(".tx_brand")
-                product_info['브랜드'] = await brand_elem.inner_text() if brand_elem else ""
+                raw['brand'] = await brand_elem.inner_text() if brand_elem else ""
                 
                 name_elem = await element.query_selector(".tx_name")
-                product_info['상품명'] = await name_elem.inner_text() if name_elem else ""
+                raw['name'] = await name_elem.inner_text() if name_elem else ""
                 
                 price_section = await element.query_selector(".prd_price")
+                raw['hasPrice'] = bool(price_section)
+                raw['original'] = ""
+                raw['discount'] = ""
                 if price_section:
                     original_price_elem = await price_section.query_selector(".tx_org .tx_num")
-                    product_info['원가'] = await original_price_elem.inner_text() if original_price_elem else ""
+                    raw['original'] = await original_price_elem.inner_text() if original_price_elem else ""
                     
                     current_price_elem = await price_section.query_selector(".tx_cur .tx_num")
-                    product_info['할인가'] = await current_price_elem.inner_text() if current_price_elem else ""
+                    raw['discount'] = await current_price_elem.inner_text() if current_price_elem else ""
                 
-                benefits = []
+                raw['flags'] = []
                 benefit_elems = await element.query_selector_all(".prd_flag .icon_flag")
                 for benefit_elem in benefit_elems:
-                    benefit_text = await benefit_elem.inner_text()
-                    benefits.append(benefit_text)
-                product_info['혜택'] = ", ".join(benefits)
+                    raw['flags'].append(await benefit_elem.inner_text())
                 
                 img_elem = await element.query_selector(".prd_thumb img")
-                product_info['_이미지URL'] = await img_elem.get_attribute("src") if img_elem else ""
+                raw['image'] = await img_elem.get_attribute("src") if img_elem else ""
                 
                 link_elem = await element.query_selector(".prd_thumb")
-                href = await link_elem.get_attribute("href") if link_elem else ""
-                if href:
-                    goods_no_match = re.search(r'goodsNo=([A-Z0-9]+)', href)
-                    product_info['상품코드'] = goods_no_match.group(1) if goods_no_match else ""
-                    product_info['상품URL'] = f"https://www.oliveyoung.co.kr{href}" if href.startswith('/') else href
-                else:
-                    product_info['상품코드'] = ""
-                    product_info['상품URL'] = ""
-                
-                product_info['검색키워드'] = keyword
-                product_info['선택됨'] = False
-                product_info['목표가격'] = ""
-                product_info['크롤링시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                current_date = datetime.now().strftime('%Y-%m-%d')
-                product_info['가격히스토리'] = [{
-                    '날짜': current_date,
-                    '원가': product_info['원가'],
-                    '할인가': product_info['할인가'],
-                    '시간': datetime.now().strftime('%H:%M:%S')
-                }]
+                raw['href'] = await link_elem.get_attribute("href") if link_elem else ""
                 
-                product_list.append(product_info)
+                raw_products.append(raw)
                 
             except Exception as e:
                 continue
+        
+        return raw_products
+    
+    def _build_list_product(self, raw, keyword):
+        """검색 결과 원시 필드로 상품 정보 구성 (가격 영역이 없는 항목은 제외)"""
+        if not raw.get('hasPrice'):
+            return None
+        
+        product_info = {}
+        product_info['브랜드'] = raw.get('brand', '')
+        product_info['상품명'] = raw.get('name', '')
+        product_info['원가'] = raw.get('original', '')
+        product_info['할인가'] = raw.get('discount', '')
+        product_info['혜택'] = ", ".join(raw.get('flags', []))
+        product_info['_이미지URL'] = raw.get('image', '')
+        
+        href = raw.get('href', '')
+        if href:
+            goods_no_match = re.search(r'goodsNo=([A-Z0-9]+)', href)
+            product_info['상품코드'] = goods_no_match.group(1) if goods_no_match else ""
+            product_info['상품URL'] = f"https://www.oliveyoung.co.kr{href}" if href.startswith('/') else href
+        else:
+            product_info['상품코드'] = ""
+            product_info['상품URL'] = ""
+        
+        product_info['검색키워드'] = keyword
+        product_info['선택됨'] = False
+        product_info['목표가격'] = ""
+        product_info['크롤링시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        # 가격 로그가 있으면 첫 관측은 관심상품에 추가할 때 로그에 기록 (상품 dict 에 목록을 만들지 않음)
+        if self.price_log is None or encode_goods_no(product_info['상품코드']) is None:
+            current_date = datetime.now().strftime('%Y-%m-%d')
+            product_info['가격히스토리'] = [{
+                '날짜': current_date,
+                '원가': product_info['원가'],
+                '할인가': product_info['할인가'],
+                '시간': datetime.now().strftime('%H:%M:%S')
+            }]
+        
+        # 가격은 여기서 한 번만 정수로 변환
+        return Product(product_info)
 
 class PriceHistoryWindow:
-    def __init__(self, parent, product_data):
+    def __init__(self, parent, product_data, price_log=None):
         self.window = tk.Toplevel(parent)
         self.window.title(f"가격 히스토리 - {product_data.get('상품명', '')}")
         self.window.geometry("800x600")
         self.product_data = product_data
+        self.price_log = price_log
         
         self.setup_ui()
         
@@ -468,7 +1276,10 @@ class PriceHistoryWindow:
             tree.heading(col, text=col)
             tree.column(col, width=120, anchor=tk.CENTER)
         
-        price_history = self.product_data.get('가격히스토리', [])
+        if self.price_log is not None:
+            price_history = self.price_log.entries_for(self.product_data)
+        else:
+            price_history = self.product_data.get('가격히스토리', [])
         for entry in price_history:
             original = entry.get('원가', '0').replace(',', '')
             discount = entry.get('할인가', '0').replace(',', '')
@@ -547,6 +1358,11 @@ class PriceHistoryWindow:
             original_prices = []
             discount_prices = []
             
+            if self.price_log is not None:
+                # 로그는 시각/가격을 정수로 갖고 있어 문자열을 다시 파싱하지 않음
+                dates, original_prices, discount_prices = self.price_log.series_for(self.product_data)
+                price_history = []
+            
             for entry in price_history:
                 try:
                     date_str = f"{entry.get('날짜', '')} {entry.get('시간', '00:00:00')}"
@@ -591,15 +1407,21 @@ class OliveYoungGUI:
         self.root.geometry("1200x900")
         self.root.configure(bg='#f0f0f0')
         
-        self.scraper = OliveYoungScraper()
+        # 브라우저를 계속 띄워 두고 크롤링 작업을 제출 (클릭마다 Chromium 을 새로 실행하지 않음)
+        self.browser_service = BrowserService()
+        self.scraper = OliveYoungScraper(browser_service=self.browser_service)
         self.products_data = []
-        self.favorites_data = []
+        self.favorites_data = FavoritesStore()
         self.image_cache = {}
         self.image_windows = {}
-        self.data_file = "oliveyoung_data.json"
+        self.data_file = "oliveyoung_data.json"  # 이전 버전 데이터 (DB 가 없을 때 한 번 옮겨 옴)
+        self.data_store = SqliteDataStore("oliveyoung_data.db", legacy_json=self.data_file)
+        self.price_log = PriceHistoryLog.shared("oliveyoung_price_log")
+        self.scraper.price_log = self.price_log
         
         self.setup_ui()
         self.load_data()
+        self.browser_service.warm_up()
         
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
@@ -620,6 +1442,30 @@ class OliveYoungGUI:
         page_spinbox = ttk.Spinbox(input_frame, from_=1, to=10, textvariable=self.page_var, width=10)
         page_spinbox.grid(row=2, column=1, sticky=tk.W, padx=(10, 0))
         
+        ttk.Label(input_frame, text="동시 페이지 수:").grid(row=2, column=2, sticky=tk.W, padx=(20, 0))
+        self.concurrency_var = tk.StringVar(value="1")
+        concurrency_spinbox = ttk.Spinbox(input_frame, from_=1, to=8, textvariable=self.concurrency_var, width=10)
+        concurrency_spinbox.grid(row=2, column=3, sticky=tk.W, padx=(10, 0))
+        
+        ttk.Label(input_frame, text="크롤링 프로필:").grid(row=2, column=4, sticky=tk.W, padx=(20, 0))
+        self.profile_var = tk.StringVar(value=DEFAULT_CRAWL_PROFILE)
+        profile_combo = ttk.Combobox(input_frame, textvariable=self.profile_var, values=list(CRAWL_PROFILES), state="readonly", width=8)
+        profile_combo.grid(row=2, column=5, sticky=tk.W, padx=(10, 0))
+        
+        self.block_resources_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(input_frame, text="이미지/폰트/광고 차단", variable=self.block_resources_var).grid(row=2, column=6, sticky=tk.W, padx=(20, 0))
+        
+        # 차단 예외 호스트 (쉼표 구분) - 크롤링 시작 / 새로고침 때마다 반영
+        ttk.Label(input_frame, text="차단 예외 호스트:").grid(row=3, column=5, sticky=tk.E, padx=(20, 0), pady=(10, 0))
+        self.allowed_hosts_var = tk.StringVar(value="")
+        ttk.Entry(input_frame, textvariable=self.allowed_hosts_var, width=30).grid(row=3, column=6, columnspan=3, sticky=tk.W, padx=(5, 0), pady=(10, 0))
+        
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(input_frame, text="점진 페이징", variable=self.incremental_var).grid(row=2, column=7, sticky=tk.W, padx=(20, 0))
+        
+        self.page_snapshot_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(input_frame, text="이전과 같으면 중단", variable=self.page_snapshot_var).grid(row=2, column=8, sticky=tk.W, padx=(10, 0))
+        
         button_frame = ttk.Frame(input_frame)
         button_frame.grid(row=3, column=0, columnspan=3, pady=(10, 0))
         
@@ -981,8 +1827,7 @@ class OliveYoungGUI:
             price_info_frame = ttk.Frame(info_frame)
             price_info_frame.pack(fill=tk.X, pady=(10,0))
             
-            current_price = product.get('할인가', '').replace(',', '')
-            original_price = product.get('원가', '').replace(',', '')
+            current_int = product.price('할인가')
             
             ttk.Label(price_info_frame, text=f"현재 할인가: {product.get('할인가', '')}원", font=('', 11, 'bold'), foreground='red').pack(anchor=tk.W)
             if product.get('원가', '') and product.get('원가', '') != product.get('할인가', ''):
@@ -993,14 +1838,14 @@ class OliveYoungGUI:
             
             ttk.Label(target_frame, text="목표가격 (원):", font=('', 11)).pack(anchor=tk.W)
             
-            current_target = product.get('목표가격', '').replace(',', '').replace('원', '') if product.get('목표가격') else ''
+            current_target = str(product.target_price) if product.price('목표가격') else ''
             target_price_var = tk.StringVar(value=current_target)
             target_entry = ttk.Entry(target_frame, textvariable=target_price_var, font=('', 14), width=20)
             target_entry.pack(fill=tk.X, pady=(8,0))
             target_entry.focus()
             
             # 빠른 설정 버튼들
-            if current_price and current_price.isdigit():
+            if current_int:
                 quick_frame = ttk.Frame(target_frame)
                 quick_frame.pack(fill=tk.X, pady=(15,0))
                 
@@ -1009,11 +1854,9 @@ class OliveYoungGUI:
                 button_frame1 = ttk.Frame(quick_frame)
                 button_frame1.pack(fill=tk.X, pady=(8,0))
                 
-                current_int = int(current_price)
-                
                 # 현재가격
-                ttk.Button(button_frame1, text=f"현재가격\n{current_price}원", 
-                          command=lambda: target_price_var.set(current_price)).pack(side=tk.LEFT, padx=(0,8))
+                ttk.Button(button_frame1, text=f"현재가격\n{current_int:,}원", 
+                          command=lambda: target_price_var.set(str(current_int))).pack(side=tk.LEFT, padx=(0,8))
                 
                 # 5% 할인
                 discount_5 = int(current_int * 0.95)
@@ -1056,7 +1899,7 @@ class OliveYoungGUI:
                         if target_price <= 0:
                             messagebox.showerror("오류", "목표가격은 0보다 큰 값을 입력해주세요.")
                             return
-                        self.favorites_data[item_index]['목표가격'] = f"{target_price:,}"
+                        self.favorites_data[item_index].target_price = target_price
                         messagebox.showinfo("완료", f"목표가격이 {target_price:,}원으로 설정되었습니다.")
                     except ValueError:
                         messagebox.showerror("오류", "올바른 숫자를 입력해주세요.")
@@ -1085,29 +1928,32 @@ class OliveYoungGUI:
         
         keywords = [k.strip() for k in keywords_text.split(',') if k.strip()]
         max_pages = int(self.page_var.get())
+        self.apply_scraper_settings()
         
         self.start_button.config(state=tk.DISABLED)
         self.add_to_favorites_button.config(state=tk.DISABLED)
         self.export_button.config(state=tk.DISABLED)
         
-        thread = threading.Thread(target=self.run_scraping, args=(keywords, max_pages))
+        incremental = self.incremental_var.get()
+        use_snapshot = incremental and self.page_snapshot_var.get()
+        
+        thread = threading.Thread(target=self.run_scraping, args=(keywords, max_pages, incremental, use_snapshot))
         thread.daemon = True
         thread.start()
     
-    def run_scraping(self, keywords, max_pages):
+    def run_scraping(self, keywords, max_pages, incremental=False, use_snapshot=False):
         """크롤링 실행"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            products = loop.run_until_complete(
+            products = self.browser_service.submit(
                 self.scraper.scrape_products(
                     keywords, 
                     max_pages, 
                     progress_callback=self.update_progress,
-                    result_callback=self.update_search_results
+                    result_callback=self.update_search_results,
+                    incremental=incremental,
+                    use_snapshot=use_snapshot
                 )
-            )
+            ).result()
             
             self.root.after(0, self.scraping_complete, products)
             
@@ -1177,17 +2023,8 @@ class OliveYoungGUI:
             
             item_id = self.favorites_tree.insert('', tk.END, values=values)
             
-            if target_price != "미설정":
-                try:
-                    target_int = int(product.get('목표가격', '').replace(',', ''))
-                    current_price_str = product.get('할인가', '').replace(',', '')
-                    if current_price_str and current_price_str.isdigit():
-                        current_int = int(current_price_str)
-                        
-                        if current_int <= target_int:
-                            self.favorites_tree.set(item_id, '목표가격', f"✅ {target_price}")
-                except:
-                    pass
+            if target_reached(product):
+                self.favorites_tree.set(item_id, '목표가격', f"✅ {target_price}")
         
         self.fav_count_var.set(f"총 {len(self.favorites_data)}개 관심상품")
         self.update_favorites_selection_count()
@@ -1195,7 +2032,11 @@ class OliveYoungGUI:
     def scraping_complete(self, products):
         """크롤링 완료"""
         self.display_search_results(products)
-        self.progress_var.set(f"크롤링 완료! 총 {len(products)}개 상품")
+        stats_text = self.format_crawl_stats()
+        if stats_text:
+            self.progress_var.set(f"크롤링 완료! 총 {len(products)}개 상품 ({stats_text})")
+        else:
+            self.progress_var.set(f"크롤링 완료! 총 {len(products)}개 상품")
         self.start_button.config(state=tk.NORMAL)
         self.export_button.config(state=tk.NORMAL)
         self.update_add_to_favorites_button_state()
@@ -1216,7 +2057,7 @@ class OliveYoungGUI:
     
     def update_favorites_selection_count(self):
         """관심상품 선택 개수 업데이트"""
-        selected_count = sum(1 for p in self.favorites_data if p.get('선택됨', False))
+        selected_count = len(self.favorites_data.selected())
         self.fav_selected_var.set(f"선택 {selected_count}개")
     
     def update_add_to_favorites_button_state(self):
@@ -1229,7 +2070,7 @@ class OliveYoungGUI:
     
     def update_favorites_button_states(self):
         """관심상품 관련 버튼 상태 업데이트"""
-        selected_count = sum(1 for p in self.favorites_data if p.get('선택됨', False))
+        selected_count = len(self.favorites_data.selected())
         selection = self.favorites_tree.selection()
         
         if selected_count > 0:
@@ -1253,23 +2094,10 @@ class OliveYoungGUI:
             messagebox.showinfo("알림", "관심상품에 추가할 항목을 선택해주세요.")
             return
         
-        added_count = 0
-        for product in selected_products:
-            brand_name_key = f"{product['브랜드']}_{product['상품명']}"
-            
-            is_duplicate = False
-            for fav_product in self.favorites_data:
-                if f"{fav_product['브랜드']}_{fav_product['상품명']}" == brand_name_key:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                product_copy = product.copy()
-                product_copy['선택됨'] = False
-                product_copy['목표가격'] = ""
-                product_copy['추가시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                self.favorites_data.append(product_copy)
-                added_count += 1
+        added_count = self.favorites_data.add_products(
+            selected_products, added_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
+        self.price_log.record_products(selected_products)
         
         self.display_favorites()
         messagebox.showinfo("완료", f"{added_count}개 상품이 관심상품에 추가되었습니다.")
@@ -1277,25 +2105,18 @@ class OliveYoungGUI:
     
     def remove_from_favorites(self):
         """선택된 관심상품 제거"""
-        selected_indices = []
-        for i, product in enumerate(self.favorites_data):
-            if product.get('선택됨', False):
-                selected_indices.append(i)
-        
-        if not selected_indices:
+        removed_count = self.favorites_data.remove_selected()
+        if not removed_count:
             messagebox.showinfo("알림", "제거할 관심상품을 선택해주세요.")
             return
         
-        for i in reversed(selected_indices):
-            del self.favorites_data[i]
-        
         self.display_favorites()
-        messagebox.showinfo("완료", f"{len(selected_indices)}개 관심상품이 제거되었습니다.")
+        messagebox.showinfo("완료", f"{removed_count}개 관심상품이 제거되었습니다.")
         self.save_data()
     
     def refresh_favorites(self):
         """선택된 관심상품들 새로고침"""
-        selected_products = [p for p in self.favorites_data if p.get('선택됨', False)]
+        selected_products = self.favorites_data.selected()
         if not selected_products:
             messagebox.showinfo("알림", "새로고침할 관심상품을 선택해주세요.")
             return
@@ -1304,7 +2125,8 @@ class OliveYoungGUI:
         self.remove_favorites_button.config(state=tk.DISABLED)
         self.price_history_button.config(state=tk.DISABLED)
         
-        thread = threading.Thread(target=self.run_favorites_refresh, args=(selected_products,))
+        self.apply_scraper_settings()
+        thread = threading.Thread(target=self.run_favorites_refresh, args=(selected_products, self.get_pool_size()))
         thread.daemon = True
         thread.start()
     
@@ -1320,20 +2142,65 @@ class OliveYoungGUI:
         
         if 0 <= item_index < len(self.favorites_data):
             product = self.favorites_data[item_index]
-            PriceHistoryWindow(self.root, product)
+            PriceHistoryWindow(self.root, product, self.price_log)
     
-    def run_favorites_refresh(self, selected_products):
+    def apply_scraper_settings(self):
+        """GUI 설정값을 크롤러에 반영"""
+        self.scraper.pool_size = self.get_pool_size()
+        self.scraper.crawl_profile = self.profile_var.get()
+        if self.block_resources_var.get():
+            if self.scraper.resource_blocker is None:
+                self.scraper.resource_blocker = ResourceBlocker()
+            self.scraper.resource_blocker.set_allowed_hosts(self.allowed_hosts_var.get().split(','))
+        else:
+            self.scraper.resource_blocker = None
+    
+    def format_crawl_stats(self):
+        """최근 크롤링 통계 문자열"""
+        stats = self.scraper.last_crawl_stats
+        if not stats:
+            return ""
+        
+        text = f"페이지 {stats['pool_size']}개 동시, 분당 {stats['pages_per_minute']}페이지"
+        resources = stats.get('resources')
+        if resources:
+            saved_mb = resources['estimated_bytes_saved'] / (1024 * 1024)
+            text += f", 요청 {resources['blocked']}건 차단 (추정 절약 {saved_mb:.1f}MB, 종류별 평균 크기 기준)"
+        scroll = stats.get('scroll')
+        if scroll:
+            text += f", 스크롤 평균 {scroll['avg_ms']:.0f}ms (+{scroll['items_loaded']}개)"
+        for key, readiness in stats.get('readiness', {}).items():
+            text += f", {key} 준비 평균 {readiness['avg_ms']:.0f}ms"
+        paging = stats.get('paging')
+        if paging:
+            text += f", 점진 페이징 {paging['pages_skipped']}페이지 생략"
+        if stats.get('duplicates'):
+            text += f", 중복 상품 {stats['duplicates']}개 병합"
+        price_tiers = stats.get('price_tiers')
+        if price_tiers:
+            tier_text = " / ".join(
+                f"{tier} {entry['hits']}/{entry['attempts']}" for tier, entry in price_tiers.items()
+            )
+            text += f", 가격 단계 적중 {tier_text}"
+        return text
+    
+    def get_pool_size(self):
+        """동시 페이지 수 설정값"""
+        try:
+            return max(1, int(self.concurrency_var.get()))
+        except ValueError:
+            return 1
+    
+    def run_favorites_refresh(self, selected_products, concurrency=1):
         """관심상품 새로고침 실행"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            updated_products = loop.run_until_complete(
+            updated_products = self.browser_service.submit(
                 self.scraper.scrape_selected_products(
                     selected_products,
-                    progress_callback=self.update_progress
+                    progress_callback=self.update_progress,
+                    concurrency=concurrency
                 )
-            )
+            ).result()
             
             self.root.after(0, self.favorites_refresh_complete, updated_products)
             
@@ -1342,20 +2209,16 @@ class OliveYoungGUI:
     
     def favorites_refresh_complete(self, updated_products):
         """관심상품 새로고침 완료"""
-        updated_dict = {f"{p['브랜드']}_{p['상품명']}": p for p in updated_products}
-        
-        for i, product in enumerate(self.favorites_data):
-            key = f"{product['브랜드']}_{product['상품명']}"
-            if key in updated_dict:
-                self.favorites_data[i] = updated_dict[key]
+        self.favorites_data.merge_updates(updated_products)
         
         self.display_favorites()
-        self.progress_var.set("관심상품 새로고침 완료!")
+        stats_text = self.format_crawl_stats()
+        self.progress_var.set(f"관심상품 새로고침 완료! ({stats_text})" if stats_text else "관심상품 새로고침 완료!")
         self.update_favorites_button_states()
         self.save_data()
     
     def export_to_excel(self):
-        """엑셀로 내보내기"""
+        """엑셀(또는 CSV)로 내보내기 - 행을 흘려 쓰는 작업은 별도 스레드에서"""
         if not self.products_data and not self.favorites_data:
             messagebox.showinfo("알림", "내보낼 데이터가 없습니다.")
             return
@@ -1363,36 +2226,60 @@ class OliveYoungGUI:
         filename = filedialog.asksaveasfilename(
             title="엑셀 파일 저장",
             defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("All files", "*.*")],
             initialname=f"올리브영_검색결과_{time.strftime('%Y%m%d_%H%M%S')}.xlsx"
         )
         
         if filename:
-            try:
-                with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                    if self.products_data:
-                        search_data = []
-                        for product in self.products_data:
-                            export_product = {k: v for k, v in product.items() 
-                                            if not k.startswith('_') and k != '선택됨'}
-                            search_data.append(export_product)
-                        
-                        df_search = pd.DataFrame(search_data)
-                        df_search.to_excel(writer, sheet_name='검색결과', index=False)
-                    
-                    if self.favorites_data:
-                        fav_data = []
-                        for product in self.favorites_data:
-                            export_product = {k: v for k, v in product.items() 
-                                            if not k.startswith('_') and k != '선택됨'}
-                            fav_data.append(export_product)
-                        
-                        df_fav = pd.DataFrame(fav_data)
-                        df_fav.to_excel(writer, sheet_name='관심상품', index=False)
-                
-                messagebox.showinfo("완료", f"엑셀 파일이 저장되었습니다:\n{filename}")
-            except Exception as e:
-                messagebox.showerror("오류", f"파일 저장 중 오류가 발생했습니다:\n{str(e)}")
+            self.export_button.config(state=tk.DISABLED)
+            # 내보내는 동안 목록이 바뀌어도 영향이 없도록 목록만 복사 (상품 객체는 공유)
+            thread = threading.Thread(
+                target=self.run_export,
+                args=(filename, list(self.products_data), list(self.favorites_data))
+            )
+            thread.daemon = True
+            thread.start()
+    
+    def run_export(self, filename, products, favorites):
+        """내보내기 실행 - 검색결과 / 관심상품 / 가격히스토리 시트를 한 행씩 기록 (메모리는 히스토리 길이와 무관)"""
+        try:
+            sheets = []
+            if products:
+                columns = export_columns(products)
+                sheets.append(ExportSheet('검색결과', columns, product_rows(products, columns), total=len(products)))
+            
+            if favorites:
+                columns = export_columns(favorites)
+                sheets.append(ExportSheet('관심상품', columns, product_rows(favorites, columns), total=len(favorites)))
+                sheets.append(ExportSheet(
+                    '가격히스토리', HISTORY_HEADERS,
+                    history_sheet_rows(favorites, self.price_log),
+                    total=history_sheet_total(favorites, self.price_log),
+                    skip_empty=True
+                ))
+            
+            progress_callback = lambda message, progress=None: self.update_progress(message)
+            if filename.lower().endswith('.csv') or not OPENPYXL_AVAILABLE:
+                if not filename.lower().endswith('.csv'):
+                    filename = os.path.splitext(filename)[0] + '.csv'
+                paths = write_csv(filename, sheets, progress_callback=progress_callback)
+            else:
+                write_xlsx(filename, sheets, progress_callback=progress_callback)
+                paths = [filename]
+            
+            self.root.after(0, self.export_complete, paths, None)
+        except Exception as e:
+            self.root.after(0, self.export_complete, [], str(e))
+    
+    def export_complete(self, paths, error_msg):
+        """내보내기 완료"""
+        self.export_button.config(state=tk.NORMAL if self.products_data or self.favorites_data else tk.DISABLED)
+        if error_msg:
+            self.progress_var.set(f"오류 발생: {error_msg}")
+            messagebox.showerror("오류", f"파일 저장 중 오류가 발생했습니다:\n{error_msg}")
+            return
+        files_text = "\n".join(paths)
+        messagebox.showinfo("완료", f"파일이 저장되었습니다:\n{files_text}")
     
     def clear_results(self):
         """검색 결과 지우기"""
@@ -1413,25 +2300,22 @@ class OliveYoungGUI:
     def save_data(self):
         """데이터 저장"""
         try:
-            data = {
-                'products': self.products_data,
-                'favorites': self.favorites_data,
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 바뀐 행만 기록
+            self.data_store.save(self.products_data, self.favorites_data)
         except Exception as e:
             print(f"데이터 저장 오류: {e}")
     
     def load_data(self):
         """데이터 로드"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            data = self.data_store.load()
+            if data['products'] or data['favorites']:
+                self.products_data = as_products(data.get('products', []))
+                self.favorites_data = FavoritesStore(data.get('favorites', []))
                 
-                self.products_data = data.get('products', [])
-                self.favorites_data = data.get('favorites', [])
+                # 관심상품 dict 안의 가격히스토리는 가격 로그로 옮김 (한 번만)
+                if self.price_log.migrate_products(self.favorites_data):
+                    self.save_data()
                 
                 if self.products_data:
                     self.display_search_results(self.products_data)
@@ -1456,6 +2340,8 @@ class OliveYoungGUI:
                 pass
         
         self.save_data()
+        self.data_store.close()
+        self.browser_service.shutdown()
         self.root.destroy()
 
 def main():
@@ -8,15 +8,35 @@ st.set_page_config(  # ✅ Streamlit 관련 첫 번째 명령어여야 함
 
 # 필수 라이브러리들
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 import pandas as pd
+import numpy as np
 import time
 import re
+import bisect
 from urllib.parse import quote, urljoin
 from datetime import datetime
 import json
 import os
 import io
+import gzip
+import threading
+import hashlib
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from requests.adapters import HTTPAdapter
+from oliveyoung_structured import SCAN_MAX_CHARS, PriceTierStats, find_structured_prices
+from oliveyoung_paging import SEARCH_PAGE_SIZE, STOP_REASONS, IncrementalPaging
+from oliveyoung_history import PriceHistoryLog, encode_goods_no
+from oliveyoung_export import (
+    HISTORY_HEADERS, ExportSheet, history_sheet_rows, history_sheet_total, history_stats,
+    iter_history, write_xlsx
+)
+from oliveyoung_model import Product, as_products, target_reached
+from oliveyoung_store import (
+    FavoritesStore, ProductDedupIndex, SqliteDataStore, unique_by_goods_no
+)
 
 # 선택적 라이브러리들
 try:
@@ -27,8 +47,937 @@ except ImportError:
     PLOTLY_AVAILABLE = False
     st.warning("📊 그래프 기능을 사용할 수 없습니다. plotly가 설치되지 않았습니다.")
 
-class OliveYoungScraper:
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lxml  # noqa: F401 - BeautifulSoup 'lxml' 파서 백엔드
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# HTML 파서 백엔드
+# - html.parser: 순수 파이썬 기본 파서
+# - lxml: C 기반 파서 (빠름)
+# - scoped: 검색 결과에서 상품 목록 후보 요소만 트리로 구성 (상품이 없으면 전체 파싱으로 재시도)
+PARSER_BACKENDS = {
+    'html.parser': '기본 (html.parser)',
+    'lxml': 'lxml',
+    'scoped': '상품 목록만 파싱 (lxml + SoupStrainer)'
+}
+# 기본값은 예전과 같은 html.parser - lxml 계열은 사이드바에서 골라야 사용됨
+DEFAULT_PARSER_BACKEND = 'html.parser'
+
+# scoped 모드에서 남길 상품 후보 요소 (_extract_products 의 셀렉터/패턴과 같은 범위)
+PRODUCT_LIST_STRAINER = SoupStrainer(
+    attrs={'class': re.compile(r'(prd|product|item|goods|li_result|search_item)', re.I)}
+)
+
+def parse_html(html, backend=DEFAULT_PARSER_BACKEND, scoped=False):
+    """파서 백엔드 이름에 맞춰 BeautifulSoup 생성"""
+    features = 'html.parser'
+    if backend in ('lxml', 'scoped') and LXML_AVAILABLE:
+        features = 'lxml'
+    
+    if scoped and backend == 'scoped':
+        return BeautifulSoup(html, features, parse_only=PRODUCT_LIST_STRAINER)
+    return BeautifulSoup(html, features)
+
+# 동시 크롤링 워커 수 상한 (사이드바 '동시 요청 수' 최대값) - 세션 커넥션 풀도 이 크기로 한 번만 만듦
+MAX_CONCURRENT_WORKERS = 8
+
+class RateLimiter:
+    """호스트별 요청 속도 제한 (토큰 버킷 초당 요청 수 + 최대 동시 요청 수)"""
+    def __init__(self, requests_per_second=2.0, max_in_flight=4, burst=1):
+        self.requests_per_second = max(float(requests_per_second), 0.01)
+        self.max_in_flight = max(int(max_in_flight), 1)
+        self.burst = max(float(burst), 1.0)
+        self._lock = threading.Lock()
+        self._hosts = {}
+    
+    def _get_host_state(self, host):
+        """호스트별 토큰/세마포어 상태 조회 (없으면 생성)"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = {
+                    'tokens': self.burst,
+                    'last': time.monotonic(),
+                    'semaphore': threading.BoundedSemaphore(self.max_in_flight)
+                }
+                self._hosts[host] = state
+            return state
+    
+    def acquire(self, url):
+        """동시 요청 슬롯과 토큰을 얻을 때까지 대기"""
+        host = urlparse(url).netloc
+        state = self._get_host_state(host)
+        state['semaphore'].acquire()
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - state['last']
+                state['tokens'] = min(self.burst, state['tokens'] + elapsed * self.requests_per_second)
+                state['last'] = now
+                if state['tokens'] >= 1:
+                    state['tokens'] -= 1
+                    return host
+                wait_time = (1 - state['tokens']) / self.requests_per_second
+            time.sleep(wait_time)
+    
+    def release(self, host):
+        """동시 요청 슬롯 반환"""
+        self._get_host_state(host)['semaphore'].release()
+    
+    @contextmanager
+    def limit(self, url):
+        """with 블록 동안 요청 슬롯 점유"""
+        host = self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+# 부분 일치([class*='x']) / 태그 이름만 있는 셀렉터(h3, img, del)는 일반 폴백으로 보고 우선순위를 낮춤
+GENERIC_SELECTOR_PATTERN = re.compile(r'^[a-z0-9\s]+$', re.I)
+
+def selector_priority(selector):
+    """0 = 구체적인 셀렉터, 1 = 일반 폴백 셀렉터"""
+    if '*=' in selector or GENERIC_SELECTOR_PATTERN.match(selector):
+        return 1
+    return 0
+
+class SelectorStrategyCache:
+    """엔드포인트별로 성공한 셀렉터를 기억해 먼저 시도하는 캐시 (적중/실패 통계는 파일로 유지)
+    
+    캐시된 셀렉터는 목록에서 그 앞에 있는 셀렉터들보다 우선순위가 낮지 않을 때만 먼저 시도한다
+    (일반 폴백이 한 번 맞았다고 이후 상품에서 구체적인 셀렉터보다 앞서지 않도록).
+    """
+    def __init__(self, cache_file="oliveyoung_selector_cache.json"):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self.strategies = {}
+        self.load()
+    
+    def load(self):
+        """저장된 셀렉터 전략과 통계 로드"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.strategies = json.load(f).get('strategies', {})
+        except Exception as e:
+            self.strategies = {}
+    
+    def save(self):
+        """셀렉터 전략과 통계 저장"""
+        try:
+            with self._lock:
+                data = {
+                    'strategies': self.strategies,
+                    'last_updated': datetime.now().isoformat()
+                }
+                with open(self.cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+            return True
+        except Exception as e:
+            return False
+    
+    def _record(self, endpoint, field, selector, hit):
+        with self._lock:
+            entry = self.strategies.setdefault(endpoint, {}).setdefault(field, {
+                'selector': None,
+                'hits': 0,
+                'misses': 0
+            })
+            if hit:
+                entry['hits'] += 1
+            else:
+                entry['misses'] += 1
+                if selector:
+                    entry['selector'] = selector
+    
+    @staticmethod
+    def can_shortcut(cached, selectors):
+        """캐시된 셀렉터를 먼저 시도해도 되는지 - 목록 앞쪽 셀렉터보다 우선순위가 같거나 높을 때만"""
+        if cached not in selectors:
+            return False
+        priority = selector_priority(cached)
+        return all(priority <= selector_priority(selector) for selector in selectors[:selectors.index(cached)])
+    
+    def find(self, endpoint, field, selectors, finder):
+        """캐시된 셀렉터를 먼저 시도하고, 실패하면 전체 셀렉터를 순서대로 시도
+        
+        finder(selector) 가 참인 값을 반환하면 그 값을 채택한다.
+        """
+        with self._lock:
+            cached = self.strategies.get(endpoint, {}).get(field, {}).get('selector')
+        if cached and not self.can_shortcut(cached, selectors):
+            cached = None
+        
+        if cached:
+            result = finder(cached)
+            if result:
+                self._record(endpoint, field, cached, True)
+                return result
+        
+        for selector in selectors:
+            if selector == cached:
+                continue
+            result = finder(selector)
+            if result:
+                self._record(endpoint, field, selector, False)
+                return result
+        
+        self._record(endpoint, field, None, False)
+        return None
+    
+    def summary_rows(self):
+        """사이드바 표시용 통계"""
+        rows = []
+        with self._lock:
+            for endpoint, fields in self.strategies.items():
+                for field, entry in fields.items():
+                    total = entry['hits'] + entry['misses']
+                    rows.append({
+                        '엔드포인트': endpoint,
+                        '필드': field,
+                        '셀렉터': entry['selector'] or '',
+                        '적중': entry['hits'],
+                        '실패': entry['misses'],
+                        '적중률': f"{entry['hits'] / total * 100:.0f}%" if total else "-"
+                    })
+        return rows
+
+# 검색 페이지 한 번의 결과 - 상품 있음 / 정상 응답이지만 상품 없음 / 요청·파싱 실패
+PAGE_FOUND = 'found'
+PAGE_EMPTY = 'empty'
+PAGE_FAILED = 'failed'
+PAGE_STATUS_LABELS = {PAGE_FOUND: '성공', PAGE_EMPTY: '상품 없음', PAGE_FAILED: '실패'}
+
+class EndpointHealth:
+    """검색 엔드포인트별 서킷 브레이커
+    
+    연속 failure_threshold 번 실패하면 cooldown 초 동안 건너뛰고(open),
+    쿨다운이 지나면 한 번만 시험 요청(half-open)을 보내 성공 시 복구한다.
+    상품이 없는 정상 응답(마지막 페이지 다음, 결과 없는 검색어)은 실패가 아니라 정상으로 기록한다.
+    """
+    ENDPOINTS = ('mobile', 'desktop', 'post')
+    LABELS = {'mobile': '모바일', 'desktop': '데스크톱', 'post': 'POST'}
+    
+    def __init__(self, failure_threshold=3, cooldown=120):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.last_success = None
+        self.states = {}
+        for endpoint in self.ENDPOINTS:
+            self.states[endpoint] = {
+                'state': 'closed',
+                'consecutive_failures': 0,
+                'opened_at': 0,
+                'probing': False,
+                'successes': 0,
+                'empty': 0,
+                'failures': 0,
+                'skipped': 0,
+                'total_time': 0.0
+            }
+    
+    def plan(self):
+        """이번 페이지에서 시도할 엔드포인트 순서"""
+        now = time.time()
+        with self._lock:
+            order = list(self.ENDPOINTS)
+            if self.last_success in order:
+                order.remove(self.last_success)
+                order.insert(0, self.last_success)
+            
+            plan = []
+            for endpoint in order:
+                entry = self.states[endpoint]
+                if entry['state'] == 'open' and now - entry['opened_at'] >= self.cooldown:
+                    entry['state'] = 'half_open'
+                
+                if entry['state'] in ('closed', 'half_open'):
+                    plan.append(endpoint)
+                else:
+                    entry['skipped'] += 1
+            
+            if not plan:
+                # 모두 차단된 경우 가장 먼저 열린 엔드포인트로 시험 요청
+                endpoint = min(order, key=lambda e: self.states[e]['opened_at'])
+                plan.append(endpoint)
+            
+            return plan
+    
+    def begin(self, endpoint):
+        """요청 직전 호출 - 시험중(half-open) 엔드포인트는 동시에 하나의 요청만 허용"""
+        with self._lock:
+            entry = self.states[endpoint]
+            if entry['state'] == 'half_open':
+                if entry['probing']:
+                    entry['skipped'] += 1
+                    return False
+                entry['probing'] = True
+            return True
+    
+    def record(self, endpoint, status, elapsed=0.0):
+        """요청 결과 기록 - status 는 PAGE_FOUND / PAGE_EMPTY / PAGE_FAILED (200 응답을 파싱했으면 정상)"""
+        with self._lock:
+            entry = self.states[endpoint]
+            entry['probing'] = False
+            entry['total_time'] += elapsed
+            if status != PAGE_FAILED:
+                entry['consecutive_failures'] = 0
+                entry['state'] = 'closed'
+                if status == PAGE_EMPTY:
+                    entry['empty'] += 1
+                else:
+                    # 상품을 실제로 추출한 엔드포인트만 다음 페이지에서 먼저 시도
+                    entry['successes'] += 1
+                    self.last_success = endpoint
+            else:
+                entry['failures'] += 1
+                entry['consecutive_failures'] += 1
+                if entry['state'] == 'half_open' or entry['consecutive_failures'] >= self.failure_threshold:
+                    entry['state'] = 'open'
+                    entry['opened_at'] = time.time()
+                if self.last_success == endpoint:
+                    self.last_success = None
+    
+    def summary_rows(self):
+        """사이드바 표시용 전략 테이블"""
+        now = time.time()
+        state_labels = {'closed': '정상', 'open': '차단', 'half_open': '시험중'}
+        rows = []
+        with self._lock:
+            for endpoint in self.ENDPOINTS:
+                entry = self.states[endpoint]
+                attempts = entry['successes'] + entry['empty'] + entry['failures']
+                remaining = ''
+                if entry['state'] == 'open':
+                    remaining = f"{max(0, self.cooldown - (now - entry['opened_at'])):.0f}초"
+                rows.append({
+                    '엔드포인트': self.LABELS[endpoint],
+                    '상태': state_labels[entry['state']],
+                    '우선': '✓' if endpoint == self.last_success else '',
+                    '성공': entry['successes'],
+                    '상품없음': entry['empty'],
+                    '실패': entry['failures'],
+                    '연속실패': entry['consecutive_failures'],
+                    '건너뜀': entry['skipped'],
+                    '평균시간': f"{entry['total_time'] / attempts:.2f}초" if attempts else '-',
+                    '재시도까지': remaining
+                })
+        return rows
+
+# 상품 필드별 셀렉터 (앞에 있을수록 우선)
+BRAND_SELECTORS = [
+    ".tx_brand", ".brand", ".prd_brand", ".brand_name",
+    "[class*='brand']", ".maker", ".company",
+    # 모바일 버전
+    ".item_brand", ".goods_brand", ".prod_brand"
+]
+NAME_SELECTORS = [
+    ".tx_name", ".name", ".prd_name", ".title", ".product_name",
+    "[class*='name']", "[class*='title']", "h3", "h4",
+    # 모바일 버전
+    ".item_name", ".goods_name", ".prod_name", ".item_title"
+]
+PRICE_SECTION_SELECTORS = [
+    ".prd_price", ".price", "[class*='price']", ".cost", ".amount",
+    ".item_price", ".goods_price", ".prod_price"  # 모바일
+]
+ORIGINAL_PRICE_SELECTORS = [
+    ".tx_org .tx_num", ".original", ".before", "strike", "del",
+    "[class*='original']", "[class*='before']", ".old_price",
+    ".regular_price", ".list_price"
+]
+DISCOUNT_PRICE_SELECTORS = [
+    ".tx_cur .tx_num", ".current", ".sale", ".final", ".now",
+    "[class*='current']", "[class*='sale']", "[class*='final']",
+    ".sale_price", ".discount_price", ".special_price"
+]
+BENEFIT_SELECTORS = [
+    ".prd_flag .icon_flag", ".benefit", ".tag", "[class*='flag']",
+    "[class*='benefit']", ".event", ".promotion", ".special",
+    # 모바일
+    ".item_flag", ".goods_flag", ".prod_flag"
+]
+IMAGE_SELECTORS = [
+    "img", ".prd_thumb img", ".thumb img", "[class*='img'] img",
+    ".item_img img", ".goods_img img", ".prod_img img"  # 모바일
+]
+PRODUCT_FIELD_SELECTORS = (
+    BRAND_SELECTORS + NAME_SELECTORS + PRICE_SECTION_SELECTORS + ORIGINAL_PRICE_SELECTORS +
+    DISCOUNT_PRICE_SELECTORS + BENEFIT_SELECTORS + IMAGE_SELECTORS
+)
+
+GOODS_CODE_PATTERNS = [
+    re.compile(r'goodsNo=([A-Z0-9]+)', re.I),
+    re.compile(r'goods_no=([A-Z0-9]+)', re.I),
+    re.compile(r'prdNo=([A-Z0-9]+)', re.I),
+    re.compile(r'/goods/([A-Z0-9]+)', re.I),
+    re.compile(r'/product/([A-Z0-9]+)', re.I)
+]
+PRICE_NUMBER_PATTERN = re.compile(r'[\d,]+')
+
+_SIMPLE_SELECTOR_PATTERNS = [
+    ('class', re.compile(r"^\.([\w-]+)$")),
+    ('class_contains', re.compile(r"^\[class\*='([^']+)'\]$")),
+    ('tag', re.compile(r"^([a-z][a-z0-9]*)$"))
+]
+
+def _parse_simple_selector(selector):
+    """'.cls' / '[class*=x]' / 'tag' 형태를 (종류, 값) 으로 변환 (지원하지 않으면 None)"""
+    for kind, pattern in _SIMPLE_SELECTOR_PATTERNS:
+        match = pattern.match(selector)
+        if match:
+            return kind, match.group(1)
+    return None
+
+class _SelectorTable:
+    """단순 셀렉터를 클래스/태그 사전과 부분일치 목록으로 분류해 두는 조회표"""
     def __init__(self):
+        self.by_class = {}
+        self.by_tag = {}
+        self.contains = []
+    
+    def add(self, part, value):
+        kind, name = part
+        if kind == 'class':
+            self.by_class.setdefault(name, []).append(value)
+        elif kind == 'tag':
+            self.by_tag.setdefault(name, []).append(value)
+        else:
+            self.contains.append((name, value))
+    
+    def lookup(self, name, classes, class_str):
+        found = []
+        for class_name in classes:
+            found.extend(self.by_class.get(class_name, ()))
+        found.extend(self.by_tag.get(name, ()))
+        for text, value in self.contains:
+            if text in class_str:
+                found.append(value)
+        return found
+
+class ProductFieldIndex:
+    """상품 요소의 하위 트리를 한 번만 순회해 필드 셀렉터별 일치 요소를 문서 순서대로 모아 둠
+    
+    select_one/select 는 BeautifulSoup 과 같은 결과를 돌려주며,
+    미리 분류하지 않은 셀렉터는 BeautifulSoup 으로 위임한다.
+    """
+    _compiled = {}
+    
+    def __init__(self, element, selectors=PRODUCT_FIELD_SELECTORS):
+        self.element = element
+        self.targets, self.ancestors, self.ancestor_bits, self.indexed = self._compile(tuple(selectors))
+        self.matches = {}
+        self.spans = {}
+        self._counter = 0
+        
+        # 루트와 그 조상이 만족하는 조상 셀렉터 (하위 셀렉터 'A B' 의 A)
+        inherited = 0
+        for node in [element] + list(element.parents):
+            inherited |= self._ancestor_flags(node)
+        self._walk(element, inherited)
+    
+    @classmethod
+    def _compile(cls, selectors):
+        if selectors in cls._compiled:
+            return cls._compiled[selectors]
+        
+        targets = _SelectorTable()
+        ancestors = _SelectorTable()
+        ancestor_bits = {}
+        indexed = set()
+        for selector in selectors:
+            parts = [_parse_simple_selector(part) for part in selector.split()]
+            if not parts or len(parts) > 2 or None in parts:
+                continue
+            
+            bit = 0
+            if len(parts) == 2:
+                if parts[0] not in ancestor_bits:
+                    ancestor_bits[parts[0]] = 1 << len(ancestor_bits)
+                    ancestors.add(parts[0], ancestor_bits[parts[0]])
+                bit = ancestor_bits[parts[0]]
+            targets.add(parts[-1], (selector, bit))
+            indexed.add(selector)
+        
+        cls._compiled[selectors] = (targets, ancestors, ancestor_bits, frozenset(indexed))
+        return cls._compiled[selectors]
+    
+    @staticmethod
+    def _class_info(tag):
+        classes = tag.get('class') or []
+        if isinstance(classes, str):
+            classes = classes.split()
+        return classes, ' '.join(classes)
+    
+    def _ancestor_flags(self, tag):
+        if not self.ancestor_bits or not isinstance(tag, Tag):
+            return 0
+        classes, class_str = self._class_info(tag)
+        flags = 0
+        for bit in self.ancestors.lookup(tag.name, classes, class_str):
+            flags |= bit
+        return flags
+    
+    def _walk(self, parent, inherited):
+        for child in parent.children:
+            if not isinstance(child, Tag):
+                continue
+            
+            self._counter += 1
+            order = self._counter
+            classes, class_str = self._class_info(child)
+            
+            for selector, bit in self.targets.lookup(child.name, classes, class_str):
+                if bit and not inherited & bit:
+                    continue
+                orders, tags = self.matches.setdefault(selector, ([], []))
+                if tags and tags[-1] is child:
+                    continue
+                orders.append(order)
+                tags.append(child)
+            
+            own = 0
+            if self.ancestor_bits:
+                for bit in self.ancestors.lookup(child.name, classes, class_str):
+                    own |= bit
+            self._walk(child, inherited | own)
+            self.spans[id(child)] = (order, self._counter)
+    
+    def select_one(self, selector, scope=None):
+        """scope(기본: 상품 요소) 하위에서 셀렉터와 일치하는 첫 요소"""
+        if scope is None:
+            scope = self.element
+        if selector not in self.matches:
+            if selector in self.indexed:
+                return None
+            return scope.select_one(selector)
+        
+        orders, tags = self.matches[selector]
+        if scope is self.element:
+            return tags[0]
+        
+        span = self.spans.get(id(scope))
+        if span is None:
+            return scope.select_one(selector)
+        position = bisect.bisect_right(orders, span[0])
+        if position < len(orders) and orders[position] <= span[1]:
+            return tags[position]
+        return None
+    
+    def select(self, selector):
+        """상품 요소 하위에서 셀렉터와 일치하는 모든 요소 (문서 순서)"""
+        if selector not in self.matches:
+            if selector in self.indexed:
+                return []
+            return self.element.select(selector)
+        return list(self.matches[selector][1])
+
+# 200 으로 오지만 실제 페이지가 아닌 봇 차단/접근 제한 안내 페이지
+BLOCK_PAGE_PATTERN = re.compile(
+    r'captcha|cf-chl|challenge-platform|access denied|비정상적인 접근|접근이 (?:차단|제한)',
+    re.I
+)
+
+def is_cacheable_response(response):
+    """응답 캐시에 저장해도 되는 200 응답인지 (HTML 이 아니거나 차단 안내 페이지면 False)"""
+    content_type = response.headers.get('Content-Type', '')
+    if content_type and 'html' not in content_type and 'json' not in content_type:
+        return False
+    return not BLOCK_PAGE_PATTERN.search(response.text)
+
+class ResponseCache:
+    """디스크 HTTP 응답 캐시 (GET 전용)
+    
+    - 키: 메서드 + 정규화된 URL(호스트 소문자, 쿼리 파라미터 정렬)
+    - 엔드포인트별 TTL 안에서는 네트워크 없이 응답, 지나면 ETag/Last-Modified 로 조건부 요청
+    - revalidate=True 면 TTL 과 상관없이 조건부 요청 (관심상품 새로고침처럼 최신 값이 필요할 때)
+    - validate(response) 가 False 인 200 응답(봇 차단 안내 페이지 등)은 저장하지 않음
+    - 본문 합계가 max_bytes 를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    """
+    # (URL 에 포함된 문자열, TTL 초) - 앞에서부터 매칭
+    DEFAULT_TTLS = [
+        ('getGoodsDetail.do', 600),
+        ('searchList.do', 300),
+        ('getSearchMain.do', 300)
+    ]
+    
+    def __init__(self, cache_dir="oliveyoung_http_cache", max_bytes=50 * 1024 * 1024, ttls=None):
+        self.cache_dir = cache_dir
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self.max_bytes = max_bytes
+        self.ttls = ttls if ttls is not None else list(self.DEFAULT_TTLS)
+        self.enabled = True
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.reset_stats()
+        self.load()
+    
+    def reset_stats(self):
+        """크롤링 1회 단위 통계 초기화"""
+        self.stats = {
+            'hits': 0,
+            'revalidated': 0,
+            'misses': 0,
+            'stored': 0,
+            'evicted': 0,
+            'rejected': 0,
+            'network': 0,
+            'bytes_saved': 0
+        }
+    
+    def load(self):
+        """캐시 인덱스 로드"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('entries', {})
+        except Exception as e:
+            self.entries = {}
+    
+    def save(self):
+        """캐시 인덱스 저장"""
+        try:
+            with self._lock:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(self.index_file, 'w', encoding='utf-8') as f:
+                    json.dump({'entries': self.entries}, f, ensure_ascii=False)
+            return True
+        except Exception as e:
+            return False
+    
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            for key in list(self.entries):
+                self._remove(key)
+            self.entries = {}
+        self.save()
+    
+    @staticmethod
+    def make_key(method, url, params=None):
+        """메서드 + 정규화된 URL 로 캐시 키 생성"""
+        parsed = urlparse(url)
+        query = parse_qsl(parsed.query, keep_blank_values=True)
+        if params:
+            items = params.items() if isinstance(params, dict) else params
+            query.extend((str(k), str(v)) for k, v in items)
+        normalized = urlunparse((
+            parsed.scheme.lower(),
+            parsed.netloc.lower(),
+            parsed.path or '/',
+            '',
+            urlencode(sorted(query)),
+            ''
+        ))
+        return f"{method.upper()} {normalized}"
+    
+    def ttl_for(self, url):
+        for pattern, ttl in self.ttls:
+            if pattern in url:
+                return ttl
+        return 0
+    
+    def _body_path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + ".body")
+    
+    def _remove(self, key):
+        self.entries.pop(key, None)
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+    
+    def _read_body(self, key):
+        try:
+            with open(self._body_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _build_response(self, entry, body):
+        """캐시된 본문으로 requests.Response 구성"""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = requests.structures.CaseInsensitiveDict(entry.get('headers', {}))
+        response.url = entry['url']
+        response.encoding = entry.get('encoding')
+        response.from_cache = True
+        return response
+    
+    def request(self, send, method, url, revalidate=False, validate=None, **kwargs):
+        """send(method, url, **kwargs) 로 실제 요청을 보내되 캐시를 먼저 확인"""
+        ttl = self.ttl_for(url)
+        if not self.enabled or method.upper() != 'GET' or ttl <= 0:
+            with self._lock:
+                self.stats['network'] += 1
+            return send(method, url, **kwargs)
+        
+        key = self.make_key(method, url, kwargs.get('params'))
+        now = time.time()
+        
+        with self._lock:
+            entry = self.entries.get(key)
+            entry = dict(entry) if entry else None
+        body = self._read_body(key) if entry else None
+        if entry and body is None:
+            entry = None
+        
+        # 1. TTL 안이면 네트워크 없이 응답
+        if entry and not revalidate and now - entry['stored_at'] < ttl:
+            with self._lock:
+                if key in self.entries:
+                    self.entries[key]['last_access'] = now
+                self.stats['hits'] += 1
+                self.stats['bytes_saved'] += len(body)
+            return self._build_response(entry, body)
+        
+        # 2. 만료된 항목은 조건부 요청
+        if entry:
+            headers = dict(kwargs.pop('headers', None) or {})
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            kwargs['headers'] = headers
+        
+        response = send(method, url, **kwargs)
+        
+        with self._lock:
+            self.stats['network'] += 1
+            if entry and response.status_code == 304:
+                if key in self.entries:
+                    self.entries[key]['stored_at'] = now
+                    self.entries[key]['last_access'] = now
+                self.stats['revalidated'] += 1
+                self.stats['bytes_saved'] += len(body)
+                return self._build_response(entry, body)
+            self.stats['misses'] += 1
+        
+        if response.status_code == 200:
+            if validate is None or validate(response):
+                self._store(key, response, now)
+            else:
+                with self._lock:
+                    self.stats['rejected'] += 1
+        return response
+    
+    def _store(self, key, response, now):
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._body_path(key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(body)
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        
+        with self._lock:
+            self.entries[key] = {
+                'url': response.url,
+                'etag': response.headers.get('ETag', ''),
+                'last_modified': response.headers.get('Last-Modified', ''),
+                'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+                'encoding': response.encoding,
+                'size': len(body),
+                'stored_at': now,
+                'last_access': now
+            }
+            self.stats['stored'] += 1
+            self._evict()
+    
+    def _evict(self):
+        """합계 크기가 상한을 넘으면 오래 사용하지 않은 항목부터 삭제 (lock 안에서 호출)"""
+        total = sum(entry['size'] for entry in self.entries.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self.entries, key=lambda k: self.entries[k]['last_access']):
+            total -= self.entries[key]['size']
+            self._remove(key)
+            self.stats['evicted'] += 1
+            if total <= self.max_bytes:
+                break
+    
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry['size'] for entry in self.entries.values())
+    
+    def format_stats(self):
+        stats = self.stats
+        return (f"캐시 적중 {stats['hits']} | 재검증(304) {stats['revalidated']} | 미스 {stats['misses']} | "
+                f"저장 안 함 {stats['rejected']} | 절약 {stats['bytes_saved'] / 1024:.1f}KB")
+
+class HtmlArchive:
+    """원본 응답 HTML 보관소
+    
+    - 본문은 sha256 으로 주소를 붙여 한 번만 저장 (zstd 가 있으면 zstd, 없으면 gzip)
+    - index.jsonl 에 URL/시각/종류(search, detail)/메서드/검색어/페이지/상품코드를 한 줄씩 추가
+    - POST 검색은 검색어/페이지가 본문에 있어 URL 이 모두 같으므로 요청 본문 해시도 함께 기록
+    """
+    def __init__(self, archive_dir="oliveyoung_html_archive"):
+        self.archive_dir = archive_dir
+        self.objects_dir = os.path.join(archive_dir, "objects")
+        self.index_file = os.path.join(archive_dir, "index.jsonl")
+        self.codec = 'zst' if ZSTD_AVAILABLE else 'gz'
+        self._lock = threading.Lock()
+        self._summary = None
+        self._summary_stamp = None
+    
+    def _object_path(self, digest, codec):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.{codec}")
+    
+    def store(self, response, kind, **meta):
+        """응답 본문을 보관하고 인덱스에 기록"""
+        try:
+            body = response.content
+            digest = hashlib.sha256(body).hexdigest()
+            path = self._object_path(digest, self.codec)
+            
+            if not os.path.exists(path):
+                if self.codec == 'zst':
+                    compressed = zstandard.ZstdCompressor(level=10).compress(body)
+                else:
+                    compressed = gzip.compress(body, compresslevel=6)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(compressed)
+                os.replace(temp_path, path)
+            
+            request = getattr(response, 'request', None)
+            method = (getattr(request, 'method', None) or 'GET').upper()
+            request_body = getattr(request, 'body', None) or b''
+            if isinstance(request_body, str):
+                request_body = request_body.encode('utf-8')
+            
+            record = {
+                'url': response.url,
+                'method': method,
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'kind': kind,
+                'sha256': digest,
+                'codec': self.codec,
+                'encoding': response.encoding,
+                'size': len(body)
+            }
+            if request_body:
+                record['request_sha256'] = hashlib.sha256(request_body).hexdigest()
+            record.update(meta)
+            
+            with self._lock:
+                with open(self.index_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return True
+        except Exception as e:
+            return False
+    
+    @staticmethod
+    def request_identity(record):
+        """같은 요청인지 판단하는 키 - URL 이 같아도 메서드/요청 본문/검색어/페이지/상품코드가 다르면 다른 요청
+        
+        요청 본문 해시가 없는 예전 항목도 검색어/페이지로 POST 검색 페이지가 구분됨
+        """
+        return (
+            record.get('kind'), record.get('method', 'GET'), record['url'], record.get('request_sha256'),
+            record.get('keyword'), record.get('page'), record.get('endpoint'), record.get('goods_no')
+        )
+    
+    def entries(self, kind=None, latest_only=True):
+        """인덱스 항목 목록 (latest_only 면 같은 요청(request_identity)별 가장 최근 항목만, 기록 순서 유지)"""
+        records = []
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if kind is None or record.get('kind') == kind:
+                        records.append(record)
+        except OSError:
+            return []
+        
+        if latest_only:
+            latest = {}
+            for idx, record in enumerate(records):
+                latest[self.request_identity(record)] = idx
+            records = [records[idx] for idx in sorted(latest.values())]
+        return records
+    
+    def read(self, record):
+        """보관된 HTML 텍스트 읽기"""
+        path = self._object_path(record['sha256'], record['codec'])
+        with open(path, 'rb') as f:
+            compressed = f.read()
+        if record['codec'] == 'zst':
+            body = zstandard.ZstdDecompressor().decompress(compressed)
+        else:
+            body = gzip.decompress(compressed)
+        return body.decode(record.get('encoding') or 'utf-8', errors='replace')
+    
+    def _index_stamp(self):
+        try:
+            stat = os.stat(self.index_file)
+            return stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return None
+    
+    def summary(self):
+        """보관 현황 (항목 수, 고유 본문 수, 원본/압축 크기, 검색어 목록)
+        
+        인덱스 파일 크기/수정 시각이 그대로면 지난 결과를 재사용 (화면을 다시 그릴 때마다 인덱스를 읽지 않음)
+        """
+        stamp = self._index_stamp()
+        with self._lock:
+            if self._summary is not None and stamp == self._summary_stamp:
+                return self._summary
+        
+        records = self.entries(latest_only=False)
+        unique = {}
+        keywords = {}
+        for record in records:
+            unique[record['sha256']] = record
+            if record.get('kind') == 'search' and record.get('keyword'):
+                keywords[record['keyword']] = None
+        compressed = 0
+        for record in unique.values():
+            try:
+                compressed += os.path.getsize(self._object_path(record['sha256'], record['codec']))
+            except OSError:
+                pass
+        summary = {
+            'entries': len(records),
+            'objects': len(unique),
+            'raw_bytes': sum(record['size'] for record in unique.values()),
+            'compressed_bytes': compressed,
+            'keywords': list(keywords)
+        }
+        with self._lock:
+            self._summary = summary
+            self._summary_stamp = stamp
+        return summary
+
+class OliveYoungScraper:
+    def __init__(self, init_session=True):
         # 모바일과 데스크톱 URL 모두 시도
         self.urls = {
             'mobile_search': "https://m.oliveyoung.co.kr/m/search/searchList.do",
@@ -37,6 +986,24 @@ class OliveYoungScraper:
         }
         self.products = []
         self.session = requests.Session()
+        # 동시 크롤링 워커 수만큼 커넥션을 재사용할 수 있도록 커넥션 풀 확장 (크롤링마다 새로 mount 하지 않음)
+        adapter = HTTPAdapter(pool_connections=MAX_CONCURRENT_WORKERS, pool_maxsize=MAX_CONCURRENT_WORKERS)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.rate_limiter = None  # 동시 크롤링 중에만 설정됨
+        self.selector_cache = SelectorStrategyCache()
+        self.endpoint_health = EndpointHealth()
+        self.parser_backend = DEFAULT_PARSER_BACKEND
+        self.single_pass_extraction = True  # False 면 필드별 셀렉터를 각각 검색 (비교/벤치마크용)
+        self.response_cache = ResponseCache()
+        self.last_cache_stats = None
+        self.html_archive = None  # HtmlArchive 를 설정하면 원본 응답을 보관
+        self.price_tier_stats = PriceTierStats()
+        self.last_price_tier_stats = None
+        self.paging = IncrementalPaging(page_size=SEARCH_PAGE_SIZE)
+        self.last_paging_stats = None
+        self.dedup_index = ProductDedupIndex()  # 검색어가 달라도 같은 상품은 하나로 합침
+        self.price_log = None  # PriceHistoryLog 를 넣으면 가격 히스토리를 상품 dict 대신 로그에 기록
         
         # 실제 브라우저처럼 보이도록 헤더 설정
         self.session.headers.update({
@@ -56,8 +1023,9 @@ class OliveYoungScraper:
             'DNT': '1'
         })
         
-        # 쿠키 사전 설정
-        self._init_session()
+        # 쿠키 사전 설정 (오프라인 재추출/벤치마크에서는 생략)
+        if init_session:
+            self._init_session()
     
     def _init_session(self):
         """세션 초기화 - 메인 페이지 방문으로 쿠키 설정"""
@@ -85,9 +1053,75 @@ class OliveYoungScraper:
         except Exception as e:
             pass
         
-    def scrape_products(self, search_keywords, max_pages=1, progress_callback=None):
-        """올리브영에서 여러 검색어로 상품 정보를 크롤링"""
+    def _request(self, method, url, revalidate=False, **kwargs):
+        """세션 요청 - 응답 캐시를 먼저 확인하고, 동시 크롤링 중이면 속도 제한 적용
+        
+        revalidate=True 면 캐시 TTL 안이어도 서버에 다시 확인함
+        """
+        return self.response_cache.request(
+            self._send, method, url, revalidate=revalidate, validate=is_cacheable_response, **kwargs
+        )
+    
+    def _send(self, method, url, **kwargs):
+        """실제 네트워크 요청"""
+        if self.rate_limiter is None:
+            return self.session.request(method, url, **kwargs)
+        with self.rate_limiter.limit(url):
+            return self.session.request(method, url, **kwargs)
+    
+    def _archive_response(self, response, kind, **meta):
+        """보관소가 설정되어 있으면 원본 응답 저장 (캐시에서 나온 응답은 제외)"""
+        if self.html_archive is None or getattr(response, 'from_cache', False):
+            return
+        self.html_archive.store(response, kind, **meta)
+    
+    def _begin_crawl(self):
+        """크롤링 1회 시작 - 캐시/가격 단계 통계 초기화"""
+        self.response_cache.reset_stats()
+        self.price_tier_stats.reset()
+    
+    def _finish_crawl(self, progress_callback=None, paging=None):
+        """크롤링 1회 종료 - 캐시 저장과 통계 보고"""
+        self.selector_cache.save()
+        self.response_cache.save()
+        if self.dedup_index.duplicates and progress_callback:
+            progress_callback(f"🔗 여러 검색어에서 중복된 상품 {self.dedup_index.duplicates}개를 합쳤습니다")
+        if paging:
+            paging.save_snapshot()
+            self.last_paging_stats = paging.summary()
+            if progress_callback:
+                progress_callback(
+                    f"📄 점진 페이징: {self.last_paging_stats['pages_fetched']}페이지 요청, "
+                    f"{self.last_paging_stats['pages_skipped']}페이지 생략"
+                )
+        self.last_cache_stats = dict(self.response_cache.stats)
+        price_tiers = self.price_tier_stats.summary()
+        if price_tiers:
+            self.last_price_tier_stats = price_tiers
+        if progress_callback:
+            progress_callback(f"💾 {self.response_cache.format_stats()}")
+    
+    def scrape_products(self, search_keywords, max_pages=1, progress_callback=None,
+                        concurrent=False, max_workers=4, requests_per_second=2.0,
+                        incremental=False, use_snapshot=False):
+        """올리브영에서 여러 검색어로 상품 정보를 크롤링
+        
+        incremental=True 면 빈 페이지 / 페이지 크기 미만 / 이미 본 상품만 있는 페이지에서 해당 검색어를 멈춤
+        (use_snapshot=True 면 이전 크롤링과 같은 페이지에서도 멈춤)
+        """
         self.products = []
+        self.dedup_index.reset()
+        self._begin_crawl()
+        paging = None
+        if incremental:
+            paging = self.paging
+            paging.use_snapshot = use_snapshot
+            paging.reset()
+        
+        if concurrent:
+            return self._scrape_products_concurrent(
+                search_keywords, max_pages, progress_callback, max_workers, requests_per_second, paging
+            )
         
         try:
             total_keywords = len(search_keywords)
@@ -100,103 +1134,249 @@ class OliveYoungScraper:
                     if progress_callback:
                         progress_callback(f"'{keyword}' {page_num}페이지 검색 중...")
                     
-                    # 다양한 URL 패턴 시도
-                    success = False
-                    
-                    # 1. 모바일 URL 시도
-                    mobile_params = {
-                        'query': keyword,
-                        'page': page_num,
-                        'listType': 'list'
-                    }
-                    
-                    success = self._try_search_url(
-                        self.urls['mobile_search'],
-                        mobile_params,
-                        keyword,
-                        page_num,
-                        progress_callback,
-                        "모바일"
-                    )
-                    
-                    # 2. 데스크톱 URL 시도 (모바일 실패시)
-                    if not success:
-                        desktop_params = {
-                            'query': keyword,
-                            'page': page_num,
-                            'giftYn': 'N',
-                            't_page': '통합',
-                            't_click': '검색창',
-                            't_search_name': '검색'
-                        }
-                        
-                        success = self._try_search_url(
-                            self.urls['desktop_search'],
-                            desktop_params,
-                            keyword,
-                            page_num,
-                            progress_callback,
-                            "데스크톱"
-                        )
+                    network_before = self.response_cache.stats['network']
+                    page_products = []
+                    page_status = self._scrape_page(keyword, page_num, progress_callback, page_products)
                     
-                    # 3. POST 방식 시도 (GET 실패시)
-                    if not success:
-                        success = self._try_post_search(
-                            keyword,
-                            page_num,
-                            progress_callback
+                    stop_reason = None
+                    if paging:
+                        page_products, stop_reason = paging.evaluate(
+                            keyword, page_num, page_products, failed=page_status == PAGE_FAILED
                         )
+                    self.dedup_index.merge(page_products, self.products)
                     
                     if progress_callback:
                         progress = (keyword_idx * max_pages + page_num) / (total_keywords * max_pages)
-                        status = "성공" if success else "실패"
+                        status = PAGE_STATUS_LABELS[page_status]
                         progress_callback(f"'{keyword}' {page_num}페이지 {status} - 총 {len(self.products)}개 상품", progress)
                     
-                    # 요청 간격 조절
-                    time.sleep(2)
+                    # 요청 간격 조절 (캐시로만 응답한 경우 생략)
+                    if self.response_cache.stats['network'] > network_before:
+                        time.sleep(2)
+                    
+                    if stop_reason:
+                        paging.skip(max_pages - page_num)
+                        if progress_callback and page_num < max_pages:
+                            progress_callback(f"'{keyword}' {page_num}페이지에서 중단 ({STOP_REASONS[stop_reason]})")
+                        break
                         
         except Exception as e:
             if progress_callback:
                 progress_callback(f"크롤링 중 전체 오류: {str(e)}", 1.0)
+        
+        self._finish_crawl(progress_callback, paging)
+        return self.products
+    
+    def _scrape_products_concurrent(self, search_keywords, max_pages, progress_callback,
+                                    max_workers, requests_per_second, paging=None):
+        """검색어 × 페이지를 워커 풀로 동시에 크롤링 (결과는 검색어/페이지 순서 유지)
+        
+        paging 이 있으면 검색어별로 앞 페이지 결과를 보고 다음 페이지를 요청 (검색어끼리는 동시 진행)
+        """
+        tasks = [(keyword, page_num) for keyword in search_keywords for page_num in range(1, max_pages + 1)]
+        if not tasks:
+            return self.products
+        
+        max_workers = max(1, min(int(max_workers), len(tasks), MAX_CONCURRENT_WORKERS))
+        page_results = {}
+        total_found = 0
+        
+        self.rate_limiter = RateLimiter(requests_per_second, max_in_flight=max_workers)
+        
+        if progress_callback:
+            progress_callback(f"동시 크롤링 시작: {len(tasks)}페이지 | 워커 {max_workers}개 | 초당 {requests_per_second}회")
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {}
+                
+                def submit(keyword, page_num):
+                    futures[executor.submit(self._scrape_page_to_list, keyword, page_num)] = (keyword, page_num)
                 
+                if paging:
+                    for keyword in search_keywords:
+                        submit(keyword, 1)
+                else:
+                    for keyword, page_num in tasks:
+                        submit(keyword, page_num)
+                
+                # 진행 상황은 호출 스레드에서만 보고 (Streamlit 위젯은 워커 스레드에서 갱신 불가)
+                done_count = 0
+                total_pages = len(tasks)
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        keyword, page_num = futures.pop(future)
+                        try:
+                            page_status, page_products = future.result()
+                        except Exception as e:
+                            page_status, page_products = PAGE_FAILED, []
+                        
+                        if paging:
+                            page_products, stop_reason = paging.evaluate(
+                                keyword, page_num, page_products, failed=page_status == PAGE_FAILED
+                            )
+                            if stop_reason:
+                                paging.skip(max_pages - page_num)
+                                total_pages -= max_pages - page_num
+                                if progress_callback and page_num < max_pages:
+                                    progress_callback(f"'{keyword}' {page_num}페이지에서 중단 ({STOP_REASONS[stop_reason]})")
+                            elif page_num < max_pages:
+                                submit(keyword, page_num + 1)
+                        
+                        page_results[(keyword, page_num)] = page_products
+                        total_found += len(page_products)
+                        done_count += 1
+                        
+                        if progress_callback:
+                            status = PAGE_STATUS_LABELS[page_status]
+                            progress_callback(f"'{keyword}' {page_num}페이지 {status} - 총 {total_found}개 상품", done_count / max(total_pages, done_count))
+                        
+        except Exception as e:
+            if progress_callback:
+                progress_callback(f"크롤링 중 전체 오류: {str(e)}", 1.0)
+        finally:
+            self.rate_limiter = None
+        
+        # 검색어/페이지 순서대로 병합해야 대표 상품이 실행마다 같음
+        for task in tasks:
+            self.dedup_index.merge(page_results.get(task, []), self.products)
+        
+        self._finish_crawl(progress_callback, paging)
         return self.products
     
-    def _try_search_url(self, url, params, keyword, page_num, progress_callback, method_name):
+    def _scrape_page_to_list(self, keyword, page_num):
+        """워커 스레드용 - 한 페이지 결과를 별도 리스트로 반환"""
+        page_products = []
+        status = self._scrape_page(keyword, page_num, None, page_products)
+        return status, page_products
+    
+    def _scrape_page(self, keyword, page_num, progress_callback=None, product_list=None):
+        """한 페이지를 엔드포인트 상태에 따라 모바일 → 데스크톱 → POST 순서로 시도
+        
+        마지막으로 성공한 엔드포인트를 먼저 시도하고, 연속 실패로 차단된 엔드포인트는 건너뜀
+        반환값: PAGE_FOUND / PAGE_EMPTY (한 곳이라도 정상 응답, 상품 없음) / PAGE_FAILED (모두 실패)
+        """
+        result = PAGE_FAILED
+        for endpoint in self.endpoint_health.plan():
+            if not self.endpoint_health.begin(endpoint):
+                continue
+            
+            started = time.time()
+            status = self._try_endpoint(endpoint, keyword, page_num, progress_callback, product_list)
+            self.endpoint_health.record(endpoint, status, time.time() - started)
+            if status == PAGE_FOUND:
+                return PAGE_FOUND
+            if status == PAGE_EMPTY:
+                # 다른 엔드포인트는 마크업이 달라 추출될 수 있으므로 계속 시도
+                result = PAGE_EMPTY
+            
+        return result
+    
+    def _try_endpoint(self, endpoint, keyword, page_num, progress_callback=None, product_list=None):
+        """엔드포인트 이름에 맞는 검색 방식 실행"""
+        if endpoint == 'mobile':
+            # 1. 모바일 URL
+            mobile_params = {
+                'query': keyword,
+                'page': page_num,
+                'listType': 'list'
+            }
+            
+            return self._try_search_url(
+                self.urls['mobile_search'],
+                mobile_params,
+                keyword,
+                page_num,
+                progress_callback,
+                "모바일",
+                product_list,
+                'mobile'
+            )
+        
+        if endpoint == 'desktop':
+            # 2. 데스크톱 URL
+            desktop_params = {
+                'query': keyword,
+                'page': page_num,
+                'giftYn': 'N',
+                't_page': '통합',
+                't_click': '검색창',
+                't_search_name': '검색'
+            }
+            
+            return self._try_search_url(
+                self.urls['desktop_search'],
+                desktop_params,
+                keyword,
+                page_num,
+                progress_callback,
+                "데스크톱",
+                product_list,
+                'desktop'
+            )
+        
+        # 3. POST 방식
+        return self._try_post_search(
+            keyword,
+            page_num,
+            progress_callback,
+            product_list
+        )
+    
+    def _parse_html(self, html, scoped=False):
+        """설정된 파서 백엔드로 HTML 파싱 (scoped=True 면 상품 목록 후보만 파싱)"""
+        return parse_html(html, self.parser_backend, scoped)
+    
+    def _parse_and_extract(self, html, keyword, product_list=None, endpoint=None):
+        """검색 결과 HTML 을 파싱해 상품 추출 - scoped 모드에서 실패하면 전체 트리로 재시도"""
+        scoped = self.parser_backend == 'scoped'
+        soup = self._parse_html(html, scoped)
+        extracted_count = self._extract_products(soup, keyword, product_list, endpoint)
+        
+        if extracted_count == 0 and scoped:
+            soup = self._parse_html(html)
+            extracted_count = self._extract_products(soup, keyword, product_list, endpoint)
+        
+        return extracted_count
+    
+    def _try_search_url(self, url, params, keyword, page_num, progress_callback, method_name, product_list=None, endpoint=None):
         """특정 URL로 검색 시도"""
         try:
             if progress_callback:
                 progress_callback(f"{method_name} 방식으로 '{keyword}' 검색 중...")
             
-            response = self.session.get(url, params=params, timeout=15)
+            response = self._request('GET', url, params=params, timeout=15)
             
             if progress_callback:
                 progress_callback(f"{method_name} 응답: {response.status_code}")
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                self._archive_response(response, 'search', keyword=keyword, page=page_num, endpoint=endpoint)
                 
                 # 응답 내용 디버깅
                 if progress_callback:
                     progress_callback(f"HTML 길이: {len(response.text)} bytes")
                 
-                extracted_count = self._extract_products(soup, keyword)
+                extracted_count = self._parse_and_extract(response.text, keyword, product_list, endpoint)
                 
                 if extracted_count > 0:
                     if progress_callback:
                         progress_callback(f"{method_name} 성공: {extracted_count}개 상품 추출")
-                    return True
+                    return PAGE_FOUND
                 else:
                     if progress_callback:
-                        progress_callback(f"{method_name} 실패: 상품 추출 불가")
+                        progress_callback(f"{method_name}: 상품 없음")
+                    return PAGE_EMPTY
                     
-            return False
+            return PAGE_FAILED
             
         except Exception as e:
             if progress_callback:
                 progress_callback(f"{method_name} 오류: {str(e)}")
-            return False
+            return PAGE_FAILED
     
-    def _try_post_search(self, keyword, page_num, progress_callback):
+    def _try_post_search(self, keyword, page_num, progress_callback, product_list=None):
         """POST 방식으로 검색 시도"""
         try:
             if progress_callback:
@@ -210,30 +1390,41 @@ class OliveYoungScraper:
             }
             
             # POST 요청
-            response = self.session.post(
+            response = self._request(
+                'POST',
                 self.urls['desktop_search'],
                 data=post_data,
                 timeout=15
             )
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                extracted_count = self._extract_products(soup, keyword)
+                self._archive_response(response, 'search', keyword=keyword, page=page_num, endpoint='post')
+                extracted_count = self._parse_and_extract(response.text, keyword, product_list, 'post')
                 
                 if extracted_count > 0:
                     if progress_callback:
                         progress_callback(f"POST 성공: {extracted_count}개 상품 추출")
-                    return True
+                    return PAGE_FOUND
+                return PAGE_EMPTY
             
-            return False
+            return PAGE_FAILED
             
         except Exception as e:
             if progress_callback:
                 progress_callback(f"POST 오류: {str(e)}")
-            return False
+            return PAGE_FAILED
     
-    def scrape_selected_products(self, selected_products, progress_callback=None):
-        """선택된 상품들을 새로고침"""
+    def scrape_selected_products(self, selected_products, progress_callback=None,
+                                 concurrent=False, max_workers=4, requests_per_second=2.0):
+        """선택된 상품들을 새로고침 (같은 상품코드는 한 번만 요청)"""
+        self._begin_crawl()
+        selected_products = unique_by_goods_no(selected_products)
+        
+        if concurrent:
+            return self._scrape_selected_products_concurrent(
+                selected_products, progress_callback, max_workers, requests_per_second
+            )
+        
         updated_products = []
         
         try:
@@ -247,46 +1438,169 @@ class OliveYoungScraper:
                     progress = (idx + 1) / total_products
                     progress_callback(f"[{idx + 1}/{total_products}] {brand} - {name}", progress)
                 
-                product_code = selected_product.get('상품코드', '')
-                if not product_code:
-                    selected_product['상태'] = '상품코드 없음'
-                    selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    updated_products.append(selected_product)
-                    continue
+                network_before = self.response_cache.stats['network']
+                updated_products.append(self._refresh_single_product(selected_product))
                 
-                try:
-                    product_url = f"https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo={product_code}"
-                    response = self.session.get(product_url, timeout=10)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    updated_product = self._extract_product_from_detail_page(soup, selected_product)
-                    
-                    if updated_product:
-                        updated_product = self._update_price_history(selected_product, updated_product)
-                        updated_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        updated_product['상태'] = '업데이트됨'
-                        updated_products.append(updated_product)
-                    else:
-                        selected_product['상태'] = '상품 없음'
-                        selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        updated_products.append(selected_product)
-                        
-                    # 요청 간격 조절
+                # 요청 간격 조절 (캐시로만 응답한 경우 생략)
+                if (updated_products[-1].get('상태') in ('업데이트됨', '상품 없음') and
+                        self.response_cache.stats['network'] > network_before):
                     time.sleep(0.5)
                         
-                except Exception as e:
-                    selected_product['상태'] = f'오류: {str(e)[:20]}'
-                    selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    updated_products.append(selected_product)
-                    continue
-                        
         except Exception as e:
             if progress_callback:
                 progress_callback(f"업데이트 중 오류 발생: {str(e)}", 1.0)
         
+        self._finish_crawl(progress_callback)
         return updated_products
     
+    def _scrape_selected_products_concurrent(self, selected_products, progress_callback,
+                                             max_workers, requests_per_second):
+        """선택된 상품들을 워커 풀로 동시에 새로고침 (결과는 입력 순서 유지)"""
+        total_products = len(selected_products)
+        if total_products == 0:
+            return []
+        
+        max_workers = max(1, min(int(max_workers), total_products, MAX_CONCURRENT_WORKERS))
+        results = [None] * total_products
+        
+        self.rate_limiter = RateLimiter(requests_per_second, max_in_flight=max_workers)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._refresh_single_product, selected_product): idx
+                    for idx, selected_product in enumerate(selected_products)
+                }
+                
+                for done_count, future in enumerate(as_completed(futures), 1):
+                    idx = futures[future]
+                    selected_product = selected_products[idx]
+                    try:
+                        results[idx] = future.result()
+                    except Exception as e:
+                        selected_product['상태'] = f'오류: {str(e)[:20]}'
+                        selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        results[idx] = selected_product
+                    
+                    if progress_callback:
+                        brand = selected_product.get('브랜드', '')
+                        name = selected_product.get('상품명', '')[:20] + "..." if len(selected_product.get('상품명', '')) > 20 else selected_product.get('상품명', '')
+                        status = results[idx].get('상태', '')
+                        progress_callback(f"[{done_count}/{total_products}] {brand} - {name}: {status}", done_count / total_products)
+                        
+        except Exception as e:
+            if progress_callback:
+                progress_callback(f"업데이트 중 오류 발생: {str(e)}", 1.0)
+        finally:
+            self.rate_limiter = None
+        
+        self._finish_crawl(progress_callback)
+        return [result for result in results if result is not None]
+    
+    def reextract_archive(self, archive=None, kinds=('search', 'detail'), max_workers=4,
+                          latest_only=True, progress_callback=None, keyword=None):
+        """보관된 원본 HTML 로 네트워크 없이 상품 정보를 다시 추출
+        
+        keyword 를 주면 그 검색어의 검색 결과 보관본만 재추출
+        항목이 여러 개면 max_workers 개 프로세스로 나눠 처리 (oliveyoung_reextract 워커, 파싱이 CPU 작업이라 스레드는 쓰지 않음)
+        반환값: {'search': [검색 결과 상품...], 'detail': [상세 페이지 상품...]} (보관 순서 유지)
+        """
+        archive = archive or self.html_archive or HtmlArchive()
+        records = [
+            record for record in archive.entries(latest_only=latest_only)
+            if record.get('kind') in kinds and (keyword is None or record.get('keyword') == keyword)
+        ]
+        results = [None] * len(records)
+        max_workers = max(1, min(int(max_workers), len(records), os.cpu_count() or 1))
+        
+        if max_workers == 1:
+            for done_count, record in enumerate(records, 1):
+                try:
+                    results[done_count - 1] = self._reextract_record(archive, record)
+                except Exception as e:
+                    results[done_count - 1] = []
+                if progress_callback:
+                    progress_callback(f"재추출 {done_count}/{len(records)}", done_count / len(records))
+        elif records:
+            import oliveyoung_reextract
+            
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=oliveyoung_reextract.init_worker,
+                initargs=(archive.archive_dir, self.parser_backend, self.single_pass_extraction)
+            ) as executor:
+                futures = {
+                    executor.submit(oliveyoung_reextract.reextract_record, record): idx
+                    for idx, record in enumerate(records)
+                }
+                for done_count, future in enumerate(as_completed(futures), 1):
+                    idx = futures[future]
+                    try:
+                        results[idx] = as_products(future.result())
+                    except Exception as e:
+                        # 워커 프로세스를 띄우지 못한 경우 등 - 이 프로세스에서 다시 시도
+                        try:
+                            results[idx] = self._reextract_record(archive, records[idx])
+                        except Exception as e:
+                            results[idx] = []
+                    
+                    if progress_callback:
+                        progress_callback(f"재추출 {done_count}/{len(records)}", done_count / len(records))
+        
+        extracted = {kind: [] for kind in kinds}
+        dedup_index = ProductDedupIndex()
+        for record, products in zip(records, results):
+            if record['kind'] == 'search':
+                dedup_index.merge(products or [], extracted['search'])
+            else:
+                extracted[record['kind']].extend(products or [])
+        return extracted
+    
+    def _reextract_record(self, archive, record):
+        """보관 항목 하나를 다시 파싱/추출 - 상품 목록"""
+        html = archive.read(record)
+        if record['kind'] == 'detail':
+            soup = self._parse_html(html)
+            product = self._extract_product_from_detail_page(soup, {'상품코드': record.get('goods_no', '')})
+            return [product] if product else []
+        
+        page_products = []
+        self._parse_and_extract(html, record.get('keyword', ''), page_products)
+        return page_products
+    
+    def _refresh_single_product(self, selected_product):
+        """상품코드로 상세 페이지에 접근하여 한 상품 새로고침"""
+        product_code = selected_product.get('상품코드', '')
+        if not product_code:
+            selected_product['상태'] = '상품코드 없음'
+            selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            return selected_product
+        
+        try:
+            product_url = f"https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo={product_code}"
+            # 명시적 새로고침이므로 캐시 TTL 안이어도 서버에 다시 확인
+            response = self._request('GET', product_url, revalidate=True, timeout=10)
+            response.raise_for_status()
+            self._archive_response(response, 'detail', goods_no=product_code)
+            
+            soup = self._parse_html(response.text)
+            updated_product = self._extract_product_from_detail_page(soup, selected_product)
+            
+            if updated_product:
+                updated_product = self._update_price_history(selected_product, updated_product)
+                updated_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                updated_product['상태'] = '업데이트됨'
+                return updated_product
+            
+            selected_product['상태'] = '상품 없음'
+            selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            return selected_product
+                
+        except Exception as e:
+            selected_product['상태'] = f'오류: {str(e)[:20]}'
+            selected_product['업데이트시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            return selected_product
+    
     def _extract_product_from_detail_page(self, soup, original_product):
         """상품 상세 페이지에서 정보 추출"""
         try:
@@ -311,6 +1625,7 @@ class OliveYoungScraper:
             # 가격 정보 추출
             original_price = ""
             discount_price = ""
+            selectors_started = time.perf_counter()
             
             # 할인가
             discount_price_elem = soup.select_one(".price .price-2 strong")
@@ -359,6 +1674,20 @@ class OliveYoungScraper:
                                 discount_price = f"{int(price_num):,}"
                                 break
             
+            self.price_tier_stats.record('selectors', bool(discount_price), time.perf_counter() - selectors_started)
+            
+            # 구조화 데이터(JSON-LD / 메타 태그 / 인라인 JS 상태) → 본문 앞부분 제한 스캔 (이전 가격 확인용)
+            if not discount_price:
+                tier, structured_original, structured_discount = find_structured_prices(
+                    stats=self.price_tier_stats,
+                    known_prices=(original_product.get('할인가'), original_product.get('원가')),
+                    **self._structured_price_sources(soup)
+                )
+                if structured_discount:
+                    discount_price = f"{structured_discount:,}"
+                    if structured_original and not original_price:
+                        original_price = f"{structured_original:,}"
+            
             # 기존 가격 정보 보존
             if not discount_price:
                 discount_price = original_product.get('할인가', '')
@@ -410,8 +1739,48 @@ class OliveYoungScraper:
         except Exception as e:
             return original_product
     
+    def _structured_price_sources(self, soup):
+        """상세 페이지에서 구조화 데이터 단계에 넘길 원본 (JSON-LD, 메타 태그, 인라인 스크립트, 본문 텍스트)"""
+        json_ld_texts = []
+        scripts = []
+        for script in soup.find_all('script'):
+            if script.get('type') == 'application/ld+json':
+                json_ld_texts.append(script.string or script.get_text())
+            elif not script.get('src'):
+                scripts.append(script.string or '')
+        
+        meta = {}
+        for tag in soup.find_all('meta'):
+            key = tag.get('property') or tag.get('name') or tag.get('itemprop')
+            if key and tag.get('content') and key not in meta:
+                meta[key] = tag.get('content')
+        
+        # 스캔용 본문 텍스트는 앞부분만 모음
+        scan_parts = []
+        scan_length = 0
+        for text in (soup.body or soup).stripped_strings:
+            scan_parts.append(text)
+            scan_length += len(text) + 1
+            if scan_length >= SCAN_MAX_CHARS:
+                break
+        
+        return {
+            'json_ld_texts': json_ld_texts,
+            'meta': meta,
+            'scripts': scripts,
+            'scan_text': ' '.join(scan_parts)
+        }
+    
     def _update_price_history(self, old_product, new_product):
         """가격 히스토리 업데이트"""
+        goods_no = new_product.get('상품코드', '')
+        if self.price_log is not None and encode_goods_no(goods_no) is not None:
+            # 예전 dict 히스토리는 로그로 옮기고, 현재 가격은 로그에만 추가
+            self.price_log.import_entries(goods_no, old_product.get('가격히스토리'))
+            self.price_log.append(goods_no, new_product.get('원가', ''), new_product.get('할인가', ''))
+            new_product.pop('가격히스토리', None)
+            return new_product
+        
         price_history = old_product.get('가격히스토리', [])
         
         current_date = datetime.now().strftime('%Y-%m-%d')
@@ -439,8 +1808,10 @@ class OliveYoungScraper:
         new_product['가격히스토리'] = price_history
         return new_product
     
-    def _extract_products(self, soup, keyword):
-        """상품 정보 추출 - 데스크톱/모바일 모두 대응"""
+    def _extract_products(self, soup, keyword, product_list=None, endpoint=None):
+        """상품 정보 추출 - 데스크톱/모바일 모두 대응 (endpoint 가 있으면 셀렉터 전략 캐시 사용)"""
+        if product_list is None:
+            product_list = self.products
         extracted_count = 0
         
         # 다양한 상품 리스트 셀렉터 시도 (데스크톱 + 모바일)
@@ -471,13 +1842,16 @@ class OliveYoungScraper:
         product_elements = []
         used_selector = None
         
-        # 각 셀렉터를 순서대로 시도
-        for selector in product_selectors:
-            elements = soup.select(selector)
-            if elements and len(elements) > 0:
-                product_elements = elements
-                used_selector = selector
-                break
+        # 각 셀렉터를 순서대로 시도 (캐시된 셀렉터 우선)
+        if endpoint:
+            product_elements = self.selector_cache.find(endpoint, 'list', product_selectors, soup.select) or []
+        else:
+            for selector in product_selectors:
+                elements = soup.select(selector)
+                if elements and len(elements) > 0:
+                    product_elements = elements
+                    used_selector = selector
+                    break
         
         # 셀렉터로 찾지 못한 경우, 패턴 매칭으로 찾기
         if not product_elements:
@@ -502,14 +1876,14 @@ class OliveYoungScraper:
         # 상품 정보 추출
         for element in product_elements:
             try:
-                product_info = self._extract_single_product(element, keyword)
+                product_info = self._extract_single_product(element, keyword, endpoint)
                 
                 # 최소한의 정보가 있을 때만 추가
                 if (product_info and 
                     (product_info.get('상품명') or product_info.get('브랜드')) and
                     (product_info.get('할인가') or product_info.get('원가'))):
                     
-                    self.products.append(product_info)
+                    product_list.append(product_info)
                     extracted_count += 1
                 
             except Exception as e:
@@ -517,39 +1891,32 @@ class OliveYoungScraper:
         
         return extracted_count
     
-    def _extract_single_product(self, element, keyword):
+    def _extract_single_product(self, element, keyword, endpoint=None):
         """단일 상품 정보 추출"""
         try:
             product_info = {}
             
+            # 하위 트리를 한 번만 순회해 모든 필드 셀렉터의 일치 요소를 분류
+            index = ProductFieldIndex(element) if self.single_pass_extraction else None
+            
             # 브랜드 추출 - 다양한 셀렉터 시도
-            brand = self._extract_text_by_selectors(element, [
-                ".tx_brand", ".brand", ".prd_brand", ".brand_name",
-                "[class*='brand']", ".maker", ".company",
-                # 모바일 버전
-                ".item_brand", ".goods_brand", ".prod_brand"
-            ])
+            brand = self._extract_text_by_selectors(element, BRAND_SELECTORS, endpoint, 'brand', index)
             product_info['브랜드'] = brand
             
             # 상품명 추출
-            name = self._extract_text_by_selectors(element, [
-                ".tx_name", ".name", ".prd_name", ".title", ".product_name",
-                "[class*='name']", "[class*='title']", "h3", "h4",
-                # 모바일 버전
-                ".item_name", ".goods_name", ".prod_name", ".item_title"
-            ])
+            name = self._extract_text_by_selectors(element, NAME_SELECTORS, endpoint, 'name', index)
             product_info['상품명'] = name
             
             # 가격 정보 추출
-            price_info = self._extract_price_info(element)
+            price_info = self._extract_price_info(element, endpoint, index)
             product_info.update(price_info)
             
             # 혜택 정보 추출
-            benefits = self._extract_benefits(element)
+            benefits = self._extract_benefits(element, index)
             product_info['혜택'] = benefits
             
             # 이미지 URL 추출
-            image_url = self._extract_image_url(element)
+            image_url = self._extract_image_url(element, endpoint, index)
             product_info['이미지URL'] = image_url
             
             # 상품 링크와 코드 추출
@@ -562,81 +1929,94 @@ class OliveYoungScraper:
             product_info['목표가격'] = ""
             product_info['크롤링시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            # 가격 히스토리 초기화
-            current_date = datetime.now().strftime('%Y-%m-%d')
-            product_info['가격히스토리'] = [{
-                '날짜': current_date,
-                '원가': product_info.get('원가', ''),
-                '할인가': product_info.get('할인가', ''),
-                '시간': datetime.now().strftime('%H:%M:%S')
-            }]
+            # 가격 히스토리 초기화 - 가격 로그가 있으면 첫 관측은 관심상품에 추가할 때 로그에 기록
+            if self.price_log is None or encode_goods_no(product_info.get('상품코드')) is None:
+                current_date = datetime.now().strftime('%Y-%m-%d')
+                product_info['가격히스토리'] = [{
+                    '날짜': current_date,
+                    '원가': product_info.get('원가', ''),
+                    '할인가': product_info.get('할인가', ''),
+                    '시간': datetime.now().strftime('%H:%M:%S')
+                }]
             
-            return product_info
+            # 가격은 여기서 한 번만 정수로 변환
+            return Product(product_info)
             
         except Exception as e:
             return None
     
-    def _extract_text_by_selectors(self, element, selectors):
+    def _extract_text_by_selectors(self, element, selectors, endpoint=None, field=None, index=None):
         """여러 셀렉터로 텍스트 추출 시도"""
-        for selector in selectors:
+        select_one = index.select_one if index else element.select_one
+        
+        def find_text(selector):
             try:
-                elem = element.select_one(selector)
+                elem = select_one(selector)
                 if elem:
-                    text = elem.get_text(strip=True)
-                    if text and len(text) > 0:
-                        return text
+                    return elem.get_text(strip=True)
             except:
-                continue
+                pass
+            return ""
+        
+        if endpoint and field:
+            return self.selector_cache.find(endpoint, field, selectors, find_text) or ""
+        
+        for selector in selectors:
+            text = find_text(selector)
+            if text and len(text) > 0:
+                return text
         return ""
     
-    def _extract_price_info(self, element):
+    def _extract_price_info(self, element, endpoint=None, index=None):
         """가격 정보 추출"""
         price_info = {'원가': '', '할인가': ''}
         
         try:
             # 가격 섹션 찾기
             price_section = None
-            price_selectors = [
-                ".prd_price", ".price", "[class*='price']", ".cost", ".amount",
-                ".item_price", ".goods_price", ".prod_price"  # 모바일
-            ]
+            price_selectors = PRICE_SECTION_SELECTORS
+            select_one = index.select_one if index else element.select_one
             
-            for selector in price_selectors:
-                price_section = element.select_one(selector)
-                if price_section:
-                    break
+            if endpoint:
+                price_section = self.selector_cache.find(endpoint, 'price_section', price_selectors, select_one)
+            else:
+                for selector in price_selectors:
+                    price_section = select_one(selector)
+                    if price_section:
+                        break
             
             if not price_section:
                 price_section = element  # 전체 요소에서 찾기
             
+            def find_price(selector):
+                if index:
+                    elem = index.select_one(selector, price_section)
+                else:
+                    elem = price_section.select_one(selector)
+                if elem:
+                    return self._clean_price(elem.get_text(strip=True))
+                return ""
+            
             # 원가 추출 (할인 전 가격)
-            original_selectors = [
-                ".tx_org .tx_num", ".original", ".before", "strike", "del",
-                "[class*='original']", "[class*='before']", ".old_price",
-                ".regular_price", ".list_price"
-            ]
+            original_selectors = ORIGINAL_PRICE_SELECTORS
             
-            for selector in original_selectors:
-                elem = price_section.select_one(selector)
-                if elem:
-                    price_text = elem.get_text(strip=True)
-                    clean_price = self._clean_price(price_text)
+            if endpoint:
+                price_info['원가'] = self.selector_cache.find(endpoint, 'original_price', original_selectors, find_price) or ''
+            else:
+                for selector in original_selectors:
+                    clean_price = find_price(selector)
                     if clean_price:
                         price_info['원가'] = clean_price
                         break
             
             # 할인가 추출 (현재 가격)
-            discount_selectors = [
-                ".tx_cur .tx_num", ".current", ".sale", ".final", ".now",
-                "[class*='current']", "[class*='sale']", "[class*='final']",
-                ".sale_price", ".discount_price", ".special_price"
-            ]
+            discount_selectors = DISCOUNT_PRICE_SELECTORS
             
-            for selector in discount_selectors:
-                elem = price_section.select_one(selector)
-                if elem:
-                    price_text = elem.get_text(strip=True)
-                    clean_price = self._clean_price(price_text)
+            if endpoint:
+                price_info['할인가'] = self.selector_cache.find(endpoint, 'discount_price', discount_selectors, find_price) or ''
+            else:
+                for selector in discount_selectors:
+                    clean_price = find_price(selector)
                     if clean_price:
                         price_info['할인가'] = clean_price
                         break
@@ -673,7 +2053,7 @@ class OliveYoungScraper:
             return ""
         
         # 숫자와 쉼표만 추출
-        numbers = re.findall(r'[\d,]+', price_text)
+        numbers = PRICE_NUMBER_PATTERN.findall(price_text)
         if numbers:
             price_str = numbers[0].replace(',', '')
             if price_str.isdigit() and int(price_str) > 100:  # 100원 이상인 경우만
@@ -681,19 +2061,13 @@ class OliveYoungScraper:
         
         return ""
     
-    def _extract_benefits(self, element):
+    def _extract_benefits(self, element, index=None):
         """혜택 정보 추출"""
         benefits = []
+        select = index.select if index else element.select
         
-        benefit_selectors = [
-            ".prd_flag .icon_flag", ".benefit", ".tag", "[class*='flag']", 
-            "[class*='benefit']", ".event", ".promotion", ".special",
-            # 모바일
-            ".item_flag", ".goods_flag", ".prod_flag"
-        ]
-        
-        for selector in benefit_selectors:
-            benefit_elems = element.select(selector)
+        for selector in BENEFIT_SELECTORS:
+            benefit_elems = select(selector)
             for benefit_elem in benefit_elems:
                 benefit_text = benefit_elem.get_text(strip=True)
                 if benefit_text and benefit_text not in benefits:
@@ -701,15 +2075,13 @@ class OliveYoungScraper:
         
         return ", ".join(benefits)
     
-    def _extract_image_url(self, element):
+    def _extract_image_url(self, element, endpoint=None, index=None):
         """이미지 URL 추출"""
-        img_selectors = [
-            "img", ".prd_thumb img", ".thumb img", "[class*='img'] img",
-            ".item_img img", ".goods_img img", ".prod_img img"  # 모바일
-        ]
+        img_selectors = IMAGE_SELECTORS
+        select_one = index.select_one if index else element.select_one
         
-        for selector in img_selectors:
-            img_elem = element.select_one(selector)
+        def find_image(selector):
+            img_elem = select_one(selector)
             if img_elem:
                 image_url = img_elem.get('src', '') or img_elem.get('data-src', '')
                 if image_url:
@@ -719,6 +2091,15 @@ class OliveYoungScraper:
                     elif image_url.startswith('/'):
                         image_url = 'https://www.oliveyoung.co.kr' + image_url
                     return image_url
+            return ""
+        
+        if endpoint:
+            return self.selector_cache.find(endpoint, 'image', img_selectors, find_image) or ""
+        
+        for selector in img_selectors:
+            image_url = find_image(selector)
+            if image_url:
+                return image_url
         
         return ""
     
@@ -736,16 +2117,8 @@ class OliveYoungScraper:
                 href = link_elem.get('href', '')
                 if href:
                     # 상품 코드 추출
-                    goods_patterns = [
-                        r'goodsNo=([A-Z0-9]+)',
-                        r'goods_no=([A-Z0-9]+)',
-                        r'prdNo=([A-Z0-9]+)',
-                        r'/goods/([A-Z0-9]+)',
-                        r'/product/([A-Z0-9]+)'
-                    ]
-                    
-                    for pattern in goods_patterns:
-                        match = re.search(pattern, href, re.I)
+                    for pattern in GOODS_CODE_PATTERNS:
+                        match = pattern.search(href)
                         if match:
                             link_info['상품코드'] = match.group(1)
                             break
@@ -776,22 +2149,41 @@ def init_session_state():
     if 'products_data' not in st.session_state:
         st.session_state.products_data = []
     if 'favorites_data' not in st.session_state:
-        st.session_state.favorites_data = []
+        st.session_state.favorites_data = FavoritesStore()
+    if 'price_log' not in st.session_state:
+        # 가격 히스토리 로그는 프로세스 안의 모든 세션이 같이 씀
+        st.session_state.price_log = PriceHistoryLog.shared("oliveyoung_streamlit_price_log")
     if 'scraper' not in st.session_state:
         st.session_state.scraper = OliveYoungScraper()
+        st.session_state.scraper.price_log = st.session_state.price_log
     if 'data_file' not in st.session_state:
+        # 이전 버전 데이터 (DB 가 없을 때 한 번 옮겨 옴)
         st.session_state.data_file = "oliveyoung_streamlit_data.json"
+    if 'data_store' not in st.session_state:
+        st.session_state.data_store = SqliteDataStore(
+            "oliveyoung_streamlit_data.db", legacy_json=st.session_state.data_file
+        )
+        if st.session_state.data_store.migration_error:
+            st.warning(f"기존 JSON 데이터 이전 실패: {st.session_state.data_store.migration_error}")
+    if 'data_load_count' not in st.session_state:
+        st.session_state.data_load_count = 0
+        st.session_state.data_load_ms = 0.0
+    
+    # 관심상품 엑셀 bytes 캐시 {(전체/선택, 데이터 버전, 선택 목록): (bytes, 오류)}
+    if 'favorites_excel_cache' not in st.session_state:
+        st.session_state.favorites_excel_cache = {}
+    
+    # 원본 HTML 보관소 (보관을 끈 동안에도 같은 객체를 써서 보관 현황 캐시를 유지)
+    if 'html_archive' not in st.session_state:
+        st.session_state.html_archive = HtmlArchive()
 
-# 데이터 저장/로드
+# 데이터 저장/로드 (SQLite - 바뀐 행만 기록)
 def save_data():
     try:
-        data = {
-            'products': st.session_state.products_data,
-            'favorites': st.session_state.favorites_data,
-            'last_updated': datetime.now().isoformat()
-        }
-        with open(st.session_state.data_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        st.session_state.data_store.save(
+            st.session_state.products_data,
+            st.session_state.favorites_data
+        )
         return True
     except Exception as e:
         st.error(f"데이터 저장 오류: {e}")
@@ -799,12 +2191,17 @@ def save_data():
 
 def load_data():
     try:
-        if os.path.exists(st.session_state.data_file):
-            with open(st.session_state.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            st.session_state.products_data = data.get('products', [])
-            st.session_state.favorites_data = data.get('favorites', [])
+        started = time.perf_counter()
+        data = st.session_state.data_store.load()
+        st.session_state.data_load_count += 1
+        st.session_state.data_load_ms = (time.perf_counter() - started) * 1000
+        if data['products'] or data['favorites']:
+            st.session_state.products_data = as_products(data.get('products', []))
+            st.session_state.favorites_data = FavoritesStore(data.get('favorites', []))
+            
+            # 관심상품 dict 안의 가격히스토리는 가격 로그로 옮김 (한 번만)
+            if st.session_state.price_log.migrate_products(st.session_state.favorites_data):
+                save_data()
             
             last_updated = data.get('last_updated', '')
             if last_updated:
@@ -814,9 +2211,87 @@ def load_data():
         st.error(f"데이터 로드 오류: {e}")
         return False
 
+def load_data_if_changed():
+    """세션 첫 실행이거나 다른 세션/프로세스가 저장했을 때만 다시 로드 (rerun 마다 읽지 않음)"""
+    if not st.session_state.data_store.has_external_changes():
+        return False
+    
+    # 다시 읽어도 이 세션에서 선택한 관심상품은 유지
+    previous_selected = st.session_state.favorites_data.selected()
+    loaded = load_data()
+    for product in previous_selected:
+        favorite = st.session_state.favorites_data.find(product)
+        if favorite is not None:
+            favorite['선택됨'] = True
+    return loaded
+
 # 엑셀 생성 함수들
-def create_favorites_excel(favorites_data, selected_only=False):
-    """관심상품 엑셀 파일 생성"""
+def build_favorites_frame(products, price_log=None):
+    """관심상품 분석 표 - 상품 열은 pandas/NumPy 열 연산, 히스토리 통계는 상품 chunk 단위로 흘려 읽음
+    
+    - 목표가격 달성 여부 / 할인 금액 / 목표까지 차액 / 현재 할인율
+    - 가격 히스토리 기준 역대 최저가 / 최고가 / 최근 변동액 (상품마다 숫자 3개만 남김)
+    """
+    products = as_products(products)
+    frame = pd.DataFrame({
+        '브랜드': [p.get('브랜드', '') for p in products],
+        '상품명': [p.get('상품명', '') for p in products],
+        '현재_원가': [p.get('원가', '') for p in products],
+        '현재_할인가': [p.get('할인가', '') for p in products],
+        '목표가격': [p.get('목표가격', '') for p in products],
+        '혜택': [p.get('혜택', '') for p in products],
+        '검색키워드': [p.get('검색키워드', '') for p in products],
+        '상품코드': [p.get('상품코드', '') for p in products],
+        '상품URL': [p.get('상품URL', '') for p in products],
+        '최근업데이트': [p.get('업데이트시간', p.get('크롤링시간', '')) for p in products],
+        '관심상품_추가시간': [p.get('추가시간', '') for p in products]
+    })
+    original = pd.Series([p.price('원가') for p in products], dtype='float64')
+    current = pd.Series([p.price('할인가') for p in products], dtype='float64')
+    target = pd.Series([p.price('목표가격') for p in products], dtype='float64')
+    
+    # 목표가격 달성 여부 (NaN 비교는 False)
+    status = np.select(
+        [(frame['목표가격'] == '').to_numpy(), target.isna().to_numpy(),
+         current.isna().to_numpy(), (current <= target).to_numpy()],
+        ['목표가격미설정', '계산불가', '가격정보없음', '달성'],
+        default='미달성'
+    )
+    frame['목표가격_달성여부'] = status
+    gap = (target - current).abs()
+    # 선택 열은 기존 dict 목록 DataFrame 과 같은 순서로 (처음 나온 행 순, 같은 행에서는 차액 열이 할인율보다 앞)
+    optional_columns = [(0, 1, '현재_할인율')]
+    for column, mask in (('할인_금액', status == '달성'), ('목표까지_차액', status == '미달성')):
+        if mask.any():
+            frame[column] = gap.map('{:,.0f}원'.format).where(mask)
+            optional_columns.append((int(mask.argmax()), 0, column))
+    
+    has_rate = ((original > 0) & (current > 0)).to_numpy()
+    rate = ((1 - current / original) * 100).round(1)
+    frame['현재_할인율'] = np.where(has_rate, rate.map('{}%'.format), '계산불가')
+    frame = frame[
+        list(frame.columns[:frame.columns.get_loc('목표가격_달성여부') + 1])
+        + [column for _, _, column in sorted(optional_columns)]
+    ]
+    
+    # 가격 히스토리 통계 - 히스토리 전체를 한 표로 펼치지 않음 (메모리는 상품 수에만 비례)
+    stats = [history_stats(rows) for _, rows in iter_history(products, price_log)]
+    for column, values in zip(('역대_최저가', '역대_최고가', '최근_변동액'), zip(*stats)):
+        frame[column] = pd.array(list(values), dtype='Int64')
+    return frame
+
+def frame_rows(frame):
+    """DataFrame 행을 [값] 으로 yield (NaN / NA 는 빈 칸)"""
+    values = frame.astype(object).where(frame.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        yield list(row)
+
+def create_favorites_excel(favorites_data, selected_only=False, price_log=None, progress_callback=None):
+    """관심상품 엑셀 파일 생성 - 행을 write-only 워크북으로 흘려 씀
+    
+    가격 히스토리 시트는 상품 chunk 단위로 로그에서 읽어 바로 기록하므로 히스토리가 길어도 메모리가 일정
+    progress_callback(message, 진행률 또는 None)
+    """
     if selected_only:
         data_to_export = [p for p in favorites_data if p.get('선택됨', False)]
         if not data_to_export:
@@ -827,116 +2302,124 @@ def create_favorites_excel(favorites_data, selected_only=False):
             return None, "관심상품이 없습니다."
     
     try:
-        # 관심상품 데이터 준비
-        fav_data = []
-        for product in data_to_export:
-            export_product = {}
-            
-            # 기본 정보
-            export_product['브랜드'] = product.get('브랜드', '')
-            export_product['상품명'] = product.get('상품명', '')
-            export_product['현재_원가'] = product.get('원가', '')
-            export_product['현재_할인가'] = product.get('할인가', '')
-            export_product['목표가격'] = product.get('목표가격', '')
-            export_product['혜택'] = product.get('혜택', '')
-            export_product['검색키워드'] = product.get('검색키워드', '')
-            export_product['상품코드'] = product.get('상품코드', '')
-            export_product['상품URL'] = product.get('상품URL', '')
-            export_product['최근업데이트'] = product.get('업데이트시간', product.get('크롤링시간', ''))
-            export_product['관심상품_추가시간'] = product.get('추가시간', '')
-            
-            # 목표가격 달성 여부
-            if product.get('목표가격', ''):
-                try:
-                    target_price = int(product.get('목표가격', '').replace(',', ''))
-                    current_price_str = product.get('할인가', '').replace(',', '')
-                    if current_price_str and current_price_str.isdigit():
-                        current_price = int(current_price_str)
-                        export_product['목표가격_달성여부'] = '달성' if current_price <= target_price else '미달성'
-                        if current_price <= target_price:
-                            export_product['할인_금액'] = f"{target_price - current_price:,}원"
-                        else:
-                            export_product['목표까지_차액'] = f"{current_price - target_price:,}원"
-                    else:
-                        export_product['목표가격_달성여부'] = '가격정보없음'
-                except:
-                    export_product['목표가격_달성여부'] = '계산불가'
-            else:
-                export_product['목표가격_달성여부'] = '목표가격미설정'
-            
-            # 할인율 계산
-            try:
-                original = product.get('원가', '').replace(',', '')
-                discount = product.get('할인가', '').replace(',', '')
-                if original and discount and original != '0' and discount != '0':
-                    discount_rate = round((1 - int(discount) / int(original)) * 100, 1)
-                    export_product['현재_할인율'] = f"{discount_rate}%"
-                else:
-                    export_product['현재_할인율'] = "계산불가"
-            except:
-                export_product['현재_할인율'] = "계산불가"
-            
-            fav_data.append(export_product)
+        products = as_products(data_to_export)
+        df_fav = build_favorites_frame(products, price_log)
+        
+        sheet_name = '선택된_관심상품' if selected_only else '관심상품_전체'
+        sheets = [ExportSheet(sheet_name, df_fav.columns, frame_rows(df_fav), total=len(df_fav))]
+        
+        # 가격 히스토리 (2회 이상 기록된 상품만)
+        history_sheet_name = '선택상품_가격히스토리' if selected_only else '가격변화_히스토리'
+        sheets.append(ExportSheet(
+            history_sheet_name, HISTORY_HEADERS,
+            history_sheet_rows(products, price_log, min_entries=2),
+            total=history_sheet_total(products, price_log, min_entries=2),
+            skip_empty=True
+        ))
+        
+        # 목표가격 달성 상품 (전체 내보내기일 때만)
+        if not selected_only:
+            df_achieved = df_fav[df_fav['목표가격_달성여부'] == '달성']
+            if not df_achieved.empty:
+                # 달성 상품 행만 모은 표와 같은 열 (목표까지_차액 없음, 할인_금액 은 할인율 앞)
+                achieved_columns = [c for c in df_achieved.columns if c not in ('할인_금액', '목표까지_차액')]
+                achieved_columns.insert(achieved_columns.index('현재_할인율'), '할인_금액')
+                df_achieved = df_achieved[achieved_columns]
+            sheets.append(ExportSheet(
+                '목표가격_달성상품', df_achieved.columns, frame_rows(df_achieved),
+                total=len(df_achieved), skip_empty=True
+            ))
         
         # 엑셀 파일 생성
         output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df_fav = pd.DataFrame(fav_data)
-            sheet_name = '선택된_관심상품' if selected_only else '관심상품_전체'
-            df_fav.to_excel(writer, sheet_name=sheet_name, index=False)
-            
-            # 가격 히스토리
-            history_data = []
-            for product in data_to_export:
-                price_history = product.get('가격히스토리', [])
-                if len(price_history) > 1:
-                    for entry in price_history:
-                        history_entry = {
-                            '브랜드': product.get('브랜드', ''),
-                            '상품명': product.get('상품명', ''),
-                            '날짜': entry.get('날짜', ''),
-                            '시간': entry.get('시간', ''),
-                            '원가': entry.get('원가', ''),
-                            '할인가': entry.get('할인가', '')
-                        }
-                        history_data.append(history_entry)
-            
-            if history_data:
-                df_history = pd.DataFrame(history_data)
-                history_sheet_name = '선택상품_가격히스토리' if selected_only else '가격변화_히스토리'
-                df_history.to_excel(writer, sheet_name=history_sheet_name, index=False)
-            
-            # 목표가격 달성 상품 (전체 내보내기일 때만)
-            if not selected_only:
-                achieved_products = [p for p in fav_data if p.get('목표가격_달성여부') == '달성']
-                if achieved_products:
-                    df_achieved = pd.DataFrame(achieved_products)
-                    df_achieved.to_excel(writer, sheet_name='목표가격_달성상품', index=False)
-        
+        write_xlsx(output, sheets, progress_callback=progress_callback)
         output.seek(0)
         return output, None
         
     except Exception as e:
         return None, f"엑셀 파일 생성 오류: {str(e)}"
 
+# 엑셀 내용에 들어가는 관심상품 필드 (선택됨은 제외 - 선택만 바뀌면 전체 엑셀은 그대로)
+EXCEL_SOURCE_FIELDS = (
+    '브랜드', '상품명', '원가', '할인가', '목표가격', '혜택', '검색키워드',
+    '상품코드', '상품URL', '업데이트시간', '크롤링시간', '추가시간'
+)
+EXCEL_CACHE_LIMIT = 4
+
+def favorites_data_version(favorites_data, price_log=None):
+    """관심상품 엑셀 내용의 버전 해시 - 필드 값, 가격히스토리, 가격 로그 크기가 같으면 같은 값"""
+    digest = hashlib.blake2b(digest_size=16)
+    for product in favorites_data:
+        values = [product.get(key, '') for key in EXCEL_SOURCE_FIELDS]
+        values.append(len(product.get('가격히스토리', [])))
+        digest.update(repr(values).encode('utf-8'))
+    if price_log is not None:
+        digest.update(str(price_log.summary()['bytes']).encode('ascii'))
+    return digest.hexdigest()
+
+def cached_favorites_excel(selected_only, data_version, build=False, progress_callback=None):
+    """관심상품 엑셀 bytes - (데이터 버전, 선택 목록) 별로 캐시하고 build=True 일 때만 새로 만듦
+    
+    반환값: (bytes 또는 None, 오류 메시지 또는 None) - 아직 만들지 않았으면 (None, None)
+    """
+    favorites_data = st.session_state.favorites_data
+    selection = tuple(
+        idx for idx, p in enumerate(favorites_data) if p.get('선택됨', False)
+    ) if selected_only else ()
+    key = (selected_only, data_version, selection)
+    cache = st.session_state.favorites_excel_cache
+    
+    # 데이터가 바뀐 이전 버전은 버림
+    for stale_key in [k for k in cache if k[1] != data_version]:
+        del cache[stale_key]
+    
+    if key in cache:
+        return cache[key]
+    if not build:
+        return None, None
+    
+    excel_data, error = create_favorites_excel(
+        favorites_data, selected_only=selected_only, price_log=st.session_state.price_log,
+        progress_callback=progress_callback
+    )
+    cache[key] = (excel_data.getvalue() if excel_data else None, error)
+    while len(cache) > EXCEL_CACHE_LIMIT:
+        del cache[next(iter(cache))]
+    return cache[key]
+
+def excel_progress_callback():
+    """엑셀 내보내기 진행상황을 progress bar / 상태 문구로 표시하는 콜백"""
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    def update_progress(message, progress=None):
+        status_text.text(message)
+        if progress is not None:
+            progress_bar.progress(progress)
+    
+    return update_progress
+
 # 가격 히스토리 차트 생성
-def create_price_history_chart(product_data):
-    """가격 히스토리 차트 생성"""
+def create_price_history_chart(product_data, price_log=None):
+    """가격 히스토리 차트 생성 (price_log 가 있으면 정수 열을 그대로 사용)"""
     if not PLOTLY_AVAILABLE:
         st.warning("📊 그래프를 보려면 'pip install plotly' 를 설치해주세요")
         return None
     
-    price_history = product_data.get('가격히스토리', [])
+    if price_log is not None:
+        dates, original_prices, discount_prices = price_log.series_for(product_data)
+        price_history = []
+    else:
+        dates = []
+        original_prices = []
+        discount_prices = []
+        price_history = product_data.get('가격히스토리', [])
     
-    if len(price_history) < 2:
+    if max(len(dates), len(price_history)) < 2:
         st.info("가격 변화 데이터가 충분하지 않습니다. (최소 2회 이상의 업데이트 필요)")
         return None
     
     try:
-        dates = []
-        original_prices = []
-        discount_prices = []
-        
         for entry in price_history:
             try:
                 date_str = f"{entry.get('날짜', '')} {entry.get('시간', '00:00:00')}"
@@ -1029,6 +2512,47 @@ def main():
             help="각 검색어당 크롤링할 페이지 수"
         )
         
+        concurrent_mode = st.checkbox(
+            "⚡ 동시 크롤링",
+            value=False,
+            help="여러 검색어/페이지와 관심상품 새로고침을 동시에 요청합니다 (고정 대기 대신 속도 제한 사용)"
+        )
+        max_workers = 4
+        requests_per_second = 2.0
+        if concurrent_mode:
+            max_workers = st.slider("동시 요청 수", min_value=2, max_value=MAX_CONCURRENT_WORKERS, value=4)
+            requests_per_second = st.slider(
+                "초당 요청 수",
+                min_value=0.5,
+                max_value=5.0,
+                value=2.0,
+                step=0.5,
+                help="호스트별 요청 속도 상한"
+            )
+        
+        parser_options = [name for name in PARSER_BACKENDS if name == 'html.parser' or LXML_AVAILABLE]
+        parser_backend = st.selectbox(
+            "HTML 파서",
+            parser_options,
+            index=parser_options.index(DEFAULT_PARSER_BACKEND),
+            format_func=lambda name: PARSER_BACKENDS[name],
+            help="lxml 이 설치되어 있으면 lxml 계열 파서가 훨씬 빠릅니다"
+        )
+        st.session_state.scraper.parser_backend = parser_backend
+        
+        incremental_paging = st.checkbox(
+            "📄 점진 페이징",
+            value=False,
+            help="빈 페이지, 페이지 크기보다 적은 페이지, 이미 본 상품만 있는 페이지가 나오면 해당 검색어의 다음 페이지를 요청하지 않습니다"
+        )
+        use_page_snapshot = False
+        if incremental_paging:
+            use_page_snapshot = st.checkbox(
+                "이전 크롤링과 같은 페이지에서 중단",
+                value=False,
+                help="페이지의 상품코드가 지난 크롤링과 같으면 이후 페이지도 바뀌지 않았다고 보고 멈춥니다"
+            )
+        
         # 크롤링 시작 버튼
         if st.button("🚀 크롤링 시작", type="primary", use_container_width=True):
             if keywords_text.strip():
@@ -1055,7 +2579,12 @@ def main():
                         products = st.session_state.scraper.scrape_products(
                             keywords, 
                             max_pages,
-                            progress_callback=update_progress
+                            progress_callback=update_progress,
+                            concurrent=concurrent_mode,
+                            max_workers=max_workers,
+                            requests_per_second=requests_per_second,
+                            incremental=incremental_paging,
+                            use_snapshot=use_page_snapshot
                         )
                         
                         st.session_state.products_data = products
@@ -1064,6 +2593,15 @@ def main():
                         progress_bar.progress(1.0)
                         status_text.text(f"✅ 완료! 총 {len(products)}개 상품")
                         
+                        if incremental_paging and st.session_state.scraper.last_paging_stats:
+                            paging_stats = st.session_state.scraper.last_paging_stats
+                            st.info(f"📄 점진 페이징: {paging_stats['pages_fetched']}페이지 요청, {paging_stats['pages_skipped']}페이지 생략")
+                            if paging_stats['stopped']:
+                                st.dataframe(pd.DataFrame([
+                                    {'검색어': keyword, '중단 페이지': info['page'], '이유': info['reason']}
+                                    for keyword, info in paging_stats['stopped'].items()
+                                ]), use_container_width=True, hide_index=True)
+                        
                         if len(products) > 0:
                             st.success(f"🎉 {len(products)}개 상품을 찾았습니다!")
                             
@@ -1117,15 +2655,107 @@ def main():
         st.subheader("📊 통계")
         st.metric("검색 결과", f"{len(st.session_state.products_data)}개")
         st.metric("관심 상품", f"{len(st.session_state.favorites_data)}개")
+        st.metric(
+            "데이터 로드", f"{st.session_state.data_load_count}회",
+            f"{st.session_state.data_load_ms:.0f}ms", delta_color="off",
+            help="다른 세션이나 프로그램이 데이터를 바꿨을 때만 다시 읽습니다"
+        )
         
         if st.session_state.favorites_data:
-            target_achieved = len([p for p in st.session_state.favorites_data 
-                                 if p.get('목표가격', '') and 
-                                 p.get('할인가', '').replace(',', '').isdigit() and
-                                 p.get('목표가격', '').replace(',', '').isdigit() and
-                                 int(p.get('할인가', '').replace(',', '')) <= int(p.get('목표가격', '').replace(',', ''))])
+            target_achieved = sum(1 for p in st.session_state.favorites_data if target_reached(p))
             st.metric("목표가격 달성", f"{target_achieved}개")
         
+        # 원본 HTML 보관 / 오프라인 재추출
+        with st.expander("🗄️ 원본 HTML 보관"):
+            scraper = st.session_state.scraper
+            archive_enabled = st.checkbox(
+                "크롤링한 원본 HTML 보관",
+                value=scraper.html_archive is not None,
+                help="파서를 고친 뒤 다시 크롤링하지 않고 보관본으로 재추출할 수 있습니다"
+            )
+            archive = st.session_state.html_archive
+            if archive_enabled and scraper.html_archive is None:
+                scraper.html_archive = archive
+            elif not archive_enabled:
+                scraper.html_archive = None
+            
+            archive_info = archive.summary()
+            st.caption(
+                f"보관 {archive_info['entries']}건 | 고유 본문 {archive_info['objects']}개 | "
+                f"{archive_info['raw_bytes'] / 1024 / 1024:.1f}MB → {archive_info['compressed_bytes'] / 1024 / 1024:.1f}MB ({archive.codec})"
+            )
+            
+            if archive_info['keywords']:
+                reextract_keyword = st.selectbox("재추출할 검색어", archive_info['keywords'])
+                if st.button("🔁 보관본으로 재추출", use_container_width=True):
+                    with st.spinner("보관된 HTML 에서 다시 추출 중..."):
+                        extracted = scraper.reextract_archive(archive, kinds=('search',), keyword=reextract_keyword)
+                    # 선택한 검색어의 상품만 재추출 결과로 바꾸고 나머지 검색 결과는 그대로 둠
+                    products = [
+                        product for product in st.session_state.products_data
+                        if reextract_keyword not in [part.strip() for part in str(product.get('검색키워드', '')).split(',')]
+                    ]
+                    dedup_index = ProductDedupIndex()
+                    dedup_index.merge(products, [])
+                    dedup_index.merge(as_products(extracted['search']), products)
+                    st.session_state.products_data = products
+                    save_data()
+                    st.success(f"'{reextract_keyword}' 검색 결과 {len(extracted['search'])}개 재추출 완료")
+        
+        # 상세 페이지 가격 추출 단계별 적중률
+        with st.expander("🏷️ 가격 추출 단계"):
+            price_tiers = st.session_state.scraper.last_price_tier_stats
+            if price_tiers:
+                st.dataframe(pd.DataFrame([{
+                    '단계': tier,
+                    '시도': entry['attempts'],
+                    '적중': entry['hits'],
+                    '적중률': f"{entry['hit_rate']}%",
+                    '평균(ms)': entry['avg_ms']
+                } for tier, entry in price_tiers.items()]), use_container_width=True, hide_index=True)
+            else:
+                st.caption("관심 상품을 새로고침하면 단계별 통계가 표시됩니다")
+        
+        # HTTP 응답 캐시
+        with st.expander("💾 응답 캐시"):
+            response_cache = st.session_state.scraper.response_cache
+            response_cache.enabled = st.checkbox(
+                "응답 캐시 사용",
+                value=response_cache.enabled,
+                help="상세 페이지는 10분, 검색 결과는 5분 동안 재요청하지 않고, 이후에는 ETag/Last-Modified 로 변경 여부만 확인합니다 "
+                     "(관심상품 새로고침은 항상 변경 여부를 확인하고, 차단 안내 페이지는 저장하지 않음)"
+            )
+            st.caption(f"저장된 응답 {len(response_cache.entries)}개 | {response_cache.total_bytes() / 1024 / 1024:.1f}MB")
+            last_stats = st.session_state.scraper.last_cache_stats
+            if last_stats:
+                st.dataframe(pd.DataFrame([{
+                    '적중': last_stats['hits'],
+                    '재검증(304)': last_stats['revalidated'],
+                    '미스': last_stats['misses'],
+                    '삭제(LRU)': last_stats['evicted'],
+                    '저장 안 함': last_stats.get('rejected', 0),
+                    '절약(KB)': round(last_stats['bytes_saved'] / 1024, 1)
+                }]), use_container_width=True, hide_index=True)
+            if st.button("🗑️ 캐시 비우기", use_container_width=True):
+                response_cache.clear()
+                st.success("응답 캐시를 비웠습니다")
+        
+        # 엔드포인트 전략 / 서킷 브레이커 상태
+        with st.expander("🛰️ 엔드포인트 상태"):
+            st.dataframe(
+                pd.DataFrame(st.session_state.scraper.endpoint_health.summary_rows()),
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        # 셀렉터 전략 캐시 통계
+        with st.expander("🧠 셀렉터 캐시 통계"):
+            cache_rows = st.session_state.scraper.selector_cache.summary_rows()
+            if cache_rows:
+                st.dataframe(pd.DataFrame(cache_rows), use_container_width=True, hide_index=True)
+            else:
+                st.caption("아직 기록된 셀렉터 전략이 없습니다")
+        
         # 디버그 섹션
         st.markdown("---")
         st.subheader("🔧 테스트")
@@ -1166,7 +2796,7 @@ def main():
                 results = scraper.scrape_products([test_keyword], 1, test_progress)
                 if len(results) > 0:
                     st.success(f"✅ 실제 크롤링 성공: {len(results)}개 상품 발견")
-                    st.json(results[0])  # 첫 번째 상품 정보 표시
+                    st.json(results[0].to_dict())  # 첫 번째 상품 정보 표시 (Product 는 dict 가 아니므로 변환)
                 else:
                     st.warning("⚠️ 실제 크롤링에서 상품을 찾지 못했습니다")
                     st.info("올리브영이 크롤링을 차단하고 있을 가능성이 높습니다. 모의 데이터를 사용하세요.")
@@ -1253,19 +2883,13 @@ def main():
                     
                     # 관심상품에 추가 버튼
                     if st.button(f"⭐ 관심상품 추가", key=f"add_{idx}_{product.get('상품코드', '')}", use_container_width=True):
-                        # 중복 확인
-                        brand_name_key = f"{product['브랜드']}_{product['상품명']}"
-                        is_duplicate = any(
-                            f"{fav_product['브랜드']}_{fav_product['상품명']}" == brand_name_key
-                            for fav_product in st.session_state.favorites_data
+                        # 중복 확인은 관심상품 색인으로
+                        added_count = st.session_state.favorites_data.add_products(
+                            [product], added_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                         )
+                        st.session_state.price_log.record_products([product])
                         
-                        if not is_duplicate:
-                            product_copy = product.copy()
-                            product_copy['선택됨'] = False
-                            product_copy['목표가격'] = ""
-                            product_copy['추가시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            st.session_state.favorites_data.append(product_copy)
+                        if added_count:
                             save_data()
                             st.success("관심상품에 추가되었습니다!")
                             st.rerun()
@@ -1301,21 +2925,11 @@ def main():
             
             with col3:
                 if st.button("⭐ 전체 관심상품 추가", use_container_width=True):
-                    added_count = 0
-                    for product in st.session_state.products_data:
-                        brand_name_key = f"{product['브랜드']}_{product['상품명']}"
-                        is_duplicate = any(
-                            f"{fav_product['브랜드']}_{fav_product['상품명']}" == brand_name_key
-                            for fav_product in st.session_state.favorites_data
-                        )
-                        
-                        if not is_duplicate:
-                            product_copy = product.copy()
-                            product_copy['선택됨'] = False
-                            product_copy['목표가격'] = ""
-                            product_copy['추가시간'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            st.session_state.favorites_data.append(product_copy)
-                            added_count += 1
+                    added_count = st.session_state.favorites_data.add_products(
+                        st.session_state.products_data,
+                        added_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    )
+                    st.session_state.price_log.record_products(st.session_state.products_data)
                     
                     save_data()
                     st.success(f"{added_count}개 상품이 관심상품에 추가되었습니다!")
@@ -1336,7 +2950,7 @@ def main():
             
             with col1:
                 if st.button("🔄 선택된 상품 새로고침", use_container_width=True):
-                    selected_products = [p for p in st.session_state.favorites_data if p.get('선택됨', False)]
+                    selected_products = st.session_state.favorites_data.selected()
                     if selected_products:
                         progress_bar = st.progress(0)
                         status_text = st.empty()
@@ -1350,16 +2964,14 @@ def main():
                             try:
                                 updated_products = st.session_state.scraper.scrape_selected_products(
                                     selected_products,
-                                    progress_callback=update_progress
+                                    progress_callback=update_progress,
+                                    concurrent=concurrent_mode,
+                                    max_workers=max_workers,
+                                    requests_per_second=requests_per_second
                                 )
                                 
                                 # 업데이트된 상품들로 교체
-                                updated_dict = {f"{p['브랜드']}_{p['상품명']}": p for p in updated_products}
-                                
-                                for i, product in enumerate(st.session_state.favorites_data):
-                                    key = f"{product['브랜드']}_{product['상품명']}"
-                                    if key in updated_dict:
-                                        st.session_state.favorites_data[i] = updated_dict[key]
+                                st.session_state.favorites_data.merge_updates(updated_products)
                                 
                                 save_data()
                                 progress_bar.progress(1.0)
@@ -1374,19 +2986,27 @@ def main():
             
             with col2:
                 if st.button("🗑️ 선택된 상품 삭제", use_container_width=True):
-                    selected_indices = [i for i, p in enumerate(st.session_state.favorites_data) if p.get('선택됨', False)]
-                    if selected_indices:
-                        for i in reversed(selected_indices):
-                            del st.session_state.favorites_data[i]
+                    removed_count = st.session_state.favorites_data.remove_selected()
+                    if removed_count:
                         save_data()
-                        st.success(f"{len(selected_indices)}개 상품이 삭제되었습니다!")
+                        st.success(f"{removed_count}개 상품이 삭제되었습니다!")
                         st.rerun()
                     else:
                         st.warning("삭제할 상품을 선택해주세요")
             
+            # 엑셀은 버튼을 눌렀을 때만 만들고, 데이터가 그대로면 만들어 둔 bytes 를 다시 씀
+            data_version = favorites_data_version(
+                st.session_state.favorites_data, st.session_state.price_log
+            )
+            
             with col3:
                 # 관심상품 전체 엑셀 다운로드
-                excel_data, error = create_favorites_excel(st.session_state.favorites_data, selected_only=False)
+                excel_data, error = cached_favorites_excel(False, data_version)
+                if excel_data is None and error is None:
+                    if st.button("📊 전체 엑셀 만들기", use_container_width=True):
+                        excel_data, error = cached_favorites_excel(
+                            False, data_version, build=True, progress_callback=excel_progress_callback()
+                        )
                 if excel_data:
                     st.download_button(
                         label="📊 전체 엑셀 다운로드",
@@ -1395,14 +3015,19 @@ def main():
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                         use_container_width=True
                     )
-                else:
+                elif error:
                     st.button("📊 전체 엑셀 다운로드", disabled=True, use_container_width=True, help=error)
             
             with col4:
                 # 선택된 관심상품만 엑셀 다운로드
-                selected_count = len([p for p in st.session_state.favorites_data if p.get('선택됨', False)])
+                selected_count = len(st.session_state.favorites_data.selected())
                 if selected_count > 0:
-                    excel_data, error = create_favorites_excel(st.session_state.favorites_data, selected_only=True)
+                    excel_data, error = cached_favorites_excel(True, data_version)
+                    if excel_data is None and error is None:
+                        if st.button(f"📋 선택된 {selected_count}개 엑셀 만들기", use_container_width=True):
+                            excel_data, error = cached_favorites_excel(
+                                True, data_version, build=True, progress_callback=excel_progress_callback()
+                            )
                     if excel_data:
                         st.download_button(
                             label=f"📋 선택된 {selected_count}개 다운로드",
@@ -1411,7 +3036,7 @@ def main():
                             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                             use_container_width=True
                         )
-                    else:
+                    elif error:
                         st.button(f"📋 선택된 {selected_count}개 다운로드", disabled=True, use_container_width=True, help=error)
                 else:
                     st.button("📋 선택된 상품 다운로드", disabled=True, use_container_width=True, help="선택된 상품이 없습니다")
@@ -1427,24 +3052,18 @@ def main():
             # 선택 컬럼 추가
             favorites_df['선택'] = favorites_df['선택됨'].apply(lambda x: "☑️" if x else "☐")
             
-            # 목표가격 달성 표시
-            def format_target_price(row):
-                target_price = row.get('목표가격', '')
-                current_price = row.get('할인가', '').replace(',', '')
-                
-                if target_price and current_price.isdigit():
-                    target_int = int(target_price.replace(',', ''))
-                    current_int = int(current_price)
-                    if current_int <= target_int:
-                        return f"✅ {target_price}원"
-                    else:
-                        return f"❌ {target_price}원"
+            # 목표가격 달성 표시 (DataFrame 행이 아니라 Product 의 정수 가격으로 계산)
+            def format_target_price(product):
+                target_price = product.get('목표가격', '')
+                reached = target_reached(product)
+                if reached is not None:
+                    return f"✅ {target_price}원" if reached else f"❌ {target_price}원"
                 elif target_price:
                     return f"{target_price}원"
                 else:
                     return "미설정"
             
-            favorites_df['목표가격_표시'] = favorites_df.apply(format_target_price, axis=1)
+            favorites_df['목표가격_표시'] = [format_target_price(p) for p in st.session_state.favorites_data]
             
             # 표시할 컬럼 선택
             display_columns = ['선택', '브랜드', '상품명', '원가', '할인가', '목표가격_표시', '혜택', '업데이트시간']
@@ -1496,7 +3115,7 @@ def main():
                     st.markdown(f"**현재 할인가:** {selected_product.get('할인가', '')}원")
                     
                     # 목표가격 설정
-                    current_target = selected_product.get('목표가격', '').replace(',', '').replace('원', '') if selected_product.get('목표가격') else ''
+                    current_target = str(selected_product.target_price) if selected_product.price('목표가격') else ''
                     
                     target_price = st.text_input(
                         "목표가격 설정 (숫자만 입력)",
@@ -1512,7 +3131,7 @@ def main():
                                 try:
                                     target_int = int(target_price.replace(',', ''))
                                     if target_int > 0:
-                                        st.session_state.favorites_data[selected_product_idx]['목표가격'] = f"{target_int:,}"
+                                        st.session_state.favorites_data[selected_product_idx].target_price = target_int
                                         save_data()
                                         st.success(f"목표가격이 {target_int:,}원으로 설정되었습니다!")
                                         st.rerun()
@@ -1551,11 +3170,11 @@ def main():
                 # 가격 히스토리 차트
                 st.subheader("📈 가격 변화 히스토리")
                 
-                price_history = selected_product.get('가격히스토리', [])
+                price_history = st.session_state.price_log.entries_for(selected_product)
                 
                 if len(price_history) >= 2:
                     # 차트 생성
-                    fig = create_price_history_chart(selected_product)
+                    fig = create_price_history_chart(selected_product, st.session_state.price_log)
                     if fig:
                         st.plotly_chart(fig, use_container_width=True)
                     
@@ -1635,5 +3254,5 @@ def main():
 # 자동 데이터 로드
 if __name__ == "__main__":
     init_session_state()
-    load_data()
+    load_data_if_changed()
     main()
@@ -0,0 +1,567 @@
+"""
+올리브영 상품 데이터 저장/색인 도구
+oliveyoung_scraper.py(Playwright) / oliveyoung_scraper_Streamlit.py(requests) 공용
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from oliveyoung_model import Product, as_products
+
+_NORMALIZE_PATTERN = re.compile(r'[^0-9a-z가-힣]')
+
+
+def normalize_text(text):
+    """비교용 문자열 - 소문자, 공백/기호 제거"""
+    return _NORMALIZE_PATTERN.sub('', str(text or '').lower())
+
+
+def product_keys(product):
+    """상품 식별 키 목록 - 상품코드가 있으면 상품코드 키만, 없을 때만 정규화한 브랜드+상품명 키
+
+    같은 이름이라도 상품코드가 다르면(용량/구성 차이 등) 다른 상품으로 본다.
+    """
+    code = str(product.get('상품코드', '') or '').strip()
+    if code:
+        return [f"code:{code}"]
+    name = normalize_text(product.get('상품명', ''))
+    if name:
+        return [f"name:{normalize_text(product.get('브랜드', ''))}|{name}"]
+    return []
+
+
+def unique_by_goods_no(products):
+    """같은 상품코드(없으면 브랜드+상품명)는 처음 것만 남김 (순서 유지)"""
+    seen = set()
+    unique = []
+    for product in products:
+        keys = product_keys(product)
+        if keys and any(key in seen for key in keys):
+            continue
+        seen.update(keys)
+        unique.append(product)
+    return unique
+
+
+class ProductDedupIndex:
+    """크롤링 중 여러 검색어에서 나온 같은 상품을 하나로 합치는 색인
+
+    상품코드로 찾고, 상품코드가 없는 상품만 정규화한 브랜드+상품명으로 찾는다.
+    합쳐진 상품은 '_검색키워드목록'(내보내기 제외)에 검색어를 모으고 '검색키워드' 는 쉼표로 이은 문자열로 유지한다.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.by_key = {}
+            self.duplicates = 0
+
+    def add(self, product):
+        """상품 등록 - 반환값: (대표 상품, 새 상품 여부)"""
+        keys = product_keys(product)
+        keyword = product.get('검색키워드', '')
+
+        with self._lock:
+            canonical = None
+            for key in keys:
+                canonical = self.by_key.get(key)
+                if canonical is not None:
+                    break
+
+            if canonical is None:
+                if '_검색키워드목록' not in product:
+                    product['_검색키워드목록'] = [keyword] if keyword else []
+                for key in keys:
+                    self.by_key[key] = product
+                return product, True
+
+            self.duplicates += 1
+            keywords = canonical.setdefault('_검색키워드목록', [])
+            for new_keyword in product.get('_검색키워드목록') or ([keyword] if keyword else []):
+                if new_keyword and new_keyword not in keywords:
+                    keywords.append(new_keyword)
+            canonical['검색키워드'] = ", ".join(keywords)
+
+            # 대표 상품에 비어 있는 값은 중복 상품에서 채움
+            for field, value in product.items():
+                if value and not canonical.get(field):
+                    canonical[field] = value
+            for key in keys:
+                self.by_key.setdefault(key, canonical)
+            return canonical, False
+
+    def merge(self, products, target):
+        """products 를 색인에 등록하고 새 상품만 target 목록에 추가 - 추가된 개수 반환"""
+        added = 0
+        for product in products:
+            canonical, is_new = self.add(product)
+            if is_new:
+                target.append(canonical)
+                added += 1
+        return added
+
+
+class FavoritesStore(list):
+    """관심상품 목록 - 상품코드 키(없으면 정규화한 브랜드+상품명 키)로 O(1) 조회
+
+    기존 코드가 리스트로 다루던 곳(인덱스 접근, 반복)은 그대로 동작하고,
+    추가/삭제/교체는 색인을 함께 갱신한다. 들어오는 상품은 모두 Product 로 바꿔 보관한다.
+    상품 dict 의 상품코드/브랜드/상품명을 직접 바꾼 경우에는 reindex() 를 호출해야 한다.
+    """
+    def __init__(self, products=None):
+        super().__init__(as_products(products or []))
+        self.reindex()
+
+    def reindex(self):
+        """전체 색인 재구성 (같은 키가 여러 개면 앞의 것이 대표)"""
+        self._index = {}
+        self._positions = {}
+        for idx, product in enumerate(self):
+            self._positions[id(product)] = idx
+            self._register(product)
+
+    def _register(self, product):
+        for key in product_keys(product):
+            self._index.setdefault(key, product)
+
+    def _unregister(self, product):
+        for key in product_keys(product):
+            if self._index.get(key) is product:
+                del self._index[key]
+
+    def _position_of(self, product):
+        return self._positions.get(id(product))
+
+    def find(self, product):
+        """같은 상품으로 등록된 관심상품 (없으면 None)"""
+        for key in product_keys(product):
+            favorite = self._index.get(key)
+            if favorite is not None:
+                return favorite
+        return None
+
+    def get_by_goods_no(self, goods_no):
+        return self._index.get(f"code:{goods_no}")
+
+    def __contains__(self, product):
+        return self.find(product) is not None
+
+    def append(self, product):
+        product = Product.from_dict(product)
+        self._positions[id(product)] = len(self)
+        super().append(product)
+        self._register(product)
+
+    def extend(self, products):
+        for product in products:
+            self.append(product)
+
+    def __setitem__(self, idx, product):
+        if isinstance(idx, slice):
+            super().__setitem__(idx, as_products(product))
+            self.reindex()
+            return
+        product = Product.from_dict(product)
+        old = self[idx]
+        super().__setitem__(idx, product)
+        self._unregister(old)
+        self._register(product)
+        self._positions.pop(id(old), None)
+        self._positions[id(product)] = idx if idx >= 0 else len(self) + idx
+
+    def __delitem__(self, idx):
+        super().__delitem__(idx)
+        self.reindex()
+
+    def insert(self, idx, product):
+        super().insert(idx, Product.from_dict(product))
+        self.reindex()
+
+    def pop(self, idx=-1):
+        product = super().pop(idx)
+        self.reindex()
+        return product
+
+    def remove(self, product):
+        super().remove(product)
+        self.reindex()
+
+    def clear(self):
+        super().clear()
+        self.reindex()
+
+    def add_products(self, products, added_time=None):
+        """새 상품만 관심상품으로 복사해 추가 - 추가된 개수 반환"""
+        added = 0
+        for product in products:
+            if self.find(product) is not None:
+                continue
+            product_copy = product.copy()
+            product_copy['선택됨'] = False
+            product_copy['목표가격'] = ""
+            if added_time:
+                product_copy['추가시간'] = added_time
+            self.append(product_copy)
+            added += 1
+        return added
+
+    def selected(self):
+        """선택된 관심상품 목록"""
+        return [product for product in self if product.get('선택됨', False)]
+
+    def remove_selected(self):
+        """선택된 관심상품을 한 번에 제거 - 제거된 개수 반환"""
+        kept = [product for product in self if not product.get('선택됨', False)]
+        removed = len(self) - len(kept)
+        if removed:
+            super().__setitem__(slice(None), kept)
+            self.reindex()
+        return removed
+
+    def merge_updates(self, updated_products):
+        """새로고침 결과로 같은 상품을 교체 - 교체된 개수 반환"""
+        replaced = 0
+        for updated in updated_products:
+            favorite = self.find(updated)
+            if favorite is None:
+                continue
+            idx = self._position_of(favorite)
+            if idx is not None:
+                self[idx] = updated
+                replaced += 1
+        return replaced
+
+
+def benchmark_favorites(count=10000, incoming=1000):
+    """관심상품 count 개에서 기존 선형 중복 확인과 색인 조회 비교
+
+    incoming 개(절반은 이미 있는 상품)를 추가하고, 같은 수만큼 새로고침 결과를 병합한다.
+    반환값: 단계별 [{'작업', '방식', 'ms'}]
+    """
+    favorites = [
+        {'상품코드': f"A{idx:08d}", '브랜드': f"브랜드{idx % 300}", '상품명': f"상품 {idx}",
+         '할인가': "10,000", '선택됨': False}
+        for idx in range(count)
+    ]
+    half = incoming // 2
+    new_products = (
+        [dict(favorites[idx * (count // max(half, 1)) % count]) for idx in range(half)] +
+        [{'상품코드': f"B{idx:08d}", '브랜드': "신규", '상품명': f"신상품 {idx}", '할인가': "9,000"}
+         for idx in range(incoming - half)]
+    )
+    rows = []
+
+    # 기존 방식: 브랜드_상품명 문자열을 만들어 전체 관심상품을 훑음
+    linear = list(favorites)
+    started = time.perf_counter()
+    for product in new_products:
+        brand_name_key = f"{product['브랜드']}_{product['상품명']}"
+        if not any(f"{fav['브랜드']}_{fav['상품명']}" == brand_name_key for fav in linear):
+            linear.append(product.copy())
+    rows.append({'작업': f"{incoming}개 추가", '방식': '선형 탐색', 'ms': round((time.perf_counter() - started) * 1000, 2)})
+
+    started = time.perf_counter()
+    store = FavoritesStore(favorites)
+    build_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    store.add_products(new_products)
+    rows.append({'작업': f"{incoming}개 추가", '방식': '색인', 'ms': round((time.perf_counter() - started) * 1000, 2)})
+    rows.append({'작업': f"색인 생성 ({count}개)", '방식': '색인', 'ms': round(build_ms, 2)})
+
+    updated_products = [dict(product, 할인가="8,000") for product in new_products]
+
+    linear_copy = list(linear)
+    started = time.perf_counter()
+    updated_dict = {f"{p['브랜드']}_{p['상품명']}": p for p in updated_products}
+    for i, product in enumerate(linear_copy):
+        key = f"{product['브랜드']}_{product['상품명']}"
+        if key in updated_dict:
+            linear_copy[i] = updated_dict[key]
+    rows.append({'작업': f"새로고침 {incoming}개 병합", '방식': '선형 탐색', 'ms': round((time.perf_counter() - started) * 1000, 2)})
+
+    started = time.perf_counter()
+    store.merge_updates(updated_products)
+    rows.append({'작업': f"새로고침 {incoming}개 병합", '방식': '색인', 'ms': round((time.perf_counter() - started) * 1000, 2)})
+    return rows
+
+
+HISTORY_FIELD = '가격히스토리'
+DATA_TABLES = ('products', 'favorites')
+
+
+def _snapshot(record):
+    """비교용 사본 (리스트 값도 복사)"""
+    return {k: (list(v) if isinstance(v, list) else v) for k, v in record.items()}
+
+
+class SqliteDataStore:
+    """검색 결과 / 관심상품을 SQLite 에 행 단위로 저장
+
+    - WAL 모드, 상품코드(goods_no) 색인
+    - save() 는 이전 저장과 달라진 행만 upsert / delete
+    - load() 는 기존 JSON 파일과 같은 {'products', 'favorites', 'last_updated'} 형태를 반환
+    - DB 가 없고 legacy_json 파일이 있으면 처음 열 때 한 번 옮겨 옴 (JSON 파일은 그대로 둠)
+
+    가격 히스토리의 저장소는 PriceHistoryLog(oliveyoung_history) 하나뿐이다. 이 DB 에는 히스토리 테이블이 없고,
+    아직 로그로 옮기지 않았거나 상품코드가 없어 옮길 수 없는 '가격히스토리' 목록만 행 data 안에 그대로 남는다.
+    예전 버전이 만든 price_history 테이블이 있으면 처음 열 때 각 행의 '가격히스토리' 로 되돌려 넣고 테이블을 지운다.
+    그 뒤 앱의 load_data() 가 관심상품 히스토리를 로그로 옮긴다 (PriceHistoryLog.migrate_products).
+    """
+    def __init__(self, db_file="oliveyoung_data.db", legacy_json=None):
+        self.db_file = db_file
+        self._lock = threading.RLock()
+        self._saved = {table: {} for table in DATA_TABLES}  # 행 키 -> (순서, 저장한 값 사본)
+        self.last_save_stats = {}
+        self.migrated = None
+        self.loaded_version = None  # 마지막으로 읽은(또는 직접 저장한) 데이터 버전
+        self._file_stamp = None
+
+        is_new = not os.path.exists(db_file)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self._migrate_history_table()
+
+        self.migration_error = None
+        if is_new and legacy_json and os.path.exists(legacy_json):
+            try:
+                self.migrated = self.import_json(legacy_json)
+            except Exception as e:
+                self.migration_error = str(e)
+
+    def _create_schema(self):
+        with self.conn:
+            for table in DATA_TABLES:
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    "item_key TEXT PRIMARY KEY, goods_no TEXT, sort_order INTEGER NOT NULL, data TEXT NOT NULL)"
+                )
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_goods_no ON {table}(goods_no)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+
+    def _migrate_history_table(self):
+        """예전 price_history 테이블을 각 행 data 의 '가격히스토리' 로 되돌려 넣고 테이블 삭제 (한 번만)"""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'price_history'"
+        ).fetchone()
+        if not exists:
+            return
+
+        with self.conn:
+            for table in DATA_TABLES:
+                histories = {}
+                for item_key, date, time_text, original, discount in self.conn.execute(
+                    "SELECT item_key, date, time, original, discount FROM price_history "
+                    "WHERE owner = ? ORDER BY item_key, seq", (table,)
+                ):
+                    histories.setdefault(item_key, []).append(
+                        {'날짜': date, '원가': original, '할인가': discount, '시간': time_text}
+                    )
+
+                updates = []
+                for item_key, text in self.conn.execute(f"SELECT item_key, data FROM {table}"):
+                    if item_key not in histories:
+                        continue
+                    record = json.loads(text)
+                    record.setdefault(HISTORY_FIELD, histories[item_key])
+                    updates.append((json.dumps(record, ensure_ascii=False), item_key))
+                self.conn.executemany(f"UPDATE {table} SET data = ? WHERE item_key = ?", updates)
+            self.conn.execute("DROP TABLE price_history")
+
+    @staticmethod
+    def _row_keys(records):
+        """행 키 - 상품코드 키(없으면 브랜드+상품명 키), 같은 키가 또 나오면 #번호를 붙임"""
+        seen = {}
+        rows = []
+        for record in records:
+            code = str(record.get('상품코드', '') or '').strip()
+            if code:
+                base = f"code:{code}"
+            else:
+                keys = product_keys(record)
+                base = keys[0] if keys else 'row'
+            count = seen.get(base, 0)
+            seen[base] = count + 1
+            rows.append((base if count == 0 else f"{base}#{count}", record))
+        return rows
+
+    def _get_meta(self, name, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, name, value):
+        self.conn.execute(
+            "INSERT INTO meta (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+            (name, str(value))
+        )
+
+    @property
+    def version(self):
+        """저장할 때마다 1씩 늘어나는 데이터 버전"""
+        with self._lock:
+            return int(self._get_meta('version', 0))
+
+    def _stat_files(self):
+        """DB / WAL 파일의 (수정 시각, 크기) - 바뀌지 않았으면 버전 조회도 생략"""
+        stamp = []
+        for path in (self.db_file, self.db_file + '-wal'):
+            try:
+                info = os.stat(path)
+                stamp.append((info.st_mtime_ns, info.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def has_external_changes(self):
+        """마지막 로드 이후 다른 세션/프로세스가 저장했는지 (파일 시각 → 데이터 버전 순으로 확인)"""
+        with self._lock:
+            if self.loaded_version is None:
+                return True
+            stamp = self._stat_files()
+            if stamp == self._file_stamp:
+                return False
+            self._file_stamp = stamp
+            return int(self._get_meta('version', 0)) != self.loaded_version
+
+    def _save_table(self, table, records, stats):
+        saved = self._saved[table]
+        rows = self._row_keys(records)
+
+        # 기존 행의 상대 순서가 그대로이고 새 행이 모두 뒤에 있으면 sort_order 를 다시 쓰지 않음
+        existing = [idx for idx, (key, _) in enumerate(rows) if key in saved]
+        orders = [saved[rows[idx][0]][0] for idx in existing]
+        first_new = next((idx for idx, (key, _) in enumerate(rows) if key not in saved), None)
+        keep_order = (all(a < b for a, b in zip(orders, orders[1:])) and
+                      (first_new is None or not existing or first_new > existing[-1]))
+        next_order = max((order for order, _ in saved.values()), default=-1) + 1 if keep_order else 0
+
+        current = {}
+        upserts = []
+        for key, record in rows:
+            snapshot = _snapshot(record)
+            if keep_order and key in saved:
+                order = saved[key][0]
+            else:
+                order = next_order
+                next_order += 1
+            current[key] = (order, snapshot)
+            goods_no = str(record.get('상품코드', '') or '')
+            # dict 비교만 하고 직렬화는 바뀐 행만
+            if saved.get(key) != (order, snapshot):
+                upserts.append((key, goods_no, order, json.dumps(snapshot, ensure_ascii=False)))
+
+        removed = [key for key in saved if key not in current]
+        if removed:
+            self.conn.executemany(f"DELETE FROM {table} WHERE item_key = ?", [(key,) for key in removed])
+        if upserts:
+            self.conn.executemany(
+                f"INSERT INTO {table} (item_key, goods_no, sort_order, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(item_key) DO UPDATE SET goods_no = excluded.goods_no, "
+                "sort_order = excluded.sort_order, data = excluded.data",
+                upserts
+            )
+
+        stats['upserted'] += len(upserts)
+        stats['deleted'] += len(removed)
+        return current
+
+    def save(self, products, favorites):
+        """바뀐 행만 저장 - 반환값: {'upserted', 'deleted', 'elapsed_ms'}"""
+        started = time.perf_counter()
+        stats = {'upserted': 0, 'deleted': 0}
+        with self._lock:
+            with self.conn:
+                results = {}
+                for table, records in (('products', products), ('favorites', favorites)):
+                    results[table] = self._save_table(table, records or [], stats)
+                if stats['upserted'] or stats['deleted']:
+                    version = int(self._get_meta('version', 0))
+                    self._set_meta('version', version + 1)
+                    self._set_meta('last_updated', datetime.now().isoformat())
+                    # 그 사이 다른 곳에서 저장하지 않았을 때만 내 저장을 최신으로 봄
+                    if self.loaded_version == version:
+                        self.loaded_version = version + 1
+            # 커밋이 끝난 뒤에만 저장 상태를 갱신 (실패하면 다음 저장에서 다시 씀)
+            for table, current in results.items():
+                self._saved[table] = current
+        stats['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self.last_save_stats = stats
+        return stats
+
+    def load(self):
+        """{'products', 'favorites', 'last_updated'} 반환"""
+        with self._lock:
+            data = {}
+            for table in DATA_TABLES:
+                records = []
+                saved = {}
+                for item_key, order, text in self.conn.execute(
+                    f"SELECT item_key, sort_order, data FROM {table} ORDER BY sort_order"
+                ):
+                    record = json.loads(text)
+                    saved[item_key] = (order, _snapshot(record))
+                    records.append(record)
+
+                self._saved[table] = saved
+                data[table] = records
+            data['last_updated'] = self._get_meta('last_updated', '')
+            self.loaded_version = int(self._get_meta('version', 0))
+            self._file_stamp = self._stat_files()
+            return data
+
+    def find_by_goods_no(self, goods_no, table='favorites'):
+        """상품코드로 저장된 상품 조회 (색인 사용)"""
+        with self._lock:
+            return [
+                json.loads(text) for (text,) in self.conn.execute(
+                    f"SELECT data FROM {table} WHERE goods_no = ? ORDER BY sort_order", (str(goods_no),)
+                )
+            ]
+
+    def import_json(self, json_file):
+        """기존 JSON 데이터 파일을 읽어 저장 - 반환값: {'products', 'favorites', 'history'} 개수"""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        products = data.get('products', [])
+        favorites = data.get('favorites', [])
+        self.save(products, favorites)
+        with self._lock, self.conn:
+            if data.get('last_updated'):
+                self._set_meta('last_updated', data['last_updated'])
+        history_count = sum(len(record.get(HISTORY_FIELD) or []) for record in products + favorites)
+        return {'products': len(products), 'favorites': len(favorites), 'history': history_count}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def migrate_json_to_sqlite(json_file, db_file):
+    """JSON 데이터 파일을 SQLite DB 로 한 번에 옮김 (기존 DB 내용은 JSON 내용으로 바뀜)"""
+    store = SqliteDataStore(db_file)
+    try:
+        store.load()
+        return store.import_json(json_file)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) == 4 and sys.argv[1] == 'migrate':
+        print(migrate_json_to_sqlite(sys.argv[2], sys.argv[3]))
+    elif len(sys.argv) in (2, 3) and sys.argv[1] == 'benchmark':
+        count = int(sys.argv[2]) if len(sys.argv) == 3 else 10000
+        for row in benchmark_favorites(count):
+            print(f"{row['작업']}\t{row['방식']}\t{row['ms']:.2f}ms")
+    else:
+        print("사용법: python oliveyoung_store.py migrate <JSON 파일> <DB 파일>")
+        print("        python oliveyoung_store.py benchmark [관심상품 수]")
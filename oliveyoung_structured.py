@@ -0,0 +1,231 @@
+"""
+올리브영 상세 페이지의 구조화 데이터(JSON-LD, 메타 태그, 인라인 JS 상태)에서 가격을 읽는 단계들
+oliveyoung_scraper.py(Playwright) / oliveyoung_scraper_Streamlit.py(requests) 공용
+"""
+import json
+import re
+import threading
+import time
+
+# 가격 추출 단계 (앞에서부터 시도)
+# - selectors: 기존 DOM 셀렉터 (.price-2 strong 등)
+# - json_ld / meta / js_state: 페이지에 포함된 구조화 데이터
+# - scan: 본문 텍스트 앞부분만 훑는 제한된 정규식 스캔 (최후 수단, 이전 가격과 같을 때만 채택)
+PRICE_TIERS = ('selectors', 'json_ld', 'meta', 'js_state', 'scan')
+
+# 메타 태그 (property / name / itemprop) - 할인가 / 정가
+META_DISCOUNT_KEYS = (
+    'product:sale_price:amount', 'product:price:amount', 'og:price:amount', 'price'
+)
+META_ORIGINAL_KEYS = (
+    'product:original_price:amount', 'product:regular_price:amount'
+)
+
+# 인라인 스크립트 상태 객체에서 찾을 키 - 할인가 / 정가
+JS_DISCOUNT_KEYS = ('finalPrice', 'salePrice', 'salePrc', 'finalPrc', 'sellPrice', 'discountPrice')
+JS_ORIGINAL_KEYS = ('orgPrice', 'originalPrice', 'normalPrice', 'normPrc', 'orgPrc', 'listPrice', 'consumerPrice')
+_JS_KEY_PATTERN = r'["\']?{key}["\']?\s*[:=]\s*["\']?(\d[\d,]*)'
+JS_DISCOUNT_PATTERNS = [re.compile(_JS_KEY_PATTERN.format(key=key)) for key in JS_DISCOUNT_KEYS]
+JS_ORIGINAL_PATTERNS = [re.compile(_JS_KEY_PATTERN.format(key=key)) for key in JS_ORIGINAL_KEYS]
+
+# 인라인 스크립트 중 가격 키가 있을 법한 것만, 앞부분만 검사
+JS_STATE_HINT = re.compile(r'(price|prc)', re.I)
+JS_STATE_MAX_SCRIPTS = 20
+JS_STATE_MAX_CHARS = 20000
+
+# 제한된 스캔: 본문 앞 SCAN_MAX_CHARS 글자에서 SCAN_MAX_MATCHES 개까지만
+SCAN_PATTERN = re.compile(r'(\d{1,3}(?:,\d{3})+|\d{4,7})\s*원')
+SCAN_MAX_CHARS = 50000
+SCAN_MAX_MATCHES = 20
+
+MIN_PRICE = 100
+MAX_PRICE = 10000000
+
+
+def to_price(value):
+    """'12,000' / 12000 / '12000.0' -> 12000 (범위를 벗어나면 None)"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = int(float(str(value).replace(',', '').strip()))
+    except (TypeError, ValueError):
+        return None
+    if MIN_PRICE < number <= MAX_PRICE:
+        return number
+    return None
+
+
+def _iter_json_ld_nodes(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_json_ld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        for key in ('@graph', 'offers', 'itemOffered'):
+            if key in data:
+                yield from _iter_json_ld_nodes(data[key])
+
+
+def prices_from_json_ld(json_ld_texts):
+    """JSON-LD 의 offers.price / lowPrice / highPrice / priceSpecification 에서 (정가, 할인가)"""
+    for text in json_ld_texts or []:
+        try:
+            data = json.loads(text)
+        except (TypeError, ValueError):
+            continue
+
+        for node in _iter_json_ld_nodes(data):
+            node_type = node.get('@type', '')
+            if isinstance(node_type, list):
+                node_type = ' '.join(node_type)
+            if 'Offer' not in node_type:
+                continue
+
+            discount = to_price(node.get('price')) or to_price(node.get('lowPrice'))
+            original = to_price(node.get('highPrice'))
+
+            specifications = node.get('priceSpecification') or []
+            if isinstance(specifications, dict):
+                specifications = [specifications]
+            for spec in specifications:
+                if not isinstance(spec, dict):
+                    continue
+                price = to_price(spec.get('price'))
+                if 'ListPrice' in str(spec.get('priceType', '')):
+                    original = original or price
+                else:
+                    discount = discount or price
+
+            if discount:
+                return original, discount
+    return None, None
+
+
+def prices_from_meta(meta):
+    """메타 태그 {property/name/itemprop: content} 에서 (정가, 할인가)"""
+    meta = meta or {}
+    discount = None
+    for key in META_DISCOUNT_KEYS:
+        discount = to_price(meta.get(key))
+        if discount:
+            break
+
+    original = None
+    for key in META_ORIGINAL_KEYS:
+        original = to_price(meta.get(key))
+        if original:
+            break
+
+    if discount:
+        return original, discount
+    return None, None
+
+
+def _first_match(patterns, text):
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            price = to_price(match.group(1))
+            if price:
+                return price
+    return None
+
+
+def prices_from_js_state(scripts):
+    """인라인 스크립트 상태 객체(salePrice / orgPrice 등)에서 (정가, 할인가)"""
+    checked = 0
+    for script in scripts or []:
+        if not script or not JS_STATE_HINT.search(script):
+            continue
+        checked += 1
+        if checked > JS_STATE_MAX_SCRIPTS:
+            break
+
+        text = script[:JS_STATE_MAX_CHARS]
+        discount = _first_match(JS_DISCOUNT_PATTERNS, text)
+        if discount:
+            return _first_match(JS_ORIGINAL_PATTERNS, text), discount
+    return None, None
+
+
+def bounded_price_scan(text):
+    """본문 앞부분에서 'NN,NNN원' 패턴을 몇 개만 찾아 (정가, 할인가) 추정
+
+    처음 찾은 두 가격 중 작은 값을 할인가, 큰 값을 정가로 본다.
+    """
+    prices = []
+    for count, match in enumerate(SCAN_PATTERN.finditer((text or '')[:SCAN_MAX_CHARS]), 1):
+        price = to_price(match.group(1))
+        if price and 1000 <= price <= 1000000:  # 1천원~100만원 사이
+            prices.append(price)
+        if len(prices) >= 2 or count >= SCAN_MAX_MATCHES:
+            break
+
+    if not prices:
+        return None, None
+    discount = min(prices)
+    original = max(prices) if max(prices) > discount else None
+    return original, discount
+
+
+def find_structured_prices(json_ld_texts=None, meta=None, scripts=None, scan_text=None, stats=None,
+                           known_prices=()):
+    """구조화 데이터 단계 → 제한된 스캔 순서로 가격을 찾음
+
+    scan 은 본문에서 아무 'N원' 이나 집어낼 수 있는 추정값이라, 할인가가 known_prices(이전 정가/할인가) 중
+    하나와 같을 때만 채택한다. known_prices 가 비어 있으면 scan 은 시도하지 않는다.
+    반환값: (단계 이름, 정가, 할인가) - 찾지 못하면 (None, None, None)
+    """
+    known = {to_price(price) for price in known_prices} - {None}
+    tiers = [
+        ('json_ld', prices_from_json_ld, json_ld_texts),
+        ('meta', prices_from_meta, meta),
+        ('js_state', prices_from_js_state, scripts),
+        ('scan', bounded_price_scan, scan_text if known else None)
+    ]
+    for tier, extractor, source in tiers:
+        if source is None:
+            continue
+        started = time.perf_counter()
+        original, discount = extractor(source)
+        if tier == 'scan' and discount not in known:
+            original = discount = None
+        if stats is not None:
+            stats.record(tier, bool(discount), time.perf_counter() - started)
+        if discount:
+            return tier, original, discount
+    return None, None, None
+
+
+class PriceTierStats:
+    """가격 추출 단계별 시도/적중 횟수와 소요 시간"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.tiers = {tier: {'attempts': 0, 'hits': 0, 'total_time': 0.0} for tier in PRICE_TIERS}
+
+    def record(self, tier, hit, elapsed):
+        with self._lock:
+            entry = self.tiers.setdefault(tier, {'attempts': 0, 'hits': 0, 'total_time': 0.0})
+            entry['attempts'] += 1
+            entry['total_time'] += elapsed
+            if hit:
+                entry['hits'] += 1
+
+    def summary(self):
+        """단계별 {'attempts', 'hits', 'hit_rate', 'avg_ms'} (시도한 단계만)"""
+        with self._lock:
+            result = {}
+            for tier, entry in self.tiers.items():
+                if not entry['attempts']:
+                    continue
+                result[tier] = {
+                    'attempts': entry['attempts'],
+                    'hits': entry['hits'],
+                    'hit_rate': round(entry['hits'] / entry['attempts'] * 100, 1),
+                    'avg_ms': round(entry['total_time'] / entry['attempts'] * 1000, 2)
+                }
+            return result